@@ -0,0 +1,62 @@
+"""Benchmark statement generation against frame width.
+
+Compares the legacy per-column `list(map(str.upper, match_condition))` rendering of the
+ON CONFLICT update list with rendering from a ColumnPlan, for frames of increasing width.
+
+    python benchmarks/bench_column_plan.py
+"""
+
+from __future__ import annotations
+
+import time
+
+import polars as pl
+
+from keepitsql.core.column_plan import build_column_plan
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.sql_models.upsert import insert_on_confict as ioc
+
+WIDTHS = (500, 1000, 2000, 5000)
+
+
+def legacy_update_list(columns: list, match_condition: list) -> str:
+    return ',\n'.join(
+        ioc.update_list.format(column=col)
+        for col in columns
+        if col.upper() not in list(map(lambda x: x.upper(), match_condition))
+    )
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    print(f"{'columns':>8} {'legacy (ms)':>12} {'plan (ms)':>10} {'on_conflict (ms)':>17} {'merge (ms)':>11}")
+    for width in WIDTHS:
+        columns = [f'col_{i}' for i in range(width)]
+        # Half of the columns are keys, which is what makes the legacy path quadratic.
+        match_condition = columns[: width // 2]
+        dataframe = pl.DataFrame({col: [0] for col in columns})
+        generator = FromDataframe(dataframe)
+
+        legacy = best_of(lambda: legacy_update_list(columns, match_condition), repeat=1)
+
+        def from_plan() -> None:
+            build_column_plan.cache_clear()
+            plan = build_column_plan(tuple(columns), tuple(match_condition))
+            ',\n'.join(ioc.update_list.format(column=col) for col in plan.update_columns)
+
+        plan = best_of(from_plan)
+        on_conflict = best_of(lambda: generator.generate_insert_on_conflict('bench', match_condition))
+        merge = best_of(lambda: generator.generate_merge_statement('bench', match_condition))
+        print(f'{width:>8} {legacy * 1e3:>12.1f} {plan * 1e3:>10.2f} {on_conflict * 1e3:>17.2f} {merge * 1e3:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark bulk inserts into an indexed table with and without deferred indexes.
+
+Inserts rows in random key order into an on-disk SQLite table carrying four
+secondary indexes, once with the indexes maintained row by row and once inside
+`deferred_constraints`, which drops them for the load and builds each one in bulk
+afterwards. SQLite builds indexes one at a time; on PostgreSQL and SQL Server the
+rebuilds also run in parallel.
+
+    python benchmarks/bench_deferred_indexes.py
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import polars as pl
+from sqlalchemy import create_engine
+
+from keepitsql.core.deferred_constraints import deferred_constraints
+from keepitsql.core.from_dataframe import FromDataframe
+
+ROWS = 1_000_000
+INDEXES = (
+    'CREATE INDEX fact_customer ON fact (customer_id, order_date)',
+    'CREATE INDEX fact_product ON fact (product_id)',
+    'CREATE INDEX fact_amount ON fact (amount)',
+    'CREATE INDEX fact_reference ON fact (reference)',
+)
+
+
+def make_frame() -> pl.DataFrame:
+    rng = random.Random(42)
+    return pl.DataFrame(
+        {
+            'id': list(range(ROWS)),
+            'customer_id': [rng.randrange(100_000) for _ in range(ROWS)],
+            'product_id': [rng.randrange(10_000) for _ in range(ROWS)],
+            'order_date': [f'2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}' for _ in range(ROWS)],
+            'amount': [rng.random() * 1000 for _ in range(ROWS)],
+            'reference': [f'{rng.getrandbits(64):016x}' for _ in range(ROWS)],
+        }
+    )
+
+
+def load_seconds(frame: pl.DataFrame, defer: bool) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                'CREATE TABLE fact (id INTEGER PRIMARY KEY, customer_id INTEGER, product_id INTEGER,'
+                ' order_date TEXT, amount REAL, reference TEXT)'
+            )
+            for statement in INDEXES:
+                connection.execute(statement)
+        engine = create_engine(f'sqlite:///{path}')
+
+        start = time.perf_counter()
+        if defer:
+            with deferred_constraints(engine, 'fact'):
+                FromDataframe(frame).load_insert(engine, 'fact')
+        else:
+            FromDataframe(frame).load_insert(engine, 'fact')
+        elapsed = time.perf_counter() - start
+
+        engine.dispose()
+        return elapsed
+
+
+def main() -> None:
+    frame = make_frame()
+    indexed = load_seconds(frame, defer=False)
+    deferred = load_seconds(frame, defer=True)
+    print(f'{ROWS:,} rows, {len(INDEXES)} indexes')
+    print(f'indexes maintained: {indexed:.2f}s')
+    print(f'indexes deferred:   {deferred:.2f}s ({indexed / deferred:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
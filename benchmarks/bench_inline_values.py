@@ -0,0 +1,80 @@
+"""Benchmark micro-batch upsert latency.
+
+Upserts small batches into an on-disk SQLite table, half updates and half inserts,
+through the default `executemany` of the ON CONFLICT statement and through one
+statement over an inline parameterized VALUES list, and reports median and p99
+latency per batch.
+
+SQLite runs in-process, so there are no round trips to save and this measures the
+client-side cost of the inline form (binding rows x columns parameters). On a
+networked MERGE database the default path also creates, fills and drops a staging
+table per load, which the inline form avoids entirely.
+
+    python benchmarks/bench_inline_values.py
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+import polars as pl
+from sqlalchemy import create_engine
+
+from keepitsql.core.from_dataframe import FromDataframe
+
+BATCH_SIZES = (50, 200, 500)
+BATCHES = 200
+
+
+def make_batch(batch_number: int, rows: int) -> pl.DataFrame:
+    first_id = batch_number * rows // 2
+    return pl.DataFrame(
+        {
+            'id': list(range(first_id, first_id + rows)),
+            'name': [f'name_{batch_number}_{i}' for i in range(rows)],
+            'amount': [i * 0.25 for i in range(rows)],
+            'category': [f'category_{i % 97}' for i in range(rows)],
+        }
+    )
+
+
+def batch_latencies(rows: int, inline_values: bool) -> list:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE bench (id INTEGER PRIMARY KEY, name TEXT, amount REAL, category TEXT)')
+        engine = create_engine(f'sqlite:///{path}')
+
+        latencies = []
+        with engine.connect() as connection:
+            for batch_number in range(BATCHES):
+                loader = FromDataframe(make_batch(batch_number, rows))
+                start = time.perf_counter()
+                loader.load_upsert(connection, 'bench', ['id'], inline_values=inline_values)
+                latencies.append(time.perf_counter() - start)
+
+        engine.dispose()
+        return latencies
+
+
+def p99(latencies: list) -> float:
+    return statistics.quantiles(latencies, n=100)[98]
+
+
+def main() -> None:
+    print(f"{'rows':>6} {'median ms':>10} {'inline ms':>10} {'p99 ms':>8} {'inline p99 ms':>14}")
+    for rows in BATCH_SIZES:
+        default = batch_latencies(rows, inline_values=False)
+        inline = batch_latencies(rows, inline_values=True)
+        print(
+            f'{rows:>6} {statistics.median(default) * 1000:>10.2f} {statistics.median(inline) * 1000:>10.2f}'
+            f' {p99(default) * 1000:>8.2f} {p99(inline) * 1000:>14.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark the pages written by an upsert that mostly repeats existing rows.
+
+Loads a table into an on-disk SQLite database in WAL mode, then upserts the same
+rows again with a small fraction changed, with and without `skip_unchanged`.
+Automatic checkpoints are disabled, so the WAL frames left after the upsert are
+the pages it wrote.
+
+Without the guard every conflicting row is updated, even when the new values
+equal the old ones. SQLite notices a byte-identical overwrite of a table row and
+leaves its page clean, but the entries of an index over updated columns are
+still deleted and reinserted, so the table carries one secondary index. With the
+guard only the changed rows, and their index entries, are written.
+
+    python benchmarks/bench_on_conflict_guard.py
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import time
+
+import polars as pl
+from sqlalchemy import create_engine
+
+from keepitsql.core.from_dataframe import FromDataframe
+
+ROWS = 200_000
+CHANGED_FRACTIONS = (0.0, 0.001, 0.01)
+
+
+def make_frame(changed_fraction: float = 0.0) -> pl.DataFrame:
+    changed_every = int(1 / changed_fraction) if changed_fraction else ROWS + 1
+    return pl.DataFrame(
+        {
+            'id': list(range(ROWS)),
+            'name': [f'name_{i}' for i in range(ROWS)],
+            'amount': [i * 0.25 + (1 if i % changed_every == 0 else 0) for i in range(ROWS)],
+            'category': [f'category_{i % 97}' for i in range(ROWS)],
+        }
+    )
+
+
+def pages_written(changed_fraction: float, skip_unchanged: bool) -> tuple:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE bench (id INTEGER PRIMARY KEY, name TEXT, amount REAL, category TEXT)')
+            connection.execute('CREATE INDEX bench_category ON bench (category, amount)')
+        engine = create_engine(f'sqlite:///{path}')
+        FromDataframe(make_frame()).load_insert(engine, 'bench')
+        changes = FromDataframe(make_frame(changed_fraction))
+
+        with engine.connect() as connection:
+            connection.exec_driver_sql('PRAGMA wal_autocheckpoint=0')
+            connection.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+            start = time.perf_counter()
+            changes.load_upsert(connection, 'bench', ['id'], skip_unchanged=skip_unchanged)
+            elapsed = time.perf_counter() - start
+            _, wal_frames, _ = connection.exec_driver_sql('PRAGMA wal_checkpoint(PASSIVE)').one()
+
+        engine.dispose()
+        return wal_frames, elapsed
+
+
+def main() -> None:
+    print(f"{'changed':>8} {'pages':>8} {'guarded pages':>14} {'seconds':>8} {'guarded seconds':>16}")
+    for changed_fraction in CHANGED_FRACTIONS:
+        pages, seconds = pages_written(changed_fraction, skip_unchanged=False)
+        guarded_pages, guarded_seconds = pages_written(changed_fraction, skip_unchanged=True)
+        print(f'{changed_fraction:>8.1%} {pages:>8} {guarded_pages:>14} {seconds:>8.2f} {guarded_seconds:>16.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark SQL literal rendering.
+
+Renders a frame of mixed column types (strings with quotes, integers, floats, dates,
+timestamps, booleans and NULLs) as VALUES rows, cell by cell with `render_literal`
+and column-wise with `render_literal_columns`, for Polars and Pandas.
+
+    python benchmarks/bench_sql_literals.py
+"""
+
+from __future__ import annotations
+
+import datetime
+import time
+
+import pandas as pd
+import polars as pl
+
+from keepitsql.core.sql_literals import (
+    render_literal,
+    render_literal_columns,
+)
+
+CELL_COUNTS = (1_000_000, 10_000_000)
+COLUMNS = 10
+
+
+def make_frame(rows: int) -> pl.DataFrame:
+    start = datetime.datetime(2024, 1, 1)
+    return pl.DataFrame(
+        {
+            'id': pl.int_range(rows, eager=True),
+            'name': pl.Series([f"o'brien_{i % 1000}" for i in range(rows)]),
+            'amount': pl.int_range(rows, eager=True) * 0.25,
+            'flag': pl.int_range(rows, eager=True) % 2 == 0,
+            'day': pl.date_range(start, start, eager=True).extend_constant(None, rows - 1),
+            'created': pl.datetime_range(start, start, eager=True).extend_constant(start, rows - 1),
+            'note': pl.Series([None if i % 3 else 'note' for i in range(rows)], dtype=pl.String),
+            'qty': pl.int_range(rows, eager=True) % 17,
+            'ratio': pl.int_range(rows, eager=True) / 7,
+            'code': pl.Series([f'C{i % 97}' for i in range(rows)]),
+        }
+    )
+
+
+def render_cell_by_cell(dataframe) -> list:
+    return [', '.join(render_literal(value, 'postgresql') for value in row) for row in dataframe.iter_rows()]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'cells':>11} {'cell-by-cell (s)':>17} {'polars (s)':>11} {'pandas (s)':>11}")
+    for cells in CELL_COUNTS:
+        dataframe = make_frame(cells // COLUMNS)
+        pandas_frame = pd.DataFrame(dataframe.to_dict(as_series=False))
+
+        scalar = timed(lambda: render_cell_by_cell(dataframe))
+        vectorized = timed(lambda: render_literal_columns(dataframe, 'postgresql'))
+        pandas = timed(lambda: render_literal_columns(pandas_frame, 'postgresql'))
+        print(f'{cells:>11,} {scalar:>17.2f} {vectorized:>11.2f} {pandas:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark SQLite bulk loading.
+
+Loads the same frame into an on-disk SQLite table through the default SQLAlchemy
+`executemany` path (one transaction, default PRAGMAs) and through the SQLite bulk
+profile (WAL, synchronous=NORMAL, large page cache, raw `sqlite3` executemany under
+a single BEGIN IMMEDIATE), for inserts and ON CONFLICT upserts.
+
+    python benchmarks/bench_sqlite_bulk.py
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import time
+
+import polars as pl
+from sqlalchemy import create_engine
+
+from keepitsql.core.from_dataframe import FromDataframe
+
+ROW_COUNTS = (10_000, 100_000, 500_000)
+CHUNK_SIZE = 10_000
+
+
+def make_frame(rows: int) -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            'id': list(range(rows)),
+            'name': [f'name_{i}' for i in range(rows)],
+            'amount': [i * 0.25 for i in range(rows)],
+            'category': [f'category_{i % 97}' for i in range(rows)],
+        }
+    )
+
+
+def timed_load(dataframe: pl.DataFrame, upsert: bool, sqlite_bulk: bool) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE bench (id INTEGER PRIMARY KEY, name TEXT, amount REAL, category TEXT)')
+        engine = create_engine(f'sqlite:///{path}')
+        loader = FromDataframe(dataframe)
+
+        start = time.perf_counter()
+        if upsert:
+            loader.load_upsert(engine, 'bench', ['id'], chunk_size=CHUNK_SIZE, sqlite_bulk=sqlite_bulk)
+        else:
+            loader.load_insert(engine, 'bench', chunk_size=CHUNK_SIZE, sqlite_bulk=sqlite_bulk)
+        elapsed = time.perf_counter() - start
+
+        engine.dispose()
+        return elapsed
+
+
+def main() -> None:
+    print(f"{'rows':>8} {'mode':>7} {'default (s)':>12} {'bulk (s)':>9} {'speedup':>8} {'bulk rows/s':>12}")
+    for rows in ROW_COUNTS:
+        dataframe = make_frame(rows)
+        for upsert in (False, True):
+            default = timed_load(dataframe, upsert, sqlite_bulk=False)
+            bulk = timed_load(dataframe, upsert, sqlite_bulk=True)
+            mode = 'upsert' if upsert else 'insert'
+            print(f'{rows:>8} {mode:>7} {default:>12.2f} {bulk:>9.2f} {default / bulk:>7.1f}x {rows / bulk:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+from keepitsql.core.clone_table import clone_table
+from keepitsql.core.deferred_constraints import deferred_constraints
+from keepitsql.core.engine_registry import (
+    PoolOptions,
+    dispose_all,
+    get_engine,
+)
 from keepitsql.core.from_dataframe import FromDataframe
 from keepitsql.core.generate_select_queries import export_select_statements
-from keepitsql.gen_ddl import CopyDDl
-from keepitsql.read_information_schema import get_table_column_info
+from keepitsql.core.multi_table_load import load_tables
+from keepitsql.core.to_dataframe import ToDataframe
+from keepitsql.gen_ddl import (
+    CopyDDl,
+    export_schema_ddl,
+)
+from keepitsql.read_information_schema import (
+    get_schema_column_info,
+    get_table_column_info,
+)
 
 __version__ = '0.1.0'
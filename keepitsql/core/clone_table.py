@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Iterator,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    URL,
+    Engine,
+    inspect,
+    text,
+)
+
+from keepitsql.core.engine_registry import resolve_engine
+from keepitsql.core.executor import (
+    LoadResult,
+    connection_scope,
+)
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.core.generate_select_queries import build_select_statement
+from keepitsql.core.retry import RetryPolicy
+from keepitsql.core.to_dataframe import rows_to_frame
+from keepitsql.gen_ddl import CopyDDl
+from keepitsql.sql_models import alter_table as at
+
+_END = object()
+
+
+def stream_table(
+    engine: Engine, table_name: str, schema_name: Optional[str] = None, chunk_size: int = 50_000
+) -> Iterator:
+    """
+    Yield every row of a table as Polars dataframes of at most `chunk_size` rows.
+
+    The table is read with one query through a server-side cursor (`stream_results` / `yield_per`), so only
+    one chunk is held in driver memory at a time, and no primary key is needed.
+    """
+    columns = inspect(engine).get_columns(table_name, schema=schema_name)
+    column_names = [column['name'] for column in columns]
+    statement = build_select_statement(table_name, columns, schema=schema_name, coalesce_numeric=False)
+
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(text(statement))
+        for partition in result.partitions(chunk_size):
+            yield rows_to_frame(partition, column_names)
+
+
+def _put(chunks: queue.Queue, item, stop: threading.Event) -> bool:
+    """Block until `item` is queued, unless the writer stopped; returns whether it was queued."""
+    while not stop.is_set():
+        try:
+            chunks.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def clone_index_name(name: str, table_name: str, target_table_name: str) -> str:
+    """
+    The name of an index of `table_name` on its clone `target_table_name`.
+
+    A leading source table name is replaced by the target's, e.g. `events_kind` becomes `events_copy_kind`;
+    other names are prefixed with it. Index names are unique per schema on most databases, so a clone next to
+    its source cannot reuse them.
+    """
+    if name.startswith(f'{table_name}_'):
+        return f'{target_table_name}{name[len(table_name):]}'
+    return f'{target_table_name}_{name}'
+
+
+def clone_table(
+    source: Union[str, URL, Engine],
+    target: Union[str, URL, Engine],
+    table_name: str,
+    schema_name: Optional[str] = None,
+    target_table_name: Optional[str] = None,
+    target_schema_name: Optional[str] = None,
+    if_exists: str = 'fail',
+    chunk_size: int = 50_000,
+    prefetch_chunks: int = 2,
+    indexes: bool = True,
+    retry: Optional[RetryPolicy] = None,
+) -> LoadResult:
+    """
+    Copy a table, structure and rows, from one database to another.
+
+    The target is created from the source table's DDL (`CopyDDl.create_ddl`, without foreign keys, whose
+    referred tables may not exist in the target). That DDL holds the columns, their types and NOT NULL, and
+    the primary key: column defaults, identity/autoincrement properties and CHECK constraints are not
+    copied. Across dialects, column types are rendered for the target through their generic SQLAlchemy
+    types, see `render_column_type`. Rows are streamed from the source in chunks by a reader thread while
+    the previous chunk is written with `load_insert`, each chunk committing on its own. At most
+    `prefetch_chunks` chunks wait between the two, so memory stays bounded whatever the table size.
+    Secondary indexes are built once the rows are in. A clone under another name gets its indexes renamed
+    (see `clone_index_name`), so it can live next to its source.
+
+    Args:
+        source (str | Engine): The source database.
+        target (str | Engine): The target database.
+        table_name (str): The table to copy.
+        schema_name (str, optional): The schema of the source table.
+        target_table_name (str, optional): The target table name. Defaults to `table_name`.
+        target_schema_name (str, optional): The target schema. Defaults to `schema_name`.
+        if_exists (str): When the target table exists: 'fail', 'append' to its rows, or 'replace' it.
+        chunk_size (int): Rows per chunk read, and per insert transaction.
+        prefetch_chunks (int): Chunks read ahead of the writer.
+        indexes (bool): Whether to create the source table's secondary indexes on a table this call creates.
+        retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks on the target.
+
+    Returns:
+        LoadResult: Row, chunk, commit and retry counts over all chunks.
+
+    Raises:
+        ValueError: If `if_exists` is not 'fail', 'append' or 'replace', or the target exists and it is 'fail'.
+    """
+    if if_exists not in ('fail', 'append', 'replace'):
+        raise ValueError("if_exists must be 'fail', 'append' or 'replace'.")
+    source_engine = resolve_engine(source)
+    target_engine = resolve_engine(target)
+    target_table_name = target_table_name or table_name
+    target_schema_name = target_schema_name or schema_name
+    qualified_target_name = f'{target_schema_name}.{target_table_name}' if target_schema_name else target_table_name
+
+    copy_ddl = CopyDDl(source_engine, table_name, schema_name)
+    same_dialect = source_engine.dialect.name == target_engine.dialect.name
+    build_statements = []
+    with connection_scope(target_engine) as connection:
+        exists = inspect(connection).has_table(target_table_name, schema=target_schema_name)
+        if exists and if_exists == 'fail':
+            raise ValueError(f"Table {qualified_target_name} already exists.")
+        if exists and if_exists == 'replace':
+            connection.execute(text(at.drop_table.format(table_name=qualified_target_name)))
+        if not exists or if_exists == 'replace':
+            table_ddl, _ = copy_ddl.create_ddl(
+                include_fk='N',
+                new_schema_name=target_schema_name,
+                new_table_name=target_table_name,
+                keep_not_null='Y',
+                target_dialect=None if same_dialect else target_engine.dialect,
+            )
+            connection.execute(text(table_ddl))
+            if indexes:
+                build_statements = copy_ddl.create_index_statements(
+                    new_schema_name=target_schema_name,
+                    new_table_name=target_table_name,
+                    dbms=target_engine.dialect.name,
+                    rename_index=(
+                        None
+                        if target_table_name == table_name
+                        else lambda name: clone_index_name(name, table_name, target_table_name)
+                    ),
+                )
+        connection.commit()
+
+    chunks = queue.Queue(maxsize=max(prefetch_chunks, 1))
+    stop = threading.Event()
+
+    def read() -> None:
+        try:
+            for frame in stream_table(source_engine, table_name, schema_name, chunk_size):
+                if not _put(chunks, frame, stop):
+                    return
+        finally:
+            _put(chunks, _END, stop)
+
+    result = LoadResult()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        reader = executor.submit(read)
+        try:
+            with connection_scope(target_engine) as connection:
+                while (frame := chunks.get()) is not _END:
+                    chunk_result = FromDataframe(frame).load_insert(
+                        connection, qualified_target_name, chunk_size=chunk_size, retry=retry
+                    )
+                    result.rows_loaded += chunk_result.rows_loaded
+                    result.chunks += chunk_result.chunks
+                    result.commits += chunk_result.commits
+                    result.transient_retries += chunk_result.transient_retries
+                reader.result()
+
+                for statement in build_statements:
+                    connection.execute(text(statement))
+                connection.commit()
+        finally:
+            stop.set()
+    return result
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import (
+    cached_property,
+    lru_cache,
+)
+from typing import Optional
+
+from sqlalchemy.sql.elements import quoted_name
+
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    """
+    Immutable column layout shared by the insert, merge and on-conflict generators.
+
+    A plan is built once per dataframe schema and match/constraint combination. Every
+    membership test is done against a precomputed set, so rendering a statement is linear
+    in the number of columns regardless of how many match or constraint columns are used.
+
+    Attributes:
+        columns (tuple): The planned dataframe columns (all of them unless projected), in dataframe order.
+        quoted_columns (tuple): `columns` wrapped as quoted identifiers.
+        match_columns (tuple): The columns used to match source and target rows.
+        update_columns (tuple): Columns that are neither match columns (compared case-insensitively) nor
+            constraint columns.
+        insert_columns (tuple): Columns that are not constraint columns and can be inserted.
+    """
+
+    columns: tuple
+    quoted_columns: tuple
+    match_columns: tuple
+    quoted_match_columns: tuple
+    update_columns: tuple
+    quoted_update_columns: tuple
+    insert_columns: tuple
+    quoted_insert_columns: tuple
+
+    @cached_property
+    def insert_column_list(self) -> str:
+        return ",\n    ".join(self.columns)
+
+    @cached_property
+    def insert_value_list(self) -> str:
+        return ",\n    ".join(f":{col}" for col in self.columns)
+
+
+@lru_cache(maxsize=256)
+def build_column_plan(columns: tuple, match_condition: tuple = (), constraint_columns: tuple = ()) -> ColumnPlan:
+    """
+    Build (or fetch from cache) the ColumnPlan for a column layout.
+
+    Args:
+        columns (tuple): The dataframe columns.
+        match_condition (tuple, optional): The columns used as match conditions.
+        constraint_columns (tuple, optional): Columns such as identities that should not be inserted.
+
+    Returns:
+        ColumnPlan: The precomputed plan.
+
+    Raises:
+        ValueError: If a match or constraint column is not in `columns`.
+    """
+    column_set = frozenset(columns)
+
+    for item in match_condition:
+        if item not in column_set:
+            raise ValueError(f"Value {item} from match condition is not in dataframe.")
+
+    for item in constraint_columns:
+        if item not in column_set:
+            raise ValueError(f"Value {item} from constraint columns is not in dataframe.")
+
+    match_upper = frozenset(col.upper() for col in match_condition)
+    constraint_set = frozenset(constraint_columns)
+
+    update_columns = tuple(col for col in columns if col.upper() not in match_upper and col not in constraint_set)
+    insert_columns = tuple(col for col in columns if col not in constraint_set)
+
+    quoted = {col: quoted_name(col, quote=True) for col in columns}
+
+    return ColumnPlan(
+        columns=columns,
+        quoted_columns=tuple(quoted[col] for col in columns),
+        match_columns=match_condition,
+        quoted_match_columns=tuple(quoted[col] for col in match_condition),
+        update_columns=update_columns,
+        quoted_update_columns=tuple(quoted[col] for col in update_columns),
+        insert_columns=insert_columns,
+        quoted_insert_columns=tuple(quoted[col] for col in insert_columns),
+    )
+
+
+def project_columns(columns, column_select: Optional[list] = None, match_condition: Optional[list] = None) -> tuple:
+    """
+    Project a column layout onto `column_select`, keeping dataframe order.
+
+    Match columns are always kept, so an upsert projected onto the columns it updates still matches on its keys.
+
+    Args:
+        columns (Sequence[str]): The dataframe columns.
+        column_select (list, optional): The columns to keep. Defaults to every column.
+        match_condition (list, optional): The columns used as match conditions.
+
+    Returns:
+        tuple: The projected columns.
+
+    Raises:
+        ValueError: If a selected column is not in `columns`.
+    """
+    columns = tuple(columns)
+    if column_select is None:
+        return columns
+
+    column_set = frozenset(columns)
+    for item in column_select:
+        if item not in column_set:
+            raise ValueError(f"Value {item} from column select is not in dataframe.")
+
+    selected = frozenset(column_select) | frozenset(match_condition or ())
+    return tuple(col for col in columns if col in selected)
+
+
+def get_column_plan(
+    dataframe,
+    match_condition: Optional[list] = None,
+    constraint_columns: Optional[list] = None,
+    column_select: Optional[list] = None,
+) -> ColumnPlan:
+    """
+    Return the ColumnPlan for a Pandas or Polars dataframe.
+
+    Args:
+        dataframe (DataFrame): The source dataframe.
+        match_condition (list, optional): The columns used as match conditions.
+        constraint_columns (list, optional): Columns that should not be inserted.
+        column_select (list, optional): Only plan these columns (and the match columns), see `project_columns`.
+                                        Constraint columns outside the selection are dropped.
+
+    Returns:
+        ColumnPlan: The cached plan for the dataframe's column layout.
+    """
+    columns = tuple(dataframe.columns)
+    constraint_columns = tuple(constraint_columns or ())
+    if column_select is not None:
+        for item in constraint_columns:
+            if item not in columns:
+                raise ValueError(f"Value {item} from constraint columns is not in dataframe.")
+        columns = project_columns(columns, column_select, match_condition)
+        constraint_columns = tuple(col for col in constraint_columns if col in columns)
+
+    return build_column_plan(columns, tuple(match_condition or ()), constraint_columns)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    URL,
+    Connection,
+    Engine,
+    text,
+)
+
+from keepitsql.core.dialect_capabilities import get_dialect_capabilities
+from keepitsql.core.engine_registry import resolve_engine
+from keepitsql.core.executor import connection_scope
+from keepitsql.core.upsert import parse_table_name
+from keepitsql.gen_ddl import CopyDDl
+from keepitsql.sql_models import alter_table as at
+
+
+@dataclass(frozen=True)
+class DeferredConstraints:
+    """
+    The secondary indexes and foreign keys of a table taken down for a bulk load, and the DDL restoring them.
+
+    Attributes:
+        table_name (str): The table, optionally schema qualified.
+        drop_statements (tuple): Run before the load: foreign keys first, then indexes.
+        index_statements (tuple): The CREATE INDEX statements run after the load.
+        foreign_key_statements (tuple): The ADD CONSTRAINT statements run after the indexes are rebuilt. The
+                                        database validates the loaded rows against them.
+    """
+
+    table_name: str
+    drop_statements: tuple = ()
+    index_statements: tuple = ()
+    foreign_key_statements: tuple = ()
+
+
+def drop_statements(
+    dbms: str, schema_name: Optional[str], table_name: str, index_names: List[str], foreign_key_names: List[str]
+) -> List[str]:
+    """The statements dropping the given foreign keys, then the given indexes, of a table."""
+    qualified_table_name = f'{schema_name}.{table_name}' if schema_name else table_name
+    drop_foreign_key = at.drop_foreign_key.get(dbms, at.drop_foreign_key['default'])
+    drop_index = at.drop_index.get(dbms, at.drop_index['default'])
+    if dbms not in at.drop_index:
+        index_names = [f'{schema_name}.{name}' if schema_name else name for name in index_names]
+
+    return [
+        drop_foreign_key.format(table_name=qualified_table_name, constraint_name=name) for name in foreign_key_names
+    ] + [drop_index.format(table_name=qualified_table_name, index_name=name) for name in index_names]
+
+
+def plan_deferred_constraints(
+    db_resource: Union[str, URL, Engine, Connection],
+    table_name: str,
+    foreign_keys: bool = True,
+    unique_indexes: bool = False,
+) -> DeferredConstraints:
+    """
+    Reflect the secondary indexes and foreign keys of `table_name` and render the DDL to drop and recreate them.
+
+    Primary keys, unique constraints and unique indexes are kept, so the load still rejects duplicate keys.
+    Foreign keys are left in place on databases that cannot add them back with ALTER TABLE (SQLite).
+
+    Args:
+        db_resource (str | Engine | Connection): The database holding the table.
+        table_name (str): The table, optionally schema qualified.
+        foreign_keys (bool): Whether to defer the table's foreign keys as well as its indexes.
+        unique_indexes (bool): Defer unique indexes too. Duplicates are then only found when the index is
+                               rebuilt after the load, which fails and leaves the index missing.
+
+    Returns:
+        DeferredConstraints: The statements to run around the load.
+    """
+    engine = resolve_engine(db_resource)
+    capabilities = get_dialect_capabilities(engine)
+    schema_name, local_table_name = parse_table_name(table_name)
+    copy_ddl = CopyDDl(engine, local_table_name, schema_name)
+
+    index_names = [
+        name
+        for name, _, _ in copy_ddl.secondary_indexes(
+            include_unique_constraints=False, include_unique_indexes=unique_indexes
+        )
+    ]
+    index_statements = copy_ddl.create_index_statements(
+        include_unique_constraints=False, include_unique_indexes=unique_indexes
+    )
+
+    foreign_key_names, foreign_key_statements = [], []
+    if foreign_keys and capabilities.alter_add_foreign_key:
+        foreign_key_names = [
+            fk['name']
+            for fk in copy_ddl.inspector.get_foreign_keys(local_table_name, schema=schema_name)
+            if fk.get('name')
+        ]
+        if foreign_key_names:
+            foreign_key_statements = [
+                statement.strip()
+                for statement in copy_ddl.create_foriegn_key_statements(
+                    new_schema_name=schema_name, new_table_name=local_table_name
+                ).split(';')
+                if statement.strip()
+            ]
+
+    return DeferredConstraints(
+        table_name=table_name,
+        drop_statements=tuple(
+            drop_statements(capabilities.name, schema_name, local_table_name, index_names, foreign_key_names)
+        ),
+        index_statements=tuple(index_statements),
+        foreign_key_statements=tuple(foreign_key_statements),
+    )
+
+
+def execute_ddl(db_resource: Union[Engine, Connection], statements) -> None:
+    """Run `statements` in order and commit, or roll back and re-raise when one fails."""
+    with connection_scope(db_resource) as connection:
+        try:
+            for statement in statements:
+                connection.execute(text(statement))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+
+def restore_constraints(
+    db_resource: Union[str, URL, Engine, Connection],
+    deferred: DeferredConstraints,
+    max_workers: Optional[int] = None,
+) -> None:
+    """
+    Rebuild the indexes of `deferred`, then add its foreign keys back.
+
+    Where the dialect allows (`DialectCapabilities.parallel_index_builds`) each index is built on its own
+    pooled connection, at the same time as the others. Every statement is attempted even when one fails,
+    e.g. a unique index over rows the load duplicated, and the first error is raised afterwards.
+
+    Args:
+        db_resource (str | Engine | Connection): The database holding the table. Indexes are built one at a
+                                                 time on a Connection.
+        deferred (DeferredConstraints): What `plan_deferred_constraints` took down.
+        max_workers (int, optional): Indexes built at the same time. Defaults to all of them.
+    """
+    engine = resolve_engine(db_resource)
+    parallel = isinstance(engine, Engine) and get_dialect_capabilities(engine).parallel_index_builds
+    workers = (max_workers or len(deferred.index_statements) or 1) if parallel else 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        builds = [executor.submit(execute_ddl, engine, [statement]) for statement in deferred.index_statements]
+    errors = [build.exception() for build in builds if build.exception() is not None]
+
+    for statement in deferred.foreign_key_statements:
+        try:
+            execute_ddl(engine, [statement])
+        except Exception as error:
+            errors.append(error)
+    if errors:
+        raise errors[0]
+
+
+@contextmanager
+def deferred_constraints(
+    db_resource: Union[str, URL, Engine, Connection],
+    table_name: str,
+    foreign_keys: bool = True,
+    max_workers: Optional[int] = None,
+    unique_indexes: bool = False,
+) -> Iterator[DeferredConstraints]:
+    """
+    Drop the non-unique secondary indexes and foreign keys of `table_name` for the duration of a bulk load.
+
+    Rows then go in without index maintenance, and each index is built once, in bulk, afterwards. They
+    are restored when the block exits, also when the load fails.
+
+        with deferred_constraints(engine, 'sales.fact_orders'):
+            FromDataframe(df).load_insert(engine, 'sales.fact_orders')
+
+    Args:
+        db_resource (str | Engine | Connection): The database holding the table.
+        table_name (str): The table, optionally schema qualified.
+        foreign_keys (bool): Whether to defer the table's foreign keys as well as its indexes.
+        max_workers (int, optional): Indexes rebuilt at the same time, see `restore_constraints`.
+        unique_indexes (bool): Defer unique indexes too, see `plan_deferred_constraints`.
+
+    Yields:
+        DeferredConstraints: What was dropped and will be recreated.
+    """
+    engine = resolve_engine(db_resource)
+    deferred = plan_deferred_constraints(engine, table_name, foreign_keys, unique_indexes)
+    execute_ddl(engine, deferred.drop_statements)
+    try:
+        yield deferred
+    finally:
+        restore_constraints(engine, deferred, max_workers)
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import (
+    dataclass,
+    replace,
+)
+from typing import (
+    Dict,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+)
+
+from keepitsql.sql_models import create_table as ct
+
+MERGE = 'MERGE'
+ON_CONFLICT = 'ON CONFLICT'
+ON_DUPLICATE_KEY = 'ON DUPLICATE KEY'
+
+
+@dataclass(frozen=True)
+class DialectCapabilities:
+    """
+    What a database supports, and the limits loads and generated statements have to respect.
+
+    Attributes:
+        name (str): The SQLAlchemy dialect name.
+        upsert_type (str): `MERGE`, `ON_CONFLICT` or `ON_DUPLICATE_KEY`.
+        merge_delete_by_source (bool): Whether MERGE supports `WHEN NOT MATCHED BY SOURCE THEN DELETE`.
+        max_bind_params (int): Bound parameters allowed in one statement.
+        max_statement_bytes (int, optional): Longest statement text the server accepts, if it has a fixed limit.
+        supports_returning (bool): Whether INSERT/UPDATE ... RETURNING is available for multi-row statements.
+        multi_row_values (bool): Whether `INSERT ... VALUES (...), (...)` is supported.
+        max_rows_per_values (int, optional): Row limit of one VALUES list, if any.
+        temp_table_header (str): The CREATE header for a temporary table, with a `{table_name}` placeholder.
+        temp_table_reference (str): How a temporary table is referenced after creation.
+        index_names_per_table (bool): Whether index names only have to be unique within their table.
+        alter_add_foreign_key (bool): Whether `ALTER TABLE ... ADD CONSTRAINT ... FOREIGN KEY` is supported.
+        on_conflict_select_needs_where (bool): Whether INSERT ... SELECT needs `WHERE true` before ON CONFLICT
+                                               to be parsed unambiguously (SQLite).
+        batch_params (int): Bound values to send per `executemany` round trip. Chunk sizes are derived
+                            from this and the column count.
+        concurrent_writers (bool): Whether loads on separate connections can write at the same time, rather
+                                   than queueing on a database-wide write lock (SQLite).
+        parallel_index_builds (bool): Whether several indexes of one table can be built at the same time on
+                                      separate connections, instead of serializing on a table lock.
+    """
+
+    name: str
+    upsert_type: str = MERGE
+    merge_delete_by_source: bool = False
+    max_bind_params: int = 999
+    max_statement_bytes: Optional[int] = None
+    supports_returning: bool = False
+    multi_row_values: bool = False
+    max_rows_per_values: Optional[int] = None
+    temp_table_header: str = ''
+    temp_table_reference: str = '{table_name}'
+    index_names_per_table: bool = False
+    alter_add_foreign_key: bool = True
+    on_conflict_select_needs_where: bool = False
+    batch_params: int = 50_000
+    concurrent_writers: bool = True
+    parallel_index_builds: bool = False
+
+    def chunk_size(self, column_count: int) -> int:
+        """Rows per `executemany` chunk for a frame with `column_count` columns."""
+        return max(self.batch_params // max(column_count, 1), 1)
+
+    def rows_per_statement(self, column_count: int) -> int:
+        """
+        Rows that fit in one multi-row VALUES statement with `column_count` bound columns.
+
+        Returns 1 when the dialect does not support multi-row VALUES.
+        """
+        if not self.multi_row_values:
+            return 1
+        rows = max(self.max_bind_params // max(column_count, 1), 1)
+        if self.max_rows_per_values is not None:
+            rows = min(rows, self.max_rows_per_values)
+        return rows
+
+    def temp_table_name(self, table_name: str) -> str:
+        return self.temp_table_reference.format(table_name=table_name)
+
+
+DEFAULT_CAPABILITIES = DialectCapabilities(name='default')
+
+_registry: Dict[str, DialectCapabilities] = {}
+
+
+def register_dialect_capabilities(capabilities: DialectCapabilities) -> None:
+    """Add or replace the capabilities of a dialect, e.g. for a third-party SQLAlchemy dialect."""
+    _registry[capabilities.name] = capabilities
+
+
+def get_dialect_capabilities(dialect: Union[str, Engine, Connection, None]) -> DialectCapabilities:
+    """
+    Look up the capabilities of a dialect.
+
+    Args:
+        dialect (str | Engine | Connection): A dialect name such as 'postgresql', or something bound to one.
+
+    Returns:
+        DialectCapabilities: The registered capabilities, or conservative defaults for unknown dialects.
+    """
+    if isinstance(dialect, (Engine, Connection)):
+        dialect = dialect.dialect.name
+    if dialect in _registry:
+        return _registry[dialect]
+    return replace(DEFAULT_CAPABILITIES, name=dialect or DEFAULT_CAPABILITIES.name)
+
+
+def sqlite_max_bind_params(version_info: Optional[tuple] = None) -> int:
+    """
+    The default SQLITE_MAX_VARIABLE_NUMBER of a SQLite library: 32766 from 3.32.0, 999 before.
+
+    Args:
+        version_info (tuple, optional): The library version. Defaults to the one Python's `sqlite3` is linked to.
+    """
+    version_info = version_info or sqlite3.sqlite_version_info
+    return 32766 if version_info >= (3, 32, 0) else 999
+
+
+for _capabilities in (
+    DialectCapabilities(
+        name='sqlite',
+        upsert_type=ON_CONFLICT,
+        max_bind_params=sqlite_max_bind_params(),
+        max_statement_bytes=1_000_000_000,  # SQLITE_MAX_SQL_LENGTH
+        supports_returning=True,
+        multi_row_values=True,
+        temp_table_header=ct.create_temp_table_headers['sqlite'],
+        alter_add_foreign_key=False,
+        on_conflict_select_needs_where=True,
+        batch_params=200_000,
+        concurrent_writers=False,
+    ),
+    DialectCapabilities(
+        name='postgresql',
+        upsert_type=ON_CONFLICT,
+        max_bind_params=32767,  # Int16 parameter count in the extended query protocol
+        max_statement_bytes=1_073_741_823,
+        supports_returning=True,
+        multi_row_values=True,
+        temp_table_header=ct.create_temp_table_headers['postgresql'],
+        batch_params=100_000,
+        parallel_index_builds=True,  # CREATE INDEX takes a SHARE lock, which does not conflict with itself
+    ),
+    DialectCapabilities(
+        name='mssql',
+        upsert_type=MERGE,
+        merge_delete_by_source=True,
+        max_bind_params=2099,  # 2100 including the RPC return value
+        max_statement_bytes=65536 * 4096,  # 65,536 * network packet size
+        multi_row_values=True,
+        max_rows_per_values=1000,
+        temp_table_header=ct.create_temp_table_headers['mssql'],
+        temp_table_reference='##{table_name}',
+        index_names_per_table=True,
+        batch_params=50_000,
+        parallel_index_builds=True,  # Offline nonclustered builds hold compatible shared table locks
+    ),
+    DialectCapabilities(
+        name='mysql',
+        upsert_type=ON_DUPLICATE_KEY,
+        max_bind_params=65535,
+        max_statement_bytes=67_108_864,  # max_allowed_packet default since 8.0
+        multi_row_values=True,
+        temp_table_header=ct.create_temp_table_headers['mysql'],
+        index_names_per_table=True,
+        batch_params=100_000,
+    ),
+    DialectCapabilities(
+        name='mariadb',
+        upsert_type=ON_DUPLICATE_KEY,
+        max_bind_params=65535,
+        max_statement_bytes=16_777_216,
+        supports_returning=True,
+        multi_row_values=True,
+        temp_table_header=ct.create_temp_table_headers['mysql'],
+        index_names_per_table=True,
+        batch_params=100_000,
+    ),
+    DialectCapabilities(
+        name='oracle',
+        upsert_type=MERGE,
+        max_bind_params=65535,
+        temp_table_header=ct.create_temp_table_headers['oracle'],
+        batch_params=100_000,
+    ),
+    DialectCapabilities(
+        name='db2',
+        upsert_type=MERGE,
+        max_bind_params=32767,
+        max_statement_bytes=2_097_152,
+        multi_row_values=True,
+    ),
+    DialectCapabilities(
+        name='snowflake',
+        upsert_type=MERGE,
+        max_bind_params=16384,
+        max_statement_bytes=1_048_576,
+        multi_row_values=True,
+        max_rows_per_values=16384,
+    ),
+):
+    register_dialect_capabilities(_capabilities)
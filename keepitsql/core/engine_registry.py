@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from typing import (
+    Dict,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    URL,
+    Connection,
+    Engine,
+    create_engine,
+    make_url,
+)
+
+
+@dataclass(frozen=True)
+class PoolOptions:
+    """
+    Connection pool settings for engines created by the registry.
+
+    Sizes left as None use SQLAlchemy's defaults for the dialect's pool class, since some pools (such as the
+    one used for in-memory SQLite) do not accept them.
+
+    Attributes:
+        pool_size (int, optional): Connections kept open in the pool.
+        max_overflow (int, optional): Connections allowed beyond `pool_size` under load.
+        pool_timeout (float, optional): Seconds to wait for a free connection.
+        pool_recycle (int, optional): Seconds after which a connection is replaced, e.g. below a server idle timeout.
+        pool_pre_ping (bool): Test connections on checkout so ones dropped by the server are replaced transparently.
+    """
+
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    pool_timeout: Optional[float] = None
+    pool_recycle: Optional[int] = None
+    pool_pre_ping: bool = True
+
+    def engine_kwargs(self) -> dict:
+        return {option: value for option, value in asdict(self).items() if value is not None}
+
+
+_engines: Dict[tuple, Engine] = {}
+_lock = threading.Lock()
+
+
+def get_engine(url: Union[str, URL], pool: Optional[PoolOptions] = None, **engine_kwargs) -> Engine:
+    """
+    Return the process-wide Engine for `url`, creating it on first use.
+
+    Engines are shared by every caller asking for the same URL and options, so metadata lookups and loads reuse
+    pooled connections instead of connecting (and negotiating TLS) every time.
+
+    Args:
+        url (str | URL): The database URL.
+        pool (PoolOptions, optional): Pool settings. Defaults to `PoolOptions()`.
+        **engine_kwargs: Further `create_engine` arguments. They must be hashable, as they are part of the key.
+
+    Returns:
+        Engine: The shared engine.
+    """
+    pool = pool or PoolOptions()
+    url = make_url(url)
+    key = (url.render_as_string(hide_password=False), pool, tuple(sorted(engine_kwargs.items())))
+    with _lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = create_engine(url, **pool.engine_kwargs(), **engine_kwargs)
+            _engines[key] = engine
+    return engine
+
+
+def resolve_engine(db_resource: Union[str, URL, Engine, Connection]) -> Union[Engine, Connection]:
+    """Look up the shared engine for a URL; Engines and Connections are returned unchanged."""
+    if isinstance(db_resource, (str, URL)):
+        return get_engine(db_resource)
+    return db_resource
+
+
+def dispose_all() -> None:
+    """Close the pooled connections of every registered engine and forget them."""
+    with _lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.dispose()
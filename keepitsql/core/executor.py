@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+    text,
+)
+from sqlalchemy.exc import DBAPIError
+
+from keepitsql.core.dialect_capabilities import get_dialect_capabilities
+from keepitsql.core.retry import (
+    FATAL,
+    TRANSIENT,
+    RetryPolicy,
+    aborts_transaction,
+    classify_error,
+)
+from keepitsql.core.to_dataframe import rows_to_frame
+
+
+@dataclass(frozen=True)
+class TransactionOptions:
+    """
+    How a chunked load is split into transactions.
+
+    The defaults run the whole load in one transaction. Set `commit_every_rows` and/or
+    `commit_every_bytes` to commit whenever either threshold is reached, and
+    `savepoint_per_chunk` to wrap each chunk in a savepoint so a failed chunk can be
+    rolled back and retried (`chunk_retries` times) without redoing earlier chunks.
+
+    With `on_error='bisect'` a chunk that still fails is split in halves, each retried under
+    its own savepoint, until the offending rows are isolated. Those rows are collected in
+    `LoadResult.rejects` together with the database error and the rest of the chunk is kept.
+    This implies `savepoint_per_chunk`.
+
+    Attributes:
+        commit_every_rows (int, optional): Commit after at least this many rows.
+        commit_every_bytes (int, optional): Commit after roughly this many bytes of parameters.
+        savepoint_per_chunk (bool): Run each chunk inside its own savepoint.
+        chunk_retries (int): How many times a failed chunk is retried from its savepoint.
+        on_error (str): 'raise' to fail the load on the first bad chunk, or 'bisect' to reject bad rows.
+    """
+
+    commit_every_rows: Optional[int] = None
+    commit_every_bytes: Optional[int] = None
+    savepoint_per_chunk: bool = False
+    chunk_retries: int = 0
+    on_error: str = 'raise'
+
+    def __post_init__(self) -> None:
+        if self.on_error not in ('raise', 'bisect'):
+            raise ValueError("on_error must be 'raise' or 'bisect'.")
+
+    @property
+    def uses_savepoints(self) -> bool:
+        return self.savepoint_per_chunk or self.on_error == 'bisect'
+
+
+@dataclass
+class LoadResult:
+    """Counters describing a finished load, and the rows rejected by bisection."""
+
+    rows_loaded: int = 0
+    chunks: int = 0
+    commits: int = 0
+    chunk_retries: int = 0
+    transient_retries: int = 0
+    rejects: List[dict] = field(default_factory=list)
+
+    def reject_frame(self, output: str = 'polars'):
+        """Return the rejected rows as a dataframe with an extra `error` column."""
+        columns = list(self.rejects[0]) if self.rejects else ['error']
+        return rows_to_frame([tuple(row.values()) for row in self.rejects], columns, output)
+
+    def write_rejects(self, path: str) -> None:
+        """Write the rejected rows, one JSON object per line, to `path`."""
+        with open(path, 'w') as f:
+            for row in self.rejects:
+                f.write(json.dumps(row, default=str) + '\n')
+
+
+@contextmanager
+def connection_scope(db_resource: Union[Engine, Connection]) -> Iterator[Connection]:
+    """Yield `db_resource` if it is a Connection, otherwise a new connection that is closed afterwards."""
+    if isinstance(db_resource, Connection):
+        yield db_resource
+    else:
+        with db_resource.connect() as connection:
+            yield connection
+
+
+def iter_frame_slices(dataframe, chunk_size: int) -> Iterator:
+    """Yield consecutive row slices of at most `chunk_size` rows from a Pandas or Polars dataframe."""
+    is_pandas = 'pandas' in type(dataframe).__module__
+    for offset in range(0, len(dataframe), chunk_size):
+        yield dataframe.iloc[offset : offset + chunk_size] if is_pandas else dataframe.slice(offset, chunk_size)
+
+
+def iter_param_chunks(dataframe, chunk_size: int) -> Iterator[List[dict]]:
+    """
+    Yield the rows of a Pandas or Polars dataframe as lists of parameter dictionaries.
+
+    Only one chunk is converted at a time, and Pandas missing values (NaN/NaT) are bound as NULL.
+
+    Args:
+        dataframe (DataFrame): The source dataframe.
+        chunk_size (int): Rows per chunk.
+
+    Yields:
+        List[dict]: One parameter dictionary per row.
+    """
+    is_pandas = 'pandas' in type(dataframe).__module__
+    for chunk in iter_frame_slices(dataframe, chunk_size):
+        if is_pandas:
+            yield chunk.astype(object).where(chunk.notna(), None).to_dict('records')
+        else:
+            yield chunk.to_dicts()
+
+
+def estimate_params_bytes(params: List[dict]) -> int:
+    """Approximate the wire size of a chunk of parameters."""
+    return sum(len(str(value)) for row in params for value in row.values() if value is not None)
+
+
+def ensure_transaction(connection: Connection) -> None:
+    """
+    Make sure a real database transaction is open on `connection`.
+
+    pysqlite only opens a transaction implicitly before DML, so DDL or a SAVEPOINT issued first
+    would run outside of it: DDL would be committed immediately, and a savepoint's RELEASE would
+    commit everything loaded so far.
+    """
+    if connection.dialect.name == 'sqlite' and not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN')
+
+
+def begin_savepoint(connection: Connection):
+    """Begin a savepoint, making sure a real transaction is open first (see `ensure_transaction`)."""
+    ensure_transaction(connection)
+    return connection.begin_nested()
+
+
+def bisect_chunk(
+    connection: Connection,
+    execute: Callable[[Connection, List[dict]], None],
+    params: List[dict],
+    result: LoadResult,
+) -> int:
+    """
+    Load the good rows of a failing chunk by recursive halving under savepoints.
+
+    A chunk with k bad rows out of n needs O(k log n) statements instead of n row-by-row inserts. Only errors
+    caused by the rows themselves reject them: a transient error (lock timeout, deadlock, ...) is raised.
+
+    Returns:
+        int: The number of rows loaded. Rows that fail on their own are appended to `result.rejects`.
+    """
+    dialect = connection.dialect.name
+    if len(params) == 1:
+        savepoint = begin_savepoint(connection)
+        try:
+            execute(connection, params)
+        except DBAPIError as error:
+            savepoint.rollback()
+            if classify_error(dialect, error) == TRANSIENT:
+                raise
+            result.rejects.append({**params[0], 'error': str(error.orig)})
+            return 0
+        savepoint.commit()
+        return 1
+
+    loaded = 0
+    middle = len(params) // 2
+    for half in (params[:middle], params[middle:]):
+        savepoint = begin_savepoint(connection)
+        try:
+            execute(connection, half)
+        except DBAPIError as error:
+            savepoint.rollback()
+            if classify_error(dialect, error) == TRANSIENT:
+                raise
+            loaded += bisect_chunk(connection, execute, half, result)
+        else:
+            savepoint.commit()
+            loaded += len(half)
+    return loaded
+
+
+def rollback_savepoint(savepoint) -> bool:
+    """Roll back a savepoint, returning False if the transaction it belonged to is already gone."""
+    if savepoint is None:
+        return False
+    try:
+        savepoint.rollback()
+    except DBAPIError:
+        return False
+    return True
+
+
+def execute_chunk(
+    connection: Connection,
+    execute: Callable[[Connection, List[dict]], None],
+    params: List[dict],
+    transaction: TransactionOptions,
+    result: LoadResult,
+    retry: Optional[RetryPolicy] = None,
+    pending_rows: int = 0,
+) -> int:
+    """
+    Run one chunk, inside a savepoint and with retries when the options ask for it, and return the rows loaded.
+
+    Transient errors (see `keepitsql.core.retry.classify_error`) are retried with backoff when the chunk can be
+    replayed on its own: from its savepoint, or from a clean transaction if nothing is waiting to be committed
+    (`pending_rows == 0`). Other errors use `chunk_retries` and then `on_error`; transient errors left after the
+    retries are raised rather than bisected, since they are not caused by any row.
+    """
+    dialect = connection.dialect.name
+    attempt = 0
+    transient_attempt = 0
+
+    while True:
+        savepoint = begin_savepoint(connection) if transaction.uses_savepoints else None
+        try:
+            execute(connection, params)
+        except DBAPIError as error:
+            savepoint_recovered = rollback_savepoint(savepoint)
+
+            if retry is not None and classify_error(dialect, error) == TRANSIENT:
+                resumable = (savepoint_recovered and not aborts_transaction(dialect, error)) or pending_rows == 0
+                if resumable and retry.should_retry(dialect, error, transient_attempt):
+                    if not savepoint_recovered or aborts_transaction(dialect, error):
+                        connection.rollback()
+                    retry.sleep(dialect, transient_attempt)
+                    transient_attempt += 1
+                    result.transient_retries += 1
+                    continue
+
+            if not savepoint_recovered:
+                raise
+            if attempt < transaction.chunk_retries:
+                attempt += 1
+                result.chunk_retries += 1
+                continue
+            if transaction.on_error == 'bisect' and classify_error(dialect, error) == FATAL:
+                return bisect_chunk(connection, execute, params, result)
+            raise
+        else:
+            if savepoint is not None:
+                savepoint.commit()
+            return len(params)
+
+
+def run_chunked(
+    connection: Connection,
+    dataframe,
+    execute: Callable[[Connection, List[dict]], None],
+    chunk_size: Optional[int] = None,
+    transaction: Optional[TransactionOptions] = None,
+    retry: Optional[RetryPolicy] = None,
+) -> LoadResult:
+    """
+    Feed a dataframe to `execute` in chunks, committing according to `transaction`.
+
+    Args:
+        connection (Connection): The connection to load through. It should not have a transaction in progress.
+        dataframe (DataFrame): The rows to load.
+        execute (Callable): Called with `(connection, params)` for every chunk.
+        chunk_size (int, optional): Rows per chunk. Defaults to `DialectCapabilities.chunk_size` for the
+                                    connection's dialect and the dataframe's width.
+        transaction (TransactionOptions, optional): Commit cadence and savepoint options. Defaults to one
+                                                    transaction for the whole load.
+        retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks. Without savepoints or a
+                                       commit cadence only the first chunk of a transaction can be retried.
+
+    Returns:
+        LoadResult: Row, chunk, commit and retry counts.
+
+    Raises:
+        DBAPIError: The first error that could not be retried. Work since the last commit is rolled back.
+    """
+    transaction = transaction or TransactionOptions()
+    chunk_size = chunk_size or get_dialect_capabilities(connection).chunk_size(len(dataframe.columns))
+    result = LoadResult()
+    rows_since_commit = 0
+    bytes_since_commit = 0
+
+    try:
+        for params in iter_param_chunks(dataframe, chunk_size):
+            result.rows_loaded += execute_chunk(
+                connection, execute, params, transaction, result, retry=retry, pending_rows=rows_since_commit
+            )
+            result.chunks += 1
+
+            rows_since_commit += len(params)
+            if transaction.commit_every_bytes:
+                bytes_since_commit += estimate_params_bytes(params)
+
+            if (transaction.commit_every_rows and rows_since_commit >= transaction.commit_every_rows) or (
+                transaction.commit_every_bytes and bytes_since_commit >= transaction.commit_every_bytes
+            ):
+                connection.commit()
+                result.commits += 1
+                rows_since_commit = 0
+                bytes_since_commit = 0
+
+        connection.commit()
+        result.commits += 1
+    except Exception:
+        connection.rollback()
+        raise
+
+    return result
+
+
+def execute_chunked(
+    connection: Connection,
+    statement: str,
+    dataframe,
+    chunk_size: Optional[int] = None,
+    transaction: Optional[TransactionOptions] = None,
+    retry: Optional[RetryPolicy] = None,
+) -> LoadResult:
+    """
+    Execute a parameterized statement (e.g. from `GenerateInsert.insert`) for every dataframe row.
+
+    Each chunk is sent as one `executemany` call. See `run_chunked` for the transaction handling.
+    """
+    compiled = text(statement)
+    return run_chunked(
+        connection,
+        dataframe,
+        lambda conn, params: conn.execute(compiled, params),
+        chunk_size=chunk_size,
+        transaction=transaction,
+        retry=retry,
+    )
@@ -1,8 +1,22 @@
+from typing import Tuple
+
 from keepitsql.core.insert import GenerateInsert
-from keepitsql.core.upsert import GenerateMergeStatement
+from keepitsql.core.load import LoadDataframe
+from keepitsql.core.type_coercion import (
+    CoercionReport,
+    coerce_to_table,
+)
+from keepitsql.core.upsert import (
+    GenerateMergeStatement,
+    parse_table_name,
+)
+from keepitsql.core.upsert_planner import (
+    UpsertPlan,
+    plan_upsert,
+)
 
 
-class FromDataframe(GenerateMergeStatement, GenerateInsert):
+class FromDataframe(GenerateMergeStatement, GenerateInsert, LoadDataframe):
     def __init__(self, dataframe):
         """
         Initializes a new instance of the FromDataframe class.
@@ -16,3 +30,59 @@ class FromDataframe(GenerateMergeStatement, GenerateInsert):
 
     def get_params(self, row):
         return {col: row[col] for col in self.dataframe.columns}
+
+    def plan_upsert(
+        self,
+        db_resource,
+        table_name: str,
+        match_condition: list,
+        constraint_columns: list = None,
+        full_snapshot: bool = False,
+        **kwargs,
+    ) -> UpsertPlan:
+        """
+        Pick the fastest load strategy for this dataframe and `table_name`, see `keepitsql.core.upsert_planner`.
+
+        Parameters
+        ----------
+        db_resource : Engine or Connection
+            The target database. Catalog statistics are read and a sample of keys is probed.
+        table_name : str
+            The target table.
+        match_condition : list
+            The columns used to match source and target rows.
+        constraint_columns : list, optional
+            Columns that should not be inserted, such as identities.
+        full_snapshot : bool
+            Whether the dataframe holds every row the table should contain.
+
+        Returns
+        -------
+        UpsertPlan
+            The chosen strategy, the statistics behind it, and an `execute` method.
+        """
+        return plan_upsert(self, db_resource, table_name, match_condition, constraint_columns, full_snapshot, **kwargs)
+
+    def coerce_to_table(
+        self, db_resource, table_name: str, time_zone: str = 'UTC'
+    ) -> Tuple['FromDataframe', CoercionReport]:
+        """
+        Cast the dataframe to the column types of `table_name`, see `keepitsql.core.type_coercion`.
+
+        Parameters
+        ----------
+        db_resource : str, Engine or Connection
+            The target database. The table is reflected through `CopyDDl`.
+        table_name : str
+            The target table, optionally schema qualified.
+        time_zone : str
+            The zone assumed for naive datetimes headed for offset-aware columns, and the other way around.
+
+        Returns
+        -------
+        Tuple[FromDataframe, CoercionReport]
+            A loader for the coerced dataframe, and the report of lossy casts.
+        """
+        schema_name, local_table_name = parse_table_name(table_name)
+        coerced, report = coerce_to_table(self.dataframe, db_resource, local_table_name, schema_name, time_zone)
+        return type(self)(coerced), report
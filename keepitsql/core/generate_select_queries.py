@@ -1,21 +1,29 @@
 import os
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from typing import (
     Dict,
     List,
+    Optional,
+    Union,
 )
 
+from loguru import logger
 from sqlalchemy import (
     Engine,
-    create_engine,
     inspect,
 )
 
-# Database connection string
-database_url = "sqlite:////Users/themobilescientist/Documents/projects/archive/keepitsql/test.db"  # Update this to your database URL
-
-# Create an engine
-engine = create_engine(database_url)
+from keepitsql.core.engine_registry import resolve_engine
+from keepitsql.core.schema_manifest import (
+    MANIFEST_FILE_NAME,
+    SchemaManifest,
+    table_fingerprint,
+)
+from keepitsql.sql_models.select import watermark as wm
 
 
 def format_column(column: Dict) -> str:
@@ -35,27 +43,219 @@ def format_column(column: Dict) -> str:
         return column['name']
 
 
-def export_select_statements(
+def build_select_statement(
+    table_name: str,
+    columns: List[Dict],
+    schema: Optional[str] = None,
+    foreign_keys: Optional[List[Dict]] = None,
+    coalesce_numeric: bool = True,
+    terminate: bool = True,
+) -> str:
+    """
+    Render the SELECT statement for one table from its reflected columns and foreign keys.
+
+    Args:
+        table_name (str): The table to select from.
+        columns (List[Dict]): Reflected column dictionaries, as returned by `Inspector.get_columns`.
+        schema (str, optional): The schema of the table.
+        foreign_keys (List[Dict], optional): Reflected foreign keys. A JOIN is added for each one.
+        coalesce_numeric (bool): Whether numeric columns are wrapped in `COALESCE(column, 0)`.
+        terminate (bool): Whether the statement ends with a semicolon. Disable it to append clauses.
+
+    Returns:
+        str: The SELECT statement.
+    """
+    # Formatting columns with commas in front
+    formatted_columns = [format_column(column) if coalesce_numeric else column['name'] for column in columns]
+    column_list = ",\n    ".join(formatted_columns)
+    column_list = column_list.replace(", ", ",\n    ", 1)  # Adjust comma placement for the first column
+
+    base_query = (
+        f"SELECT \n    {column_list} \nFROM \n    {schema}.{table_name}"
+        if schema
+        else f"SELECT \n    {column_list} \nFROM \n    {table_name}"
+    )
+
+    for fk in foreign_keys or []:
+        referenced_table = fk['referred_table']
+        referenced_schema = fk['referred_schema']
+        join_condition = " AND ".join(
+            f"{table_name}.{local_col} = {referenced_table}.{remote_col}"
+            for local_col, remote_col in zip(fk['constrained_columns'], fk['referred_columns'])
+        )
+        # Formatting join statement
+        base_query += (
+            f"\nJOIN {referenced_table} \n    ON {join_condition}"
+            if not referenced_schema
+            else f"\nJOIN {referenced_schema}.{referenced_table} \n    ON {join_condition}"
+        )
+
+    return f"{base_query};" if terminate else base_query
+
+
+def build_watermark_select(select_statement: str, watermark_column: str) -> str:
+    """Turn a SELECT statement into an extract of the rows at or past `:watermark`, in watermark order."""
+    return wm.watermark_extract.format(select_statement=select_statement.rstrip().rstrip(';'), column=watermark_column)
+
+
+@dataclass(frozen=True)
+class TableSelect:
+    """A rendered SELECT statement for one reflected table, and its watermark extract if one was requested."""
+
+    schema: Optional[str]
+    table_name: str
+    statement: str
+    fingerprint: Optional[str] = None
+    incremental_statement: Optional[str] = None
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.schema}.{self.table_name}" if self.schema else self.table_name
+
+
+def reflect_schema_selects(
     engine: Engine,
+    schema: Optional[str],
+    include_joins: bool = False,
+    fingerprint: bool = False,
+    watermark_columns: Optional[Dict[str, str]] = None,
+) -> List[TableSelect]:
+    """
+    Reflect every table of a schema in one pass and render its SELECT statement.
+
+    Columns, foreign keys and primary keys are fetched with SQLAlchemy's multi-table
+    reflection (`get_multi_columns` / `get_multi_foreign_keys` / `get_multi_pk_constraint`),
+    which issues one catalog query per schema instead of one per table.
+
+    Args:
+        engine (Engine): SQLAlchemy Engine connected to the database.
+        schema (str, optional): The schema to reflect.
+        include_joins (bool): Whether to include JOIN statements based on foreign keys.
+        fingerprint (bool): Whether to compute a schema fingerprint for each table.
+        watermark_columns (Dict[str, str], optional): Watermark column per table name (plain or schema
+                                                      qualified). Those tables also get an extract of the
+                                                      rows at or past `:watermark` (see `load_incremental`).
+
+    Returns:
+        List[TableSelect]: One rendered statement per table.
+    """
+    inspector = inspect(engine)
+    multi_columns = inspector.get_multi_columns(schema=schema)
+    multi_foreign_keys = inspector.get_multi_foreign_keys(schema=schema) if include_joins or fingerprint else {}
+    multi_primary_keys = inspector.get_multi_pk_constraint(schema=schema) if fingerprint else {}
+
+    watermark_columns = watermark_columns or {}
+
+    table_selects = []
+    for key, columns in multi_columns.items():
+        table_name = key[1]
+        foreign_keys = multi_foreign_keys.get(key)
+        qualified_name = f"{schema}.{table_name}" if schema else table_name
+        watermark_column = watermark_columns.get(qualified_name) or watermark_columns.get(table_name)
+        statement = build_select_statement(
+            table_name,
+            columns,
+            schema=schema,
+            foreign_keys=foreign_keys if include_joins else None,
+        )
+        table_selects.append(
+            TableSelect(
+                schema=schema,
+                table_name=table_name,
+                statement=statement,
+                fingerprint=(
+                    table_fingerprint(
+                        columns,
+                        multi_primary_keys.get(key, {}).get('constrained_columns'),
+                        foreign_keys,
+                        include_joins=include_joins,
+                        watermark_column=watermark_column,
+                    )
+                    if fingerprint
+                    else None
+                ),
+                incremental_statement=(
+                    build_watermark_select(statement, watermark_column) if watermark_column else None
+                ),
+            )
+        )
+    return table_selects
+
+
+def export_names(table_selects: List[TableSelect]) -> Dict[str, str]:
+    """
+    The name each table's script is exported under, by qualified table name.
+
+    Scripts are named after the bare table name, unless tables of that name exist in several schemas: those
+    are all named `<schema>.<table>`, so they do not overwrite each other.
+    """
+    name_counts = Counter(table_select.table_name for table_select in table_selects)
+    return {
+        table_select.qualified_name: (
+            table_select.table_name if name_counts[table_select.table_name] == 1 else table_select.qualified_name
+        )
+        for table_select in table_selects
+    }
+
+
+def _write_statement(file_path: str, query: str) -> str:
+    with open(file_path, 'w') as f:
+        f.write(query)
+    return file_path
+
+
+def export_select_statements(
+    engine: Union[str, Engine],
     output_path: str,
     include_joins: bool = False,
     file_prefix: str = '',
     file_suffix: str = '',
     overwrite: bool = False,
+    output_format: str = 'files',
+    max_workers: Optional[int] = None,
+    incremental: bool = False,
+    watermark_columns: Optional[Dict[str, str]] = None,
 ) -> None:
     """
     Generate SQL SELECT statements with optional joins and custom file naming options, handling file overwriting.
 
+    Each schema is reflected in a single pass and the per-table files are written on a
+    thread pool. With `output_format='bundle'` or `'zip'` all statements go into one
+    `.sql` file or one `.zip` archive instead of one file per table. Files, bundle sections and
+    archive members are named after the table, and after the schema-qualified table
+    (`<schema>.<table>.sql`) when several schemas hold a table of that name (see `export_names`).
+
+    With `incremental=True` the files are written straight into `output_path` together
+    with a manifest of per-table schema fingerprints (columns, types, PKs and FKs). Later
+    runs only rewrite the tables whose fingerprint changed or whose file is missing.
+
     Args:
-        engine (Engine): SQLAlchemy Engine connected to the database.
+        engine (str | Engine): A database URL or a SQLAlchemy Engine connected to the database.
         output_path (str): The directory path where SQL files will be saved.
         include_joins (bool): Whether to include JOIN statements based on foreign keys.
         file_prefix (str): Prefix to add to the filename.
         file_suffix (str): Suffix to add to the filename.
-        overwrite (bool): If False, create a new directory to avoid overwriting files.
+        overwrite (bool): If False, create a new directory to avoid overwriting files. Ignored when
+                          `incremental` is True.
+        output_format (str): 'files' (one file per table), 'bundle' (a single .sql file) or 'zip'.
+        max_workers (int, optional): Size of the worker pool used to write files. Defaults to the
+                                     ThreadPoolExecutor default.
+        incremental (bool): Only regenerate tables whose schema fingerprint changed since the last run.
+        watermark_columns (Dict[str, str], optional): Watermark column per table name. Those tables also get
+                                                      a `<table>_incremental` extract filtered on `:watermark`.
+
+    Raises:
+        ValueError: If `output_format` is not one of 'files', 'bundle' or 'zip', or if `incremental`
+                    is combined with a bundled output format.
     """
+    if output_format not in ('files', 'bundle', 'zip'):
+        raise ValueError("output_format must be 'files', 'bundle' or 'zip'.")
+    if incremental and output_format != 'files':
+        raise ValueError("incremental exports require output_format='files'.")
+    engine = resolve_engine(engine)
+
     # Adjust output path based on overwrite option
-    if not overwrite:
+    if not overwrite and not incremental:
         database_name = engine.url.database
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = os.path.join(output_path, f"{database_name}_{timestamp}")
@@ -63,43 +263,86 @@ def export_select_statements(
     # Ensure the output directory exists
     os.makedirs(output_path, exist_ok=True)
 
-    inspector = inspect(engine)
-    for schema in inspector.get_schema_names():
-        for table_name in inspector.get_table_names(schema=schema):
-            columns = inspector.get_columns(table_name, schema=schema)
-            # Formatting columns with commas in front
-            formatted_columns = [format_column(column) for column in columns]
-            column_list = ",\n    ".join(formatted_columns)
-            column_list = column_list.replace(", ", ",\n    ", 1)  # Adjust comma placement for the first column
-
-            base_query = (
-                f"SELECT \n    {column_list} \nFROM \n    {schema}.{table_name}"
-                if schema
-                else f"SELECT \n    {column_list} \nFROM \n    {table_name}"
-            )
+    manifest = SchemaManifest.load(os.path.join(output_path, MANIFEST_FILE_NAME)) if incremental else None
 
-            if include_joins:
-                fks = inspector.get_foreign_keys(table_name, schema=schema)
-                for fk in fks:
-                    referenced_table = fk['referred_table']
-                    referenced_schema = fk['referred_schema']
-                    join_condition = " AND ".join(
-                        f"{table_name}.{local_col} = {referenced_table}.{remote_col}"
-                        for local_col, remote_col in zip(fk['constrained_columns'], fk['referred_columns'])
-                    )
-                    # Formatting join statement
-                    base_query += (
-                        f"\nJOIN {referenced_table} \n    ON {join_condition}"
-                        if not referenced_schema
-                        else f"\nJOIN {referenced_schema}.{referenced_table} \n    ON {join_condition}"
-                    )
+    def file_path_for(name: str, name_suffix: str = '') -> str:
+        return os.path.join(output_path, f"{file_prefix}{name}{name_suffix}{file_suffix}.sql")
+
+    def write_table(table_select: TableSelect) -> List[str]:
+        name = names[table_select.qualified_name]
+        written = [_write_statement(file_path_for(name), table_select.statement)]
+        if table_select.incremental_statement:
+            incremental_path = file_path_for(name, '_incremental')
+            written.append(_write_statement(incremental_path, table_select.incremental_statement))
+        return written
+
+    schemas = inspect(engine).get_schema_names()
 
-            query = f"{base_query};"
-            file_name = f"{file_prefix}{table_name}{file_suffix}.sql"
-            file_path = os.path.join(output_path, file_name)
-            with open(file_path, 'w') as f:
-                f.write(query)
-            print(f"Generated SQL script for {table_name} with formatted columns and joins at '{file_path}'.")
+    table_selects: List[TableSelect] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        reflected = executor.map(
+            lambda schema: reflect_schema_selects(
+                engine, schema, include_joins, fingerprint=incremental, watermark_columns=watermark_columns
+            ),
+            schemas,
+        )
+        for schema_selects in reflected:
+            table_selects.extend(schema_selects)
+        names = export_names(table_selects)
+
+        if output_format == 'files':
+            if manifest is not None:
+                # Tables dropped since the last run lose their manifest entry and their scripts, as do tables
+                # whose script name changed because another schema gained or lost a table of the same name.
+                dropped = manifest.prune(table_select.qualified_name for table_select in table_selects)
+                previous_names = {
+                    name
+                    for qualified_name in [*dropped, *names]
+                    for name in (qualified_name, qualified_name.split('.')[-1])
+                }
+                for name in previous_names - set(names.values()):
+                    for name_suffix in ('', '_incremental'):
+                        stale_path = file_path_for(name, name_suffix)
+                        if os.path.exists(stale_path):
+                            os.remove(stale_path)
+                table_selects = [
+                    table_select
+                    for table_select in table_selects
+                    if manifest.is_changed(table_select.qualified_name, table_select.fingerprint)
+                    or not os.path.exists(file_path_for(names[table_select.qualified_name]))
+                ]
+
+            written = [path for paths in executor.map(write_table, table_selects) for path in paths]
+
+            if manifest is not None:
+                for table_select in table_selects:
+                    manifest.update(table_select.qualified_name, table_select.fingerprint)
+                manifest.save()
+
+            logger.info(f"Generated {len(written)} SQL scripts in '{output_path}'.")
+            return
+
+    if output_format == 'bundle':
+        bundle_path = os.path.join(output_path, f"{file_prefix}select_statements{file_suffix}.sql")
+        with open(bundle_path, 'w') as f:
+            for table_select in table_selects:
+                name = names[table_select.qualified_name]
+                f.write(f"-- {name}\n{table_select.statement}\n\n")
+                if table_select.incremental_statement:
+                    f.write(f"-- {name} (incremental)\n{table_select.incremental_statement}\n\n")
+        logger.info(f"Generated {len(table_selects)} SQL scripts in '{bundle_path}'.")
+    else:
+        zip_path = os.path.join(output_path, f"{file_prefix}select_statements{file_suffix}.zip")
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for table_select in table_selects:
+                name = names[table_select.qualified_name]
+                archive.writestr(f"{file_prefix}{name}{file_suffix}.sql", table_select.statement)
+                if table_select.incremental_statement:
+                    archive.writestr(
+                        f"{file_prefix}{name}_incremental{file_suffix}.sql",
+                        table_select.incremental_statement,
+                    )
+        logger.info(f"Generated {len(table_selects)} SQL scripts in '{zip_path}'.")
 
 
 # # # Specify the output path
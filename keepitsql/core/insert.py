@@ -1,3 +1,13 @@
+from typing import (
+    List,
+    Optional,
+)
+
+from keepitsql.core.column_plan import get_column_plan
+from keepitsql.core.dialect_capabilities import get_dialect_capabilities
+from keepitsql.core.executor import iter_frame_slices
+from keepitsql.core.sql_literals import render_value_rows
+from keepitsql.core.sql_script import SqlScriptWriter
 from keepitsql.core.table_properties import (
     format_table_name,
     prepare_column_select_list,
@@ -6,17 +16,33 @@ from keepitsql.core.table_properties import (
 from keepitsql.sql_models.insert import insert_statement as ist
 
 
+def parameter_value_rows(columns, row_count: int) -> str:
+    """Render `row_count` VALUES rows binding `:column_<row>` parameters, see `values_params`."""
+    return ',\n'.join(
+        ist.value_row.format(row_values=', '.join(ist.values_bind.format(column=col, row=row) for col in columns))
+        for row in range(row_count)
+    )
+
+
+def values_params(rows: List[dict]) -> dict:
+    """Flatten a chunk of row dictionaries into the `:column_<row>` parameters of a multi-row VALUES statement."""
+    return {f'{column}_{row_number}': value for row_number, row in enumerate(rows) for column, value in row.items()}
+
+
 class GenerateInsert:
     def __init__(self, dataframe) -> None:
         self.dataframe = dataframe
 
-    def insert(self, table_name: str, column_select: list = None, source_table: str = None) -> str:
+    def insert(
+        self, table_name: str, column_select: list = None, source_table: str = None, values_rows: int = None
+    ) -> str:
         """Generates an SQL INSERT statement for inserting data from the source DataFrame into the target table. This method supports selective column insertion and can format the table name for temporary tables. The values from the DataFrame are formatted as strings, with special handling for None values and escaping single quotes.
 
         Parameters
         ----------
         - column_select (list of str, optional): A list specifying which columns from the source DataFrame should be included in the INSERT statement. If None, all columns are used.
         - temp_type (str, optional): Specifies the type of temporary table. This affects the naming convention used in the SQL statement. For example, 'local' or 'global' temporary tables in MSSQL. If None, a standard table name format is used.
+        - values_rows (int, optional): Render one multi-row VALUES list of this many rows, binding `:column_<row>` parameters (see `values_params`), so a whole batch is inserted by one statement execution.
 
         Returns
         -------
@@ -42,11 +68,10 @@ class GenerateInsert:
         print(insert_statement)
         ```
         """
-        source_dataframe = self.dataframe
-        columns = source_dataframe.columns
+        plan = get_column_plan(self.dataframe, column_select=column_select)
 
-        columns_placeholder = ",\n    ".join(columns)
-        values_placeholder = ",\n    ".join([f":{col}" for col in columns])
+        columns_placeholder = plan.insert_column_list
+        values_placeholder = plan.insert_value_list
 
         # Construct the full INSERT statement
         insert_statement = ist.standard_insert.format(
@@ -55,6 +80,13 @@ class GenerateInsert:
             insert_value_list=values_placeholder,
         )
 
+        if values_rows is not None:
+            return ist.multi_row_parameter_insert.format(
+                table_name=table_name,
+                column_names=columns_placeholder,
+                value_rows=parameter_value_rows(plan.columns, values_rows),
+            )
+
         insert_statement_select = ist.insert_select_statment.format(
             target_table_name=table_name, column_names=columns_placeholder, source_table=source_table
         )
@@ -63,3 +95,49 @@ class GenerateInsert:
             return insert_statement_select
         else:
             return insert_statement
+
+    def write_insert_script(
+        self,
+        output_path: str,
+        table_name: str,
+        dialect: Optional[str] = None,
+        rows_per_statement: int = 1000,
+        max_file_bytes: Optional[int] = None,
+        compress: bool = False,
+    ) -> List[str]:
+        """Writes the DataFrame to a SQL script of multi-row INSERT statements with literal values.
+
+        Statements are rendered and written one at a time, so memory use does not grow with the number of rows.
+
+        Parameters
+        ----------
+        - output_path (str): The script path, e.g. `dump.sql`. See `SqlScriptWriter` for rotated and compressed names.
+        - table_name (str): The target table referenced by the statements.
+        - dialect (str, optional): The target dialect. Decides literal spelling and caps the rows per statement
+          where multi-row VALUES is limited (e.g. 1000 rows on MSSQL) or unsupported (one row per statement).
+        - rows_per_statement (int): Rows per INSERT statement.
+        - max_file_bytes (int, optional): Start a new numbered file before one grows past this size.
+        - compress (bool): Write gzip-compressed files.
+
+        Returns
+        -------
+        - List[str]: The paths of the files written, in order.
+        """
+        if dialect is not None:
+            capabilities = get_dialect_capabilities(dialect)
+            if not capabilities.multi_row_values:
+                rows_per_statement = 1
+            elif capabilities.max_rows_per_values is not None:
+                rows_per_statement = min(rows_per_statement, capabilities.max_rows_per_values)
+
+        column_names = get_column_plan(self.dataframe).insert_column_list
+
+        with SqlScriptWriter(output_path, max_file_bytes=max_file_bytes, compress=compress) as writer:
+            for chunk in iter_frame_slices(self.dataframe, rows_per_statement):
+                value_rows = ',\n'.join(
+                    ist.value_row.format(row_values=row_values) for row_values in render_value_rows(chunk, dialect)
+                )
+                writer.write(
+                    ist.multi_row_insert.format(table_name=table_name, column_names=column_names, value_rows=value_rows)
+                )
+        return writer.paths
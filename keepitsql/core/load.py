@@ -0,0 +1,584 @@
+from __future__ import annotations
+
+import uuid
+from functools import lru_cache
+from typing import (
+    List,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+    inspect,
+    text,
+)
+
+from keepitsql.core.column_plan import project_columns
+from keepitsql.core.dialect_capabilities import (
+    MERGE,
+    get_dialect_capabilities,
+)
+from keepitsql.core.executor import (
+    LoadResult,
+    TransactionOptions,
+    connection_scope,
+    ensure_transaction,
+    execute_chunked,
+    iter_param_chunks,
+    run_chunked,
+)
+from keepitsql.core.insert import values_params
+from keepitsql.core.retry import (
+    RetryPolicy,
+    run_with_retry,
+)
+from keepitsql.core.sqlite_bulk import (
+    SqliteBulkProfile,
+    execute_sqlite_bulk,
+)
+from keepitsql.core.table_properties import select_dataframe_column
+from keepitsql.core.upsert import (
+    parse_table_name,
+    scope_params,
+)
+from keepitsql.gen_ddl import CopyDDl
+from keepitsql.sql_models import alter_table as at
+
+
+def swap_table_statements(dbms: str, schema_name: Optional[str], table_name: str, shadow_table_name: str) -> List[str]:
+    """
+    Statements that replace `table_name` with `shadow_table_name` and drop the old table.
+
+    Run them in one transaction. On databases with transactional DDL (PostgreSQL, SQL Server, SQLite)
+    readers see either the old table or the new one; MySQL swaps both names in one atomic RENAME TABLE.
+    """
+    old_table_name = f'{table_name}__old'
+
+    def qualify(name: str) -> str:
+        return f'{schema_name}.{name}' if schema_name else name
+
+    if dbms in at.swap_tables:
+        swap = [
+            at.swap_tables[dbms].format(
+                table_name=qualify(table_name),
+                old_table_name=qualify(old_table_name),
+                shadow_table_name=qualify(shadow_table_name),
+            )
+        ]
+    else:
+        rename = at.rename_table.get(dbms, at.rename_table['default'])
+        swap = [
+            rename.format(table_name=qualify(table_name), new_table_name=old_table_name),
+            rename.format(table_name=qualify(shadow_table_name), new_table_name=table_name),
+        ]
+    return swap + [at.drop_table.format(table_name=qualify(old_table_name))]
+
+
+@lru_cache(maxsize=64)
+def values_statement(statement: str):
+    """Compile a multi-row VALUES statement once per process; parsing thousands of bind names is not free."""
+    return text(statement)
+
+
+def drop_staging_table(connection: Connection, staging_table_name: str, raise_errors: bool = True) -> None:
+    """
+    Drop a staging table and commit.
+
+    With `raise_errors` off a failed drop is rolled back and ignored, so that cleaning up after a failed load
+    does not replace the load's own error.
+    """
+    try:
+        connection.execute(text(at.drop_table.format(table_name=staging_table_name)))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        if raise_errors:
+            raise
+
+
+class LoadDataframe:
+    def __init__(self, dataframe) -> None:
+        self.dataframe = dataframe
+
+    def select_columns(self, column_select: Optional[list], match_condition: Optional[list] = None):
+        """
+        A loader for the `column_select` columns (and the match columns) of the dataframe, see `project_columns`.
+
+        The dataframe is not copied: a Polars selection shares the column buffers, as does a Pandas one under
+        copy-on-write (the default from Pandas 3). Only the selected columns are converted to parameters.
+
+        Args:
+            column_select (list, optional): The columns to keep. None keeps every column.
+            match_condition (list, optional): Columns that are always kept.
+
+        Returns:
+            LoadDataframe: A loader of the same type over the projected dataframe, or this one if nothing is dropped.
+        """
+        columns = project_columns(self.dataframe.columns, column_select, match_condition)
+        if len(columns) == len(self.dataframe.columns):
+            return self
+        return type(self)(select_dataframe_column(self.dataframe, list(columns)))
+
+    def create_staging_table(
+        self,
+        connection: Connection,
+        table_name: str,
+        staging_table_name: Optional[str] = None,
+    ) -> str:
+        """
+        Create a temporary copy of the target table's columns (without a primary key) to stage rows in.
+
+        Only the target columns the dataframe holds are created, so a projected load stages just those.
+
+        Args:
+            connection (Connection): The connection the staging table is created on. Temporary tables are
+                                     only visible to this connection.
+            table_name (str): The target table, optionally schema qualified.
+            staging_table_name (str, optional): The staging table name. Defaults to `<table>_stage_<random hex>`,
+                                                unique per load, since MSSQL's `##` temporary tables are
+                                                visible to every session and concurrent loads must not share one.
+
+        Returns:
+            str: The name to reference the staging table by (e.g. `##<name>` on MSSQL).
+        """
+        schema_name, local_table_name = parse_table_name(table_name)
+        staging_table_name = staging_table_name or f'{local_table_name}_stage_{uuid.uuid4().hex[:12]}'
+        dbms = connection.dialect.name
+
+        _, temp_table_ddl = CopyDDl(
+            connection.engine,
+            local_table_name,
+            schema_name,
+        ).create_ddl(
+            new_table_name=staging_table_name,
+            temp_dll_output=dbms,
+            drop_primary_key='Y',
+            temp_column_select=list(self.dataframe.columns),
+        )
+        connection.execute(text(temp_table_ddl))
+
+        return get_dialect_capabilities(dbms).temp_table_name(staging_table_name)
+
+    def load_insert(
+        self,
+        db_resource: Union[Engine, Connection],
+        table_name: str,
+        chunk_size: Optional[int] = None,
+        transaction: Optional[TransactionOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        sqlite_bulk: Union[bool, SqliteBulkProfile] = False,
+        column_select: Optional[list] = None,
+    ) -> LoadResult:
+        """
+        Insert the dataframe into `table_name` in chunks of parameterized `executemany` calls.
+
+        Args:
+            db_resource (Engine | Connection): Where to load. An Engine is connected for the duration of the load.
+            table_name (str): The target table.
+            chunk_size (int, optional): Rows per chunk. Defaults to a size derived from the dialect's capabilities
+                                        and the number of columns.
+            transaction (TransactionOptions, optional): Commit cadence and savepoint options. Defaults to one
+                                                        transaction for the whole load.
+            retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks.
+            sqlite_bulk (bool | SqliteBulkProfile): On SQLite, load through the raw `sqlite3` cursor in a single
+                                                    `BEGIN IMMEDIATE` transaction with bulk-load PRAGMAs (see
+                                                    `keepitsql.core.sqlite_bulk`). `transaction` is ignored.
+            column_select (list, optional): Only insert these columns, leaving the others to their defaults.
+
+        Returns:
+            LoadResult: Row, chunk, commit and retry counts.
+        """
+        if column_select is not None:
+            return self.select_columns(column_select).load_insert(
+                db_resource, table_name, chunk_size, transaction, retry, sqlite_bulk
+            )
+
+        statement = self.insert(table_name)
+        with connection_scope(db_resource) as connection:
+            if sqlite_bulk:
+                return self._load_sqlite_bulk(connection, statement, chunk_size, sqlite_bulk, retry)
+            return execute_chunked(connection, statement, self.dataframe, chunk_size, transaction, retry)
+
+    def load_upsert(
+        self,
+        db_resource: Union[Engine, Connection],
+        table_name: str,
+        match_condition: list,
+        constraint_columns: list = None,
+        chunk_size: Optional[int] = None,
+        transaction: Optional[TransactionOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        sqlite_bulk: Union[bool, SqliteBulkProfile] = False,
+        inline_values: bool = False,
+        skip_unchanged: bool = False,
+        column_select: Optional[list] = None,
+    ) -> LoadResult:
+        """
+        Upsert the dataframe into `table_name` in chunks.
+
+        On ON CONFLICT / ON DUPLICATE KEY databases each chunk is one `executemany` of the upsert statement.
+        On MERGE databases each chunk is inserted into a temporary staging table, merged into the target
+        and cleared, so the commit cadence applies to the target writes as well.
+
+        With `inline_values=True` each chunk is instead sent as one upsert whose source is an inline
+        parameterized `VALUES` list, capped at `DialectCapabilities.rows_per_statement` rows. No staging table
+        is created, which is what dominates the latency of small batches.
+
+        Args:
+            db_resource (Engine | Connection): Where to load. An Engine is connected for the duration of the load.
+            table_name (str): The target table.
+            match_condition (list): The columns used to match source and target rows.
+            constraint_columns (list, optional): Columns that should not be inserted, such as identities.
+            chunk_size (int, optional): Rows per chunk. Defaults to a size derived from the dialect's capabilities
+                                        and the number of columns.
+            transaction (TransactionOptions, optional): Commit cadence and savepoint options. Defaults to one
+                                                        transaction for the whole load.
+            retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks.
+            sqlite_bulk (bool | SqliteBulkProfile): On SQLite, load through the raw `sqlite3` cursor in a single
+                                                    `BEGIN IMMEDIATE` transaction with bulk-load PRAGMAs.
+                                                    `transaction` is ignored.
+            inline_values (bool): Upsert each chunk with a single statement over an inline VALUES source.
+            skip_unchanged (bool): On ON CONFLICT databases, leave conflicting rows whose values are unchanged
+                                   untouched instead of rewriting them. MERGE statements always do so.
+            column_select (list, optional): Only insert and update these columns; the match columns are always
+                                            included. Columns a wide dataframe does not change are then neither
+                                            converted to parameters nor sent.
+
+        Returns:
+            LoadResult: Row, chunk, commit and retry counts.
+        """
+        if column_select is not None:
+            loader = self.select_columns(column_select, match_condition)
+            return loader.load_upsert(
+                db_resource,
+                table_name,
+                match_condition,
+                [col for col in constraint_columns or () if col in loader.dataframe.columns] or None,
+                chunk_size,
+                transaction,
+                retry,
+                sqlite_bulk,
+                inline_values,
+                skip_unchanged,
+            )
+
+        with connection_scope(db_resource) as connection:
+            dbms = connection.dialect.name
+
+            if inline_values:
+                return self._load_inline_values(
+                    connection,
+                    table_name,
+                    match_condition,
+                    constraint_columns,
+                    chunk_size,
+                    transaction,
+                    retry,
+                    skip_unchanged,
+                )
+
+            if get_dialect_capabilities(dbms).upsert_type != MERGE:
+                statement = self.generate_insert_on_conflict(
+                    table_name, match_condition, constraint_columns, dbms=dbms, skip_unchanged=skip_unchanged
+                )
+                if sqlite_bulk:
+                    return self._load_sqlite_bulk(connection, statement, chunk_size, sqlite_bulk, retry)
+                return execute_chunked(connection, statement, self.dataframe, chunk_size, transaction, retry)
+
+            staging_table_name = self.create_staging_table(connection, table_name)
+            connection.commit()
+            stage_rows = text(self.insert(staging_table_name))
+            merge_rows = text(
+                self.generate_merge_statement(
+                    table_name,
+                    match_condition,
+                    constraint_columns=constraint_columns,
+                    source_table_name=staging_table_name,
+                )
+            )
+            clear_stage = text(f'DELETE FROM {staging_table_name}')
+
+            def merge_chunk(conn: Connection, params: list) -> None:
+                conn.execute(stage_rows, params)
+                conn.execute(merge_rows)
+                conn.execute(clear_stage)
+
+            try:
+                result = run_chunked(connection, self.dataframe, merge_chunk, chunk_size, transaction, retry)
+            except Exception:
+                drop_staging_table(connection, staging_table_name, raise_errors=False)
+                raise
+            drop_staging_table(connection, staging_table_name)
+            return result
+
+    def load_delete(
+        self,
+        db_resource: Union[Engine, Connection],
+        table_name: str,
+        match_condition: list,
+        chunk_size: Optional[int] = None,
+        transaction: Optional[TransactionOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> LoadResult:
+        """
+        Delete the target rows whose `match_condition` columns equal those of a dataframe row.
+
+        Args:
+            db_resource (Engine | Connection): Where to delete. An Engine is connected for the duration of the load.
+            table_name (str): The target table.
+            match_condition (list): The key columns. The dataframe may hold only these, e.g. `SnapshotDiff.deletes`.
+            chunk_size (int, optional): Rows per chunk. Defaults to a size derived from the dialect's capabilities
+                                        and the number of columns.
+            transaction (TransactionOptions, optional): Commit cadence and savepoint options. Defaults to one
+                                                        transaction for the whole load.
+            retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks.
+
+        Returns:
+            LoadResult: Row, chunk, commit and retry counts. `rows_loaded` counts the keys sent.
+        """
+        statement = self.generate_delete(table_name, match_condition)
+        with connection_scope(db_resource) as connection:
+            return execute_chunked(connection, statement, self.dataframe, chunk_size, transaction, retry)
+
+    def load_sync(
+        self,
+        db_resource: Union[Engine, Connection],
+        table_name: str,
+        match_condition: list,
+        constraint_columns: list = None,
+        delete_scope: Optional[dict] = None,
+        chunk_size: Optional[int] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> LoadResult:
+        """
+        Make `table_name` mirror the dataframe: upsert every row and delete target rows missing from it.
+
+        The dataframe is loaded into a temporary staging table, then applied with set-based statements in
+        the same transaction: one MERGE ... WHEN NOT MATCHED BY SOURCE THEN DELETE where the database supports
+        it, otherwise the usual MERGE or INSERT ... ON CONFLICT from the staging table followed by an
+        anti-join `DELETE ... WHERE NOT EXISTS`. An empty dataframe therefore empties the target (or scope).
+
+        Args:
+            db_resource (Engine | Connection): Where to load. An Engine is connected for the duration of the load.
+            table_name (str): The target table.
+            match_condition (list): The columns used to match source and target rows.
+            constraint_columns (list, optional): Columns that should not be inserted, such as identities.
+            delete_scope (dict, optional): Only delete target rows whose columns equal these values, e.g.
+                                           `{'region': 'EU'}` when the dataframe holds one partition.
+            chunk_size (int, optional): Rows per staging insert. Defaults to a size derived from the dialect's
+                                        capabilities and the number of columns.
+            retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks. The whole sync is
+                                           retried, since nothing is committed until it finishes.
+
+        Returns:
+            LoadResult: Row and chunk counts of the staged rows.
+        """
+        with connection_scope(db_resource) as connection:
+            capabilities = get_dialect_capabilities(connection)
+            chunk_size = chunk_size or capabilities.chunk_size(len(self.dataframe.columns))
+
+            staging_table_name = self.create_staging_table(connection, table_name)
+            connection.commit()
+            stage_rows = text(self.insert(staging_table_name))
+
+            if capabilities.upsert_type == MERGE:
+                upsert_statement = self.generate_merge_statement(
+                    table_name,
+                    match_condition,
+                    constraint_columns=constraint_columns,
+                    source_table_name=staging_table_name,
+                    delete_not_matched=capabilities.merge_delete_by_source,
+                    delete_scope=delete_scope,
+                )
+            else:
+                upsert_statement = self.generate_insert_on_conflict(
+                    table_name,
+                    match_condition,
+                    constraint_columns,
+                    source_table_name=staging_table_name,
+                    dbms=capabilities.name,
+                )
+            statements = [text(upsert_statement)]
+            if not (capabilities.upsert_type == MERGE and capabilities.merge_delete_by_source):
+                delete_statement = self.generate_delete_not_in_source(
+                    table_name, match_condition, staging_table_name, delete_scope
+                )
+                statements.append(text(delete_statement))
+
+            def sync() -> LoadResult:
+                result = LoadResult()
+                try:
+                    for params in iter_param_chunks(self.dataframe, chunk_size):
+                        connection.execute(stage_rows, params)
+                        result.rows_loaded += len(params)
+                        result.chunks += 1
+                    for statement in statements:
+                        connection.execute(statement, scope_params(delete_scope))
+                    connection.commit()
+                    result.commits += 1
+                except Exception:
+                    connection.rollback()
+                    raise
+                return result
+
+            try:
+                result = run_with_retry(sync, capabilities.name, retry)
+            except Exception:
+                drop_staging_table(connection, staging_table_name, raise_errors=False)
+                raise
+            drop_staging_table(connection, staging_table_name)
+            return result
+
+    def load_refresh(
+        self,
+        db_resource: Union[Engine, Connection],
+        table_name: str,
+        chunk_size: Optional[int] = None,
+        transaction: Optional[TransactionOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        sqlite_bulk: Union[bool, SqliteBulkProfile] = False,
+    ) -> LoadResult:
+        """
+        Replace the contents of `table_name` with the dataframe by rebuilding the table and swapping it in.
+
+        The target's definition is copied with `CopyDDl.create_table_copy_ddl` to a shadow table
+        (`<table>__shadow`) with the primary key, column defaults and CHECK constraints but no other indexes, the
+        dataframe is bulk inserted into it, and the secondary indexes, unique constraints and foreign keys are
+        built afterwards. The shadow table is then renamed over the target in one transaction
+        and the old table dropped.
+
+        Index and constraint names that must be unique per schema are built with a `_refresh` suffix, which is
+        toggled on every refresh (see `toggle_name_suffix`). Tables referenced by other tables' foreign keys
+        cannot be swapped, since the references would follow the old table; use `load_sync` for those. Neither
+        can tables with identity or sequence-generated columns outside SQLite: the shadow table's identity would
+        restart, and a sequence owned by the old table is dropped with it. On SQLite, tables with foreign keys
+        are not supported because constraints cannot be added after the load.
+
+        Args:
+            db_resource (Engine | Connection): Where to load. An Engine is connected for the duration of the load.
+            table_name (str): The target table.
+            chunk_size (int, optional): Rows per insert chunk into the shadow table.
+            transaction (TransactionOptions, optional): Commit cadence for the shadow table load.
+            retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks, including the swap.
+            sqlite_bulk (bool | SqliteBulkProfile): Load the shadow table with the SQLite bulk profile.
+
+        Returns:
+            LoadResult: Row, chunk and commit counts of the shadow table load.
+
+        Raises:
+            ValueError: If other tables' foreign keys refer to the table, if it has identity or sequence-generated
+                        columns (except on SQLite), or on SQLite, if the table has foreign keys.
+        """
+        schema_name, local_table_name = parse_table_name(table_name)
+        shadow_table_name = f'{local_table_name}__shadow'
+        qualified_shadow_name = f'{schema_name}.{shadow_table_name}' if schema_name else shadow_table_name
+
+        with connection_scope(db_resource) as connection:
+            capabilities = get_dialect_capabilities(connection)
+            copy_ddl = CopyDDl(connection.engine, local_table_name, schema_name)
+
+            referencing_tables = copy_ddl.referencing_tables()
+            if referencing_tables:
+                raise ValueError(
+                    f"Cannot refresh {table_name}: it is referenced by foreign keys of {', '.join(referencing_tables)}."
+                )
+            if capabilities.name != 'sqlite' and any(
+                column.get('identity') or 'nextval(' in str(column.get('default') or '')
+                for column in copy_ddl.get_table_info()
+            ):
+                raise ValueError(
+                    f"Cannot refresh {table_name}: its identity or sequence-generated keys would not survive the swap."
+                )
+            foreign_key_ddl = copy_ddl.create_foriegn_key_statements(
+                new_schema_name=schema_name, new_table_name=shadow_table_name, toggle_names=True
+            )
+            if foreign_key_ddl and not capabilities.alter_add_foreign_key:
+                raise ValueError(
+                    f"Cannot refresh {table_name}: {capabilities.name} cannot add foreign keys after a load."
+                )
+
+            shadow_table_ddl = copy_ddl.create_table_copy_ddl(new_table_name=shadow_table_name, toggle_names=True)
+            build_statements = copy_ddl.create_index_statements(
+                new_table_name=shadow_table_name, toggle_names=not capabilities.index_names_per_table
+            )
+            build_statements += [statement for statement in foreign_key_ddl.split(';') if statement.strip()]
+
+            if inspect(connection).has_table(shadow_table_name, schema=schema_name):
+                connection.execute(text(at.drop_table.format(table_name=qualified_shadow_name)))
+            connection.execute(text(shadow_table_ddl))
+            connection.commit()
+
+            try:
+                result = self.load_insert(
+                    connection, qualified_shadow_name, chunk_size, transaction, retry, sqlite_bulk
+                )
+                for statement in build_statements:
+                    connection.execute(text(statement))
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                connection.execute(text(at.drop_table.format(table_name=qualified_shadow_name)))
+                connection.commit()
+                raise
+
+            swap_statements = swap_table_statements(capabilities.name, schema_name, local_table_name, shadow_table_name)
+
+            def swap() -> None:
+                ensure_transaction(connection)
+                try:
+                    for statement in swap_statements:
+                        connection.execute(text(statement))
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+
+            run_with_retry(swap, capabilities.name, retry)
+            return result
+
+    def _load_inline_values(
+        self,
+        connection: Connection,
+        table_name: str,
+        match_condition: list,
+        constraint_columns: Optional[list],
+        chunk_size: Optional[int],
+        transaction: Optional[TransactionOptions],
+        retry: Optional[RetryPolicy],
+        skip_unchanged: bool = False,
+    ) -> LoadResult:
+        capabilities = get_dialect_capabilities(connection)
+        rows_per_statement = capabilities.rows_per_statement(len(self.dataframe.columns))
+        chunk_size = min(chunk_size or rows_per_statement, rows_per_statement)
+        # One statement per distinct row count: full chunks, the last chunk and bisected halves.
+        statements = {}
+
+        def upsert_chunk(conn: Connection, params: list) -> None:
+            row_count = len(params)
+            if row_count not in statements:
+                statements[row_count] = values_statement(
+                    self.dbms_merge_generator(
+                        table_name,
+                        match_condition,
+                        capabilities.name,
+                        constraint_columns=constraint_columns,
+                        values_rows=row_count,
+                        skip_unchanged=skip_unchanged,
+                    )
+                )
+            conn.execute(statements[row_count], values_params(params))
+
+        return run_chunked(connection, self.dataframe, upsert_chunk, chunk_size, transaction, retry)
+
+    def _load_sqlite_bulk(
+        self,
+        connection: Connection,
+        statement: str,
+        chunk_size: Optional[int],
+        sqlite_bulk: Union[bool, SqliteBulkProfile],
+        retry: Optional[RetryPolicy],
+    ) -> LoadResult:
+        profile = sqlite_bulk if isinstance(sqlite_bulk, SqliteBulkProfile) else None
+        return execute_sqlite_bulk(connection, statement, self.dataframe, chunk_size, profile, retry)
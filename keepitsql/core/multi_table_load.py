@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
+)
+from graphlib import (
+    CycleError,
+    TopologicalSorter,
+)
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from sqlalchemy import (
+    URL,
+    Connection,
+    Engine,
+)
+
+from keepitsql.core.dialect_capabilities import get_dialect_capabilities
+from keepitsql.core.engine_registry import resolve_engine
+from keepitsql.core.executor import (
+    LoadResult,
+    TransactionOptions,
+)
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.core.retry import RetryPolicy
+from keepitsql.core.upsert import parse_table_name
+from keepitsql.gen_ddl import CopyDDl
+
+
+def table_dependencies(db_resource: Union[str, URL, Engine, Connection], table_names: List[str]) -> Dict[str, Set[str]]:
+    """
+    Reflect the foreign keys between `table_names`.
+
+    References to tables outside `table_names` and self references are left out, as they do not constrain the
+    order the given tables are loaded in. Names are matched case-insensitively, and an unqualified reference
+    is resolved in the schema of the referring table.
+
+    Args:
+        db_resource (str | Engine | Connection): The database holding the tables.
+        table_names (List[str]): The tables, optionally schema qualified.
+
+    Returns:
+        Dict[str, Set[str]]: The tables of `table_names` each table refers to.
+    """
+    engine = resolve_engine(db_resource)
+    known = {table_name.lower(): table_name for table_name in table_names}
+
+    dependencies = {}
+    for table_name in table_names:
+        schema_name, local_table_name = parse_table_name(table_name)
+        referred = set()
+        for referred_name in CopyDDl(engine, local_table_name, schema_name).referred_tables():
+            if '.' not in referred_name and schema_name:
+                referred_name = f'{schema_name}.{referred_name}'
+            match = known.get(referred_name.lower()) or known.get(referred_name.rpartition('.')[2].lower())
+            if match is not None and match != table_name:
+                referred.add(match)
+        dependencies[table_name] = referred
+    return dependencies
+
+
+def load_tables(
+    db_resource: Union[str, URL, Engine, Connection],
+    frames: Dict[str, object],
+    match_conditions: Optional[Dict[str, list]] = None,
+    constraint_columns: Optional[Dict[str, list]] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    transaction: Optional[TransactionOptions] = None,
+    retry: Optional[RetryPolicy] = None,
+) -> Dict[str, LoadResult]:
+    """
+    Load several related tables, parents before the tables whose foreign keys refer to them.
+
+    The dependency graph is reflected with `table_dependencies`. A table is loaded as soon as every table it
+    refers to has committed, each on its own pooled connection, so independent branches of the model load in
+    parallel. Tables with a match condition are upserted, the others inserted.
+
+    Loads run one at a time on a Connection, and by default on databases without concurrent writers (SQLite).
+
+    Args:
+        db_resource (str | Engine | Connection): Where to load.
+        frames (Dict[str, DataFrame]): The rows of each table, keyed by (optionally schema qualified) table name.
+        match_conditions (Dict[str, list], optional): The columns used to match source and target rows, for
+                                                      the tables to upsert.
+        constraint_columns (Dict[str, list], optional): Per table, columns that should not be inserted.
+        max_workers (int, optional): Tables loaded at the same time. Keep it within the engine's
+                                     `pool_size + max_overflow`. Defaults to the ThreadPoolExecutor default.
+        chunk_size (int, optional): Rows per chunk of each load.
+        transaction (TransactionOptions, optional): Commit cadence and savepoint options of each load.
+        retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks.
+
+    Returns:
+        Dict[str, LoadResult]: The result of each table's load, in load order.
+
+    Raises:
+        ValueError: If the foreign keys between the tables form a cycle.
+    """
+    engine = resolve_engine(db_resource)
+    match_conditions = match_conditions or {}
+    constraint_columns = constraint_columns or {}
+
+    sorter = TopologicalSorter(table_dependencies(engine, list(frames)))
+    try:
+        sorter.prepare()
+    except CycleError as error:
+        raise ValueError(f"The foreign keys form a cycle: {' -> '.join(error.args[1])}") from error
+
+    if isinstance(engine, Connection):
+        max_workers = 1
+    elif max_workers is None and not get_dialect_capabilities(engine).concurrent_writers:
+        max_workers = 1
+
+    def load_table(table_name: str) -> LoadResult:
+        loader = FromDataframe(frames[table_name])
+        if table_name in match_conditions:
+            return loader.load_upsert(
+                engine,
+                table_name,
+                match_conditions[table_name],
+                constraint_columns.get(table_name),
+                chunk_size=chunk_size,
+                transaction=transaction,
+                retry=retry,
+            )
+        return loader.load_insert(engine, table_name, chunk_size=chunk_size, transaction=transaction, retry=retry)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while sorter.is_active():
+            for table_name in sorter.get_ready():
+                running[executor.submit(load_table, table_name)] = table_name
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                table_name = running.pop(future)
+                try:
+                    results[table_name] = future.result()
+                except Exception:
+                    for pending in running:
+                        pending.cancel()
+                    raise
+                sorter.done(table_name)
+    return results
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Callable,
+    Dict,
+    Optional,
+)
+
+from sqlalchemy.exc import DBAPIError
+
+TRANSIENT = 'transient'
+FATAL = 'fatal'
+
+# SQLSTATEs and vendor error numbers that indicate lock contention or a deadlock. SQLite's driver
+# has no error codes, so its messages are matched instead.
+transient_error_codes = {
+    'sqlite': ('database is locked', 'database table is locked', 'database schema is locked'),
+    'postgresql': ('40P01', '40001', '55P03'),  # deadlock, serialization failure, lock not available
+    'mssql': ('40001', '1205', '1222'),  # deadlock victim (SQLSTATE and error number), lock request timeout
+    'mysql': ('1213', '1205'),  # deadlock, lock wait timeout
+    'oracle': ('ORA-00060', 'ORA-00054'),  # deadlock, resource busy
+}
+
+# Transient errors after which the server has already rolled back the whole transaction,
+# so retrying from a savepoint is not possible.
+transaction_aborting_codes = {
+    'mssql': ('40001', '1205'),
+    'mysql': ('1213',),
+}
+
+# pyodbc appends the native error number and the failing ODBC call to the message, e.g. "... (1205) (SQLExecDirectW)".
+_odbc_native_error = re.compile(r'\((\d+)\) \(SQL\w+\)$')
+
+
+def _error_codes(error: DBAPIError) -> set:
+    """
+    The structured codes the driver attached to an error, never numbers that merely appear in its message.
+
+    These are the SQLSTATE (`pgcode` on psycopg2, `sqlstate` on psycopg, the first argument on pyodbc), the
+    vendor error number (the first argument on MySQL drivers and pymssql, pyodbc's native error) and the
+    ORA- code of Oracle errors.
+    """
+    orig = error.orig
+    args = getattr(orig, 'args', ())
+    codes = {getattr(orig, 'pgcode', None), getattr(orig, 'sqlstate', None), getattr(orig, 'errno', None)}
+    if args:
+        first = args[0]
+        if isinstance(first, int) or (isinstance(first, str) and re.fullmatch(r'[0-9A-Z]{5}', first)):
+            codes.add(first)
+        codes.add(getattr(first, 'full_code', None))
+        if len(args) > 1 and isinstance(args[1], str):
+            native_error = _odbc_native_error.search(args[1].strip())
+            codes.add(native_error and native_error.group(1))
+    return {str(code) for code in codes if code is not None}
+
+
+def _matches(dialect: str, codes: tuple, error: DBAPIError) -> bool:
+    if dialect == 'sqlite':
+        message = str(error.orig)
+        return any(code in message for code in codes)
+    return not _error_codes(error).isdisjoint(codes)
+
+
+def classify_error(dialect: str, error: DBAPIError) -> str:
+    """
+    Classify a database error as transient (worth retrying) or fatal.
+
+    Args:
+        dialect (str): The SQLAlchemy dialect name, e.g. 'sqlite' or 'mssql'.
+        error (DBAPIError): The error raised by SQLAlchemy.
+
+    Returns:
+        str: `TRANSIENT` for lock contention, deadlocks and dropped connections, otherwise `FATAL`.
+    """
+    if error.connection_invalidated:
+        return TRANSIENT
+    return TRANSIENT if _matches(dialect, transient_error_codes.get(dialect, ()), error) else FATAL
+
+
+def aborts_transaction(dialect: str, error: DBAPIError) -> bool:
+    """Whether the error means the server rolled back the whole transaction, not just the statement."""
+    return error.connection_invalidated or _matches(dialect, transaction_aborting_codes.get(dialect, ()), error)
+
+
+@dataclass
+class RetryMetrics:
+    """Retry counters, safe to share between worker threads."""
+
+    retries: int = 0
+    retries_by_dialect: Dict[str, int] = field(default_factory=dict)
+    sleep_seconds: float = 0.0
+    budget_exhausted: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_retry(self, dialect: str, delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.retries_by_dialect[dialect] = self.retries_by_dialect.get(dialect, 0) + 1
+            self.sleep_seconds += delay
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Jittered exponential backoff for transient errors, bounded per statement and per load.
+
+    One policy can be shared by several concurrent loaders; the retry budget and the metrics
+    are then shared too, so a contended database cannot make every worker retry forever.
+
+    Attributes:
+        max_attempts (int): Attempts per statement, including the first one.
+        base_delay (float): Backoff base in seconds. Attempt n sleeps a random time in [0, base_delay * 2**n].
+        max_delay (float): Upper bound for a single sleep, in seconds.
+        retry_budget (int, optional): Total retries allowed across everything using this policy.
+        metrics (RetryMetrics): Retry counters.
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 0.05
+    max_delay: float = 5.0
+    retry_budget: Optional[int] = 100
+    metrics: RetryMetrics = field(default_factory=RetryMetrics)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def should_retry(self, dialect: str, error: DBAPIError, attempt: int) -> bool:
+        """Whether attempt number `attempt` (0-based) that failed with `error` should be retried."""
+        if classify_error(dialect, error) == FATAL or attempt + 1 >= self.max_attempts:
+            return False
+        with self._lock:
+            if self.retry_budget is not None:
+                if self.retry_budget <= 0:
+                    self.metrics.budget_exhausted += 1
+                    return False
+                self.retry_budget -= 1
+        return True
+
+    def sleep(self, dialect: str, attempt: int) -> None:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))  # noqa: S311
+        self.metrics.record_retry(dialect, delay)
+        time.sleep(delay)
+
+
+def run_with_retry(func: Callable, dialect: str, policy: Optional[RetryPolicy]):
+    """
+    Call `func()` and retry it with backoff while it fails with a transient error.
+
+    Only use this for units of work that are safe to repeat as a whole, e.g. a statement that
+    runs in its own transaction.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except DBAPIError as error:
+            if policy is None or not policy.should_retry(dialect, error, attempt):
+                raise
+            policy.sleep(dialect, attempt)
+            attempt += 1
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+MANIFEST_FILE_NAME = 'keepitsql_manifest.json'
+
+
+def table_fingerprint(
+    columns: List[Dict],
+    primary_key: Optional[List[str]] = None,
+    foreign_keys: Optional[List[Dict]] = None,
+    **options,
+) -> str:
+    """
+    Hash the reflected shape of a table.
+
+    Args:
+        columns (List[Dict]): Reflected column dictionaries, as returned by `Inspector.get_columns`.
+        primary_key (List[str], optional): The primary key columns.
+        foreign_keys (List[Dict], optional): Reflected foreign keys.
+        **options: Generation options that change the rendered output (e.g. include_joins).
+
+    Returns:
+        str: A hex SHA-256 digest that changes whenever a column, type, PK or FK changes.
+    """
+    payload = {
+        'columns': [
+            [column['name'], str(column['type']), column.get('nullable'), column.get('autoincrement')]
+            for column in columns
+        ],
+        'primary_key': list(primary_key or []),
+        'foreign_keys': [
+            [
+                fk.get('name'),
+                fk.get('constrained_columns'),
+                fk.get('referred_schema'),
+                fk.get('referred_table'),
+                fk.get('referred_columns'),
+            ]
+            for fk in foreign_keys or []
+        ],
+        'options': options,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class SchemaManifest:
+    """
+    Per-table schema fingerprints persisted as JSON next to generated scripts.
+
+    Attributes:
+        path (str): The manifest file.
+        fingerprints (dict): Fingerprints keyed by qualified table name.
+    """
+
+    path: str
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str) -> SchemaManifest:
+        """Load the manifest at `path`, or start an empty one if it does not exist yet."""
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path) as f:
+            return cls(path, json.load(f).get('tables', {}))
+
+    def is_changed(self, key: str, fingerprint: str) -> bool:
+        return self.fingerprints.get(key) != fingerprint
+
+    def update(self, key: str, fingerprint: str) -> None:
+        self.fingerprints[key] = fingerprint
+
+    def remove(self, key: str) -> None:
+        self.fingerprints.pop(key, None)
+
+    def prune(self, keys) -> List[str]:
+        """Remove every table not in `keys`, e.g. tables dropped since the last export, and return their keys."""
+        keys = set(keys)
+        stale = sorted(key for key in self.fingerprints if key not in keys)
+        for key in stale:
+            self.remove(key)
+        return stale
+
+    def save(self) -> None:
+        """Write the manifest atomically, so an interrupted run never leaves a truncated file."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'tables': self.fingerprints}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
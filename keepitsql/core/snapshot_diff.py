@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass
+from typing import List
+
+PREVIOUS_SUFFIX = '__previous'
+IN_CURRENT = '__in_current'
+IN_PREVIOUS = '__in_previous'
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    """
+    The changes between two snapshots of the same table, as dataframes of the snapshots' own type.
+
+    Each frame can be loaded on its own: `inserts` with `FromDataframe.load_insert`, `updates` (or `upserts`)
+    with `FromDataframe.load_upsert`, and `deletes` with `FromDataframe.load_delete`.
+
+    Attributes:
+        inserts (DataFrame): Rows of the current snapshot whose key is not in the previous one.
+        updates (DataFrame): Rows of the current snapshot whose key is in the previous one with other values.
+        deletes (DataFrame): The key columns of previous rows whose key is not in the current snapshot.
+    """
+
+    inserts: object
+    updates: object
+    deletes: object
+
+    @property
+    def upserts(self):
+        """`inserts` followed by `updates`, for loading both with one upsert."""
+        if 'pandas' in type(self.inserts).__module__:
+            import pandas as pd
+
+            return pd.concat([self.inserts, self.updates], ignore_index=True)
+        return self.inserts.vstack(self.updates)
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self.inserts) == 0 and len(self.updates) == 0 and len(self.deletes) == 0
+
+
+def diff(previous_df, current_df, keys: List[str]) -> SnapshotDiff:
+    """
+    Compare two full snapshots of a table on `keys` with vectorized joins.
+
+    Both frames must be of the same library (Pandas or Polars) and have the same columns, and the keys must be
+    unique in each. Keys and values are compared null-safely: NULL equals NULL, so a row with a NULL key part
+    is matched to its previous version, and a value changing to or from NULL is an update.
+
+    Args:
+        previous_df (DataFrame): The snapshot already loaded into the target.
+        current_df (DataFrame): The new snapshot.
+        keys (List[str]): The columns identifying a row.
+
+    Returns:
+        SnapshotDiff: The inserts, updates and deletes turning `previous_df` into `current_df`.
+
+    Raises:
+        ValueError: If the frames have different columns, or a key is missing or duplicated.
+    """
+    keys = list(keys)
+    if set(previous_df.columns) != set(current_df.columns):
+        raise ValueError("Both snapshots must have the same columns.")
+    missing = [key for key in keys if key not in current_df.columns]
+    if not keys or missing:
+        raise ValueError(f"Key columns not found in the snapshots: {missing or keys}")
+
+    value_columns = [column for column in current_df.columns if column not in keys]
+    if 'pandas' in type(current_df).__module__:
+        return _diff_pandas(previous_df, current_df, keys, value_columns)
+    return _diff_polars(previous_df, current_df, keys, value_columns)
+
+
+def _diff_polars(previous_df, current_df, keys: List[str], value_columns: List[str]) -> SnapshotDiff:
+    import polars as pl
+
+    # Polars 1.24 renamed `join_nulls` to `nulls_equal`.
+    nulls_equal = 'nulls_equal' if 'nulls_equal' in inspect.signature(pl.DataFrame.join).parameters else 'join_nulls'
+    try:
+        matched = current_df.with_columns(pl.lit(True).alias(IN_CURRENT)).join(
+            previous_df.select(keys + value_columns).with_columns(pl.lit(True).alias(IN_PREVIOUS)),
+            on=keys,
+            how='full',
+            coalesce=True,
+            suffix=PREVIOUS_SUFFIX,
+            validate='1:1',
+            **{nulls_equal: True},
+        )
+    except pl.exceptions.ComputeError as error:
+        raise ValueError("The snapshot keys must be unique.") from error
+
+    changed = pl.any_horizontal(
+        [pl.col(column).ne_missing(pl.col(f'{column}{PREVIOUS_SUFFIX}')) for column in value_columns] or [pl.lit(False)]
+    )
+    inserts = matched.filter(pl.col(IN_PREVIOUS).is_null()).select(current_df.columns)
+    updates = matched.filter(pl.col(IN_CURRENT) & pl.col(IN_PREVIOUS) & changed).select(current_df.columns)
+    deletes = matched.filter(pl.col(IN_CURRENT).is_null()).select(keys)
+
+    return SnapshotDiff(inserts=inserts, updates=updates, deletes=deletes)
+
+
+def _diff_pandas(previous_df, current_df, keys: List[str], value_columns: List[str]) -> SnapshotDiff:
+    import pandas as pd
+
+    try:
+        matched = current_df.merge(
+            previous_df[keys + value_columns],
+            on=keys,
+            how='left',
+            suffixes=('', PREVIOUS_SUFFIX),
+            indicator=True,
+            validate='one_to_one',
+        )
+    except pd.errors.MergeError as error:
+        raise ValueError("The snapshot keys must be unique.") from error
+
+    # A left merge on unique keys keeps the rows of `current_df` in order, so its masks apply to it directly.
+    is_new = (matched['_merge'] == 'left_only').to_numpy()
+    is_changed = pd.Series(False, index=matched.index)
+    for column in value_columns:
+        current, previous = matched[column], matched[f'{column}{PREVIOUS_SUFFIX}']
+        # Nullable dtypes (Int64, boolean, ...) compare to <NA> where either side is missing: a change to or from NULL.
+        differs = (current != previous).fillna(True).astype(bool)
+        is_changed |= differs & ~(current.isna() & previous.isna())
+    is_changed = is_changed.to_numpy()
+
+    previous_keys = previous_df[keys].merge(current_df[keys], on=keys, how='left', indicator=True)
+    is_deleted = (previous_keys['_merge'] == 'left_only').to_numpy()
+
+    return SnapshotDiff(
+        inserts=current_df.loc[is_new].reset_index(drop=True),
+        updates=current_df.loc[~is_new & is_changed].reset_index(drop=True),
+        deletes=previous_df.loc[is_deleted, keys].reset_index(drop=True),
+    )
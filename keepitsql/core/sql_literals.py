@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import math
+from typing import (
+    Iterator,
+    List,
+    Optional,
+)
+
+from keepitsql.sql_models.insert import literals as lit
+
+
+def _for_dialect(templates: dict, dialect: Optional[str]):
+    return templates.get(dialect, templates['default'])
+
+
+def _timestamp_text(value: datetime.datetime) -> str:
+    """
+    ISO text of a datetime with only the fractional digits it needs: none, milliseconds or microseconds.
+
+    Whole seconds and milliseconds then also fit SQL Server `DATETIME` columns, which take at most three digits.
+    """
+    if not value.microsecond:
+        timespec = 'seconds'
+    elif not value.microsecond % 1000:
+        timespec = 'milliseconds'
+    else:
+        timespec = 'microseconds'
+    return value.isoformat(sep=' ', timespec=timespec)
+
+
+def _escape_string(value: str, dialect: Optional[str] = None) -> str:
+    """Escape text for use inside a string literal of `dialect`."""
+    for old, new in _for_dialect(lit.string_escapes, dialect):
+        value = value.replace(old, new)
+    return value
+
+
+def render_literal(value, dialect: Optional[str] = None) -> str:
+    """
+    Render one Python value as a SQL literal for `dialect`.
+
+    Args:
+        value: The value. None, NaN and NaT are rendered as NULL.
+        dialect (str, optional): The SQLAlchemy dialect name. Decides how booleans, dates and bytes are spelled.
+
+    Returns:
+        str: The SQL literal.
+    """
+    if value is None:
+        return lit.null_literal
+    if isinstance(value, bool):
+        true_literal, false_literal = _for_dialect(lit.boolean_literals, dialect)
+        return true_literal if value else false_literal
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return lit.null_literal if math.isnan(value) or math.isinf(value) else repr(value)
+    if isinstance(value, decimal.Decimal):
+        return lit.null_literal if not value.is_finite() else str(value)
+    if isinstance(value, datetime.datetime):
+        if value != value:  # pandas NaT
+            return lit.null_literal
+        return _for_dialect(lit.timestamp_literals, dialect).format(value=_timestamp_text(value))
+    if isinstance(value, datetime.date):
+        return _for_dialect(lit.date_literals, dialect).format(value=value.isoformat())
+    if isinstance(value, (datetime.time, datetime.timedelta)):
+        return lit.string_literal.format(value=value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return _for_dialect(lit.binary_literals, dialect).format(value=bytes(value).hex().upper())
+    return lit.string_literal.format(value=_escape_string(str(value), dialect))
+
+
+def _template_parts(template: str) -> tuple:
+    prefix, suffix = template.split('{value}')
+    return prefix, suffix
+
+
+def _polars_literal_expr(name: str, dtype, dialect: Optional[str]):
+    import polars as pl
+
+    column = pl.col(name)
+    if dtype == pl.Boolean:
+        true_literal, false_literal = _for_dialect(lit.boolean_literals, dialect)
+        rendered = pl.when(column).then(pl.lit(true_literal)).otherwise(pl.lit(false_literal))
+        return pl.when(column.is_null()).then(pl.lit(lit.null_literal)).otherwise(rendered)
+    elif dtype.is_integer() or dtype.is_decimal():
+        rendered = column.cast(pl.String)
+    elif dtype.is_float():
+        rendered = pl.when(column.is_finite()).then(column).cast(pl.String)
+    elif dtype == pl.Date:
+        prefix, suffix = _template_parts(_for_dialect(lit.date_literals, dialect))
+        rendered = pl.concat_str(pl.lit(prefix), column.dt.strftime('%Y-%m-%d'), pl.lit(suffix))
+    elif dtype == pl.Datetime:
+        prefix, suffix = _template_parts(_for_dialect(lit.timestamp_literals, dialect))
+        time_format = '%Y-%m-%d %H:%M:%S%.f' + ('%:z' if dtype.time_zone else '')
+        rendered = pl.concat_str(pl.lit(prefix), column.dt.strftime(time_format), pl.lit(suffix))
+    elif dtype == pl.Binary:
+        prefix, suffix = _template_parts(_for_dialect(lit.binary_literals, dialect))
+        rendered = pl.concat_str(pl.lit(prefix), column.bin.encode('hex').str.to_uppercase(), pl.lit(suffix))
+    elif dtype in (pl.String, pl.Categorical, pl.Enum, pl.Time, pl.Duration):
+        prefix, suffix = _template_parts(lit.string_literal)
+        escaped = column.cast(pl.String)
+        for old, new in _for_dialect(lit.string_escapes, dialect):
+            escaped = escaped.str.replace_all(old, new, literal=True)
+        rendered = pl.concat_str(pl.lit(prefix), escaped, pl.lit(suffix))
+    else:
+        rendered = column.map_elements(lambda value: render_literal(value, dialect), return_dtype=pl.String)
+    return rendered.fill_null(lit.null_literal)
+
+
+def _pandas_literal_column(series, dialect: Optional[str]):
+    import pandas as pd
+
+    missing = series.isna()
+    if pd.api.types.is_bool_dtype(series):
+        true_literal, false_literal = _for_dialect(lit.boolean_literals, dialect)
+        rendered = series.map({True: true_literal, False: false_literal})
+    elif pd.api.types.is_integer_dtype(series):
+        rendered = series.astype(str)
+    elif pd.api.types.is_float_dtype(series):
+        missing = missing | series.isin([math.inf, -math.inf])
+        rendered = series.astype(str)
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        prefix, suffix = _template_parts(_for_dialect(lit.timestamp_literals, dialect))
+        # The same digits as `_timestamp_text`: no fraction for whole seconds, three for whole milliseconds.
+        microseconds = series.dt.microsecond
+        fraction = series.dt.strftime('.%f')
+        fraction = fraction.where(microseconds % 1000 != 0, fraction.str[:4]).where(microseconds != 0, '')
+        rendered = series.dt.strftime('%Y-%m-%d %H:%M:%S') + fraction
+        if getattr(series.dt, 'tz', None) is not None:
+            rendered = rendered + series.dt.strftime('%z').str.replace(r'(\d\d)$', r':\1', regex=True)
+        rendered = prefix + rendered + suffix
+    elif pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+        prefix, suffix = _template_parts(lit.string_literal)
+        escaped = series.astype(object).where(~missing, '')
+        for old, new in _for_dialect(lit.string_escapes, dialect):
+            escaped = escaped.str.replace(old, new, regex=False)
+        rendered = prefix + escaped + suffix
+    elif pd.api.types.infer_dtype(series, skipna=True) == 'decimal':
+        rendered = series.astype(str)
+    else:
+        # Mixed or exotic object columns (dates, bytes, ...) fall back to rendering cell by cell.
+        return series.map(lambda value: render_literal(None if pd.isna(value) else value, dialect), na_action=None)
+    return rendered.astype(object).where(~missing, lit.null_literal)
+
+
+def render_literal_columns(dataframe, dialect: Optional[str] = None) -> List[str]:
+    """
+    Render every row of a Pandas or Polars dataframe as comma separated SQL literals, column by column.
+
+    Each column is rendered with vectorized string operations (Polars expressions, or Pandas `.str`
+    methods) according to its dtype, and the columns are then concatenated, instead of converting
+    every cell in Python. Object columns Pandas cannot type fall back to `render_literal`.
+
+    Args:
+        dataframe (DataFrame): The rows to render.
+        dialect (str, optional): The SQLAlchemy dialect name. Decides how booleans, dates, timestamps
+                                 and bytes are spelled.
+
+    Returns:
+        List[str]: One `literal, literal, ...` string per row.
+    """
+    if 'pandas' in type(dataframe).__module__:
+        columns = [_pandas_literal_column(dataframe[name], dialect) for name in dataframe.columns]
+        if not columns:
+            return [''] * len(dataframe)
+        rows = columns[0]
+        for column in columns[1:]:
+            rows = rows + ', ' + column
+        return rows.tolist()
+
+    import polars as pl
+
+    expressions = [_polars_literal_expr(name, dtype, dialect) for name, dtype in dataframe.schema.items()]
+    return dataframe.select(pl.concat_str(expressions, separator=', ').alias('row_values')).to_series().to_list()
+
+
+def render_value_rows(dataframe, dialect: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the rows of a Pandas or Polars dataframe as comma separated SQL literals.
+
+    Args:
+        dataframe (DataFrame): The rows to render.
+        dialect (str, optional): The SQLAlchemy dialect name.
+
+    Yields:
+        str: One `literal, literal, ...` string per row.
+    """
+    yield from render_literal_columns(dataframe, dialect)
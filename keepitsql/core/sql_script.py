@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import gzip
+import os
+from typing import (
+    List,
+    Optional,
+)
+
+
+class SqlScriptWriter:
+    def __init__(
+        self,
+        output_path: str,
+        max_file_bytes: Optional[int] = None,
+        compress: bool = False,
+    ) -> None:
+        """
+        Writes SQL statements to a script file as they are produced, starting a new file when one gets too big.
+
+        Statements are never split across files, so every file can be run on its own. With `max_file_bytes`
+        the files are numbered `<name>_0001.sql`, `<name>_0002.sql`, ...; with `compress` each file is a
+        gzip stream (`.sql.gz`) and the size limit applies to the uncompressed SQL.
+
+        Args:
+            output_path (str): The script path, e.g. `dump.sql`.
+            max_file_bytes (int, optional): Rotate to a new file before a statement would take the current one
+                                            past this size.
+            compress (bool): Write gzip-compressed files.
+        """
+        self.output_path = output_path
+        self.max_file_bytes = max_file_bytes
+        self.compress = compress
+        self.paths: List[str] = []
+        self._file = None
+        self._file_bytes = 0
+
+    def _next_path(self) -> str:
+        root, extension = os.path.splitext(self.output_path)
+        if extension == '.gz':
+            root, extension = os.path.splitext(root)
+        extension = extension or '.sql'
+        if self.max_file_bytes is not None:
+            root = f'{root}_{len(self.paths) + 1:04d}'
+        return f'{root}{extension}.gz' if self.compress else f'{root}{extension}'
+
+    def _open_next(self) -> None:
+        self.close()
+        path = self._next_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, 'wt', encoding='utf-8') if self.compress else open(path, 'w', encoding='utf-8')
+        self._file_bytes = 0
+        self.paths.append(path)
+
+    def write(self, statement: str) -> None:
+        """Append one complete statement, rotating files first if it would not fit."""
+        size = len(statement.encode('utf-8'))
+        if self._file is None or (
+            self.max_file_bytes is not None and self._file_bytes and self._file_bytes + size > self.max_file_bytes
+        ):
+            self._open_next()
+        self._file.write(statement)
+        self._file_bytes += size
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> SqlScriptWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Iterator,
+    Optional,
+)
+
+from sqlalchemy import Connection
+from sqlalchemy.exc import DBAPIError
+
+from keepitsql.core.dialect_capabilities import get_dialect_capabilities
+from keepitsql.core.executor import (
+    LoadResult,
+    iter_param_chunks,
+)
+from keepitsql.core.retry import (
+    RetryPolicy,
+    run_with_retry,
+)
+
+
+@dataclass(frozen=True)
+class SqliteBulkProfile:
+    """
+    PRAGMA settings applied for the duration of a SQLite bulk load.
+
+    Attributes:
+        journal_mode (str): Journal mode; WAL lets readers continue while the load writes.
+        synchronous (str): fsync level. NORMAL is durable against application crashes in WAL mode.
+        cache_size (int): Page cache size; negative values are KiB.
+        temp_store (str): Where temporary tables and indices live.
+    """
+
+    journal_mode: str = 'WAL'
+    synchronous: str = 'NORMAL'
+    cache_size: int = -262144
+    temp_store: str = 'MEMORY'
+
+    def pragmas(self) -> dict:
+        return {
+            'journal_mode': self.journal_mode,
+            'synchronous': self.synchronous,
+            'cache_size': self.cache_size,
+            'temp_store': self.temp_store,
+        }
+
+
+@contextmanager
+def sqlite_bulk_profile(connection: Connection, profile: Optional[SqliteBulkProfile] = None) -> Iterator:
+    """
+    Apply bulk-load PRAGMAs to a SQLite connection and restore the previous values afterwards.
+
+    Args:
+        connection (Connection): A SQLAlchemy connection to a SQLite database, with no transaction in progress.
+        profile (SqliteBulkProfile, optional): The settings to apply. Defaults to `SqliteBulkProfile()`.
+
+    Yields:
+        sqlite3.Connection: The raw driver connection, with the profile applied.
+
+    Raises:
+        ValueError: If the connection is not a SQLite connection or has a transaction in progress.
+    """
+    if connection.dialect.name != 'sqlite':
+        raise ValueError("The SQLite bulk profile requires a SQLite connection.")
+    if connection.in_transaction():
+        raise ValueError("Commit or roll back the connection before applying the SQLite bulk profile.")
+
+    profile = profile or SqliteBulkProfile()
+    dbapi_connection = connection.connection.dbapi_connection
+    previous = {pragma: dbapi_connection.execute(f'PRAGMA {pragma}').fetchone()[0] for pragma in profile.pragmas()}
+
+    for pragma, value in profile.pragmas().items():
+        dbapi_connection.execute(f'PRAGMA {pragma} = {value}')
+    try:
+        yield dbapi_connection
+    finally:
+        for pragma, value in previous.items():
+            dbapi_connection.execute(f'PRAGMA {pragma} = {value}')
+
+
+def execute_sqlite_bulk(
+    connection: Connection,
+    statement: str,
+    dataframe,
+    chunk_size: Optional[int] = None,
+    profile: Optional[SqliteBulkProfile] = None,
+    retry: Optional[RetryPolicy] = None,
+) -> LoadResult:
+    """
+    Execute a parameterized statement for every dataframe row through the raw `sqlite3` cursor.
+
+    The whole load runs in one `BEGIN IMMEDIATE` transaction under `sqlite_bulk_profile`, and each
+    chunk is a single `cursor.executemany`, skipping SQLAlchemy's per-execution overhead. The
+    statement's `:column` placeholders are bound natively by sqlite3's named parameter style.
+
+    Args:
+        connection (Connection): A SQLAlchemy connection to a SQLite database, with no transaction in progress.
+        statement (str): The statement to execute, e.g. from `GenerateInsert.insert`.
+        dataframe (DataFrame): The rows to load.
+        chunk_size (int, optional): Rows per `executemany` call. Defaults to `DialectCapabilities.chunk_size`.
+        profile (SqliteBulkProfile, optional): PRAGMA settings. Defaults to `SqliteBulkProfile()`.
+        retry (RetryPolicy, optional): Backoff policy if the write lock cannot be taken. The transaction is
+                                       retried as a whole, since nothing is committed until it finishes.
+
+    Returns:
+        LoadResult: Row, chunk and commit counts.
+    """
+
+    chunk_size = chunk_size or get_dialect_capabilities(connection).chunk_size(len(dataframe.columns))
+
+    def load() -> LoadResult:
+        result = LoadResult()
+        cursor = dbapi_connection.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            for params in iter_param_chunks(dataframe, chunk_size):
+                cursor.executemany(statement, params)
+                result.rows_loaded += len(params)
+                result.chunks += 1
+            cursor.execute('COMMIT')
+            result.commits += 1
+        except BaseException:
+            cursor.execute('ROLLBACK')
+            raise
+        finally:
+            cursor.close()
+        return result
+
+    with sqlite_bulk_profile(connection, profile) as dbapi_connection:
+        isolation_level = dbapi_connection.isolation_level
+        # Take over transaction control from the sqlite3 module so BEGIN IMMEDIATE can be issued.
+        dbapi_connection.isolation_level = None
+        try:
+            return run_with_retry(
+                lambda: _wrap_driver_errors(load, statement),
+                connection.dialect.name,
+                retry,
+            )
+        finally:
+            dbapi_connection.isolation_level = isolation_level
+
+
+def _wrap_driver_errors(func, statement: str):
+    """Re-raise raw sqlite3 errors as SQLAlchemy DBAPIErrors, like statements executed through SQLAlchemy."""
+    try:
+        return func()
+    except sqlite3.Error as error:
+        raise DBAPIError.instance(statement, None, error, sqlite3.Error) from error
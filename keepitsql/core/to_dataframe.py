@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    Engine,
+    inspect,
+    text,
+)
+
+from keepitsql.core.engine_registry import resolve_engine
+from keepitsql.core.generate_select_queries import build_select_statement
+from keepitsql.sql_models.select import keyset_pagination as ksp
+
+
+def rows_to_frame(rows: list, columns: List[str], output: str = 'polars'):
+    """
+    Build a Polars or Pandas dataframe from a list of result rows.
+
+    Args:
+        rows (list): Row tuples, in the order of `columns`.
+        columns (List[str]): The column names.
+        output (str): 'polars' or 'pandas'.
+
+    Returns:
+        DataFrame: The dataframe.
+
+    Raises:
+        ValueError: If `output` is not 'polars' or 'pandas'.
+    """
+    if output == 'polars':
+        import polars as pl
+
+        return pl.DataFrame([tuple(row) for row in rows], schema=columns, orient='row', infer_schema_length=None)
+    elif output == 'pandas':
+        import pandas as pd
+
+        return pd.DataFrame.from_records(rows, columns=columns)
+    raise ValueError("output must be 'polars' or 'pandas'.")
+
+
+def concat_frames(frames: list, columns: List[str], output: str = 'polars'):
+    """Concatenate chunk dataframes, returning an empty frame with the right columns if there are none."""
+    if not frames:
+        return rows_to_frame([], columns, output)
+    if output == 'polars':
+        import polars as pl
+
+        return pl.concat(frames, how='vertical_relaxed')
+
+    import pandas as pd
+
+    return pd.concat(frames, ignore_index=True)
+
+
+class ToDataframe:
+    def __init__(
+        self,
+        db_resource: Union[str, Engine],
+        table_name: str,
+        schema_name: Optional[str] = None,
+        key_columns: Optional[List[str]] = None,
+        column_select: Optional[List[str]] = None,
+        output: str = 'polars',
+    ) -> None:
+        """
+        Reads a table into a Polars or Pandas dataframe using keyset pagination.
+
+        Pages are ordered by the key columns and each page starts after the last key of the previous
+        one, so every page is an index range scan no matter how deep into the table it is (unlike
+        OFFSET paging). Each page is read through a server-side cursor (`stream_results` /
+        `yield_per`) so only one chunk is held in driver memory at a time.
+
+        Args:
+            db_resource (str | Engine): A database URL or an existing SQLAlchemy Engine.
+            table_name (str): The table to read.
+            schema_name (str, optional): The schema of the table.
+            key_columns (list, optional): The keyset columns. Defaults to the table's primary key.
+            column_select (list, optional): The columns to read. Defaults to every column.
+            output (str): 'polars' or 'pandas'.
+
+        Raises:
+            ValueError: If the table has no primary key and `key_columns` is not given.
+        """
+        self.engine = resolve_engine(db_resource)
+        self.table_name = table_name
+        self.schema_name = schema_name
+        self.output = output
+
+        inspector = inspect(self.engine)
+        self.key_columns = (
+            key_columns or inspector.get_pk_constraint(table_name, schema=schema_name)['constrained_columns']
+        )
+        if not self.key_columns:
+            raise ValueError(f"Table {table_name} has no primary key; pass key_columns for keyset pagination.")
+
+        columns = inspector.get_columns(table_name, schema=schema_name)
+        if column_select is not None:
+            # The key columns are always read, since they seed the next page.
+            selected = set(column_select) | set(self.key_columns)
+            columns = [column for column in columns if column['name'] in selected]
+        self.columns = [column['name'] for column in columns]
+
+        self.select_statement = build_select_statement(
+            table_name,
+            columns,
+            schema=schema_name,
+            coalesce_numeric=False,
+            terminate=False,
+        )
+        self.limit_clause = ksp.limit_clauses.get(self.engine.dialect.name, ksp.limit_clauses['default'])
+
+    @property
+    def qualified_table_name(self) -> str:
+        return f'{self.schema_name}.{self.table_name}' if self.schema_name else self.table_name
+
+    def keyset_predicate(self) -> str:
+        """Render `(k1, k2, ...) > (:last_0, :last_1, ...)` as an expanded, portable OR chain."""
+        terms = []
+        for position, column in enumerate(self.key_columns):
+            equal_terms = [
+                ksp.keyset_column_equal.format(column=previous, parameter=f'last_{index}')
+                for index, previous in enumerate(self.key_columns[:position])
+            ]
+            after_term = ksp.keyset_column_after.format(column=column, parameter=f'last_{position}')
+            terms.append('(' + ' AND '.join(equal_terms + [after_term]) + ')')
+        return '(' + ' OR '.join(terms) + ')'
+
+    def page_query(
+        self,
+        page_size: int,
+        after_key: bool,
+        lower_bound: bool = False,
+        upper_bound: Optional[str] = None,
+    ) -> str:
+        """Render one keyset page, optionally restricted to a key range (see `partition_bounds`)."""
+        limit_clause = self.limit_clause.format(page_size=int(page_size))
+        predicates = []
+        if lower_bound:
+            predicates.append(ksp.range_lower_bound.format(column=self.key_columns[0], parameter='lower_bound'))
+        if upper_bound == 'exclusive':
+            predicates.append(ksp.range_upper_bound.format(column=self.key_columns[0], parameter='upper_bound'))
+        elif upper_bound == 'inclusive':
+            predicates.append(
+                ksp.range_upper_bound_inclusive.format(column=self.key_columns[0], parameter='upper_bound')
+            )
+        if after_key:
+            predicates.append(self.keyset_predicate())
+
+        order_by = ', '.join(self.key_columns)
+        if not predicates:
+            return ksp.keyset_page_unfiltered.format(
+                select_statement=self.select_statement, order_by=order_by, limit_clause=limit_clause
+            )
+        return ksp.keyset_page.format(
+            select_statement=self.select_statement,
+            where_clause=' AND '.join(predicates),
+            order_by=order_by,
+            limit_clause=limit_clause,
+        )
+
+    def iter_chunks(
+        self,
+        chunk_size: int = 50_000,
+        page_size: int = 1_000_000,
+        lower_bound=None,
+        upper_bound=None,
+        upper_inclusive: bool = True,
+    ) -> Iterator:
+        """
+        Yield the table as dataframes of at most `chunk_size` rows, in key order.
+
+        Args:
+            chunk_size (int): Rows per yielded dataframe and per server-side cursor fetch.
+            page_size (int): Rows per keyset query. The last key of a page seeds the next one.
+            lower_bound (optional): Only read rows whose first key column is >= this value.
+            upper_bound (optional): Only read rows whose first key column is <= (or <) this value.
+            upper_inclusive (bool): Whether `upper_bound` is inclusive.
+
+        Yields:
+            DataFrame: The next chunk of rows.
+        """
+        key_positions = [self.columns.index(column) for column in self.key_columns]
+        upper_mode = None if upper_bound is None else ('inclusive' if upper_inclusive else 'exclusive')
+        range_params: Dict = {}
+        if lower_bound is not None:
+            range_params['lower_bound'] = lower_bound
+        if upper_bound is not None:
+            range_params['upper_bound'] = upper_bound
+
+        last_key = None
+        with self.engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True, yield_per=chunk_size)
+            while True:
+                query = self.page_query(page_size, last_key is not None, lower_bound is not None, upper_mode)
+                params = dict(range_params)
+                if last_key is not None:
+                    params.update({f'last_{index}': value for index, value in enumerate(last_key)})
+
+                result = connection.execute(text(query), params)
+                page_rows = 0
+                for partition in result.partitions(chunk_size):
+                    page_rows += len(partition)
+                    last_key = tuple(partition[-1][position] for position in key_positions)
+                    yield rows_to_frame(partition, self.columns, self.output)
+
+                if page_rows < page_size:
+                    break
+
+    def partition_bounds(self, partitions: int) -> List[tuple]:
+        """
+        Split the range of the first key column into `partitions` contiguous ranges.
+
+        Returns:
+            List[tuple]: `(lower_bound, upper_bound, upper_inclusive)` for each partition.
+
+        Raises:
+            ValueError: If the first key column is not an integer column.
+        """
+        query = ksp.key_range.format(column=self.key_columns[0], table_name=self.qualified_table_name)
+        with self.engine.connect() as connection:
+            minimum, maximum = connection.execute(text(query)).one()
+
+        if minimum is None:
+            return []
+        if not isinstance(minimum, int) or not isinstance(maximum, int):
+            raise ValueError("Parallel reads require an integer leading key column.")
+
+        step = max((maximum - minimum + 1) // partitions, 1)
+        bounds = []
+        lower = minimum
+        while lower <= maximum and len(bounds) < partitions - 1:
+            upper = min(lower + step, maximum + 1)
+            bounds.append((lower, upper, False))
+            lower = upper
+        if lower <= maximum:
+            bounds.append((lower, maximum, True))
+        return bounds
+
+    def read(
+        self,
+        chunk_size: int = 50_000,
+        page_size: int = 1_000_000,
+        partitions: int = 1,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Read the whole table into one dataframe.
+
+        With `partitions > 1` the range of the (integer) leading key column is split into that many
+        ranges, which are read in parallel on separate pooled connections and concatenated in key order.
+
+        Args:
+            chunk_size (int): Rows per server-side cursor fetch.
+            page_size (int): Rows per keyset query.
+            partitions (int): Number of key ranges to read in parallel.
+            max_workers (int, optional): Worker threads. Defaults to `partitions`.
+
+        Returns:
+            DataFrame: The table contents.
+        """
+        if partitions <= 1:
+            return concat_frames(list(self.iter_chunks(chunk_size, page_size)), self.columns, self.output)
+
+        def read_partition(bounds: tuple) -> list:
+            lower, upper, inclusive = bounds
+            return list(self.iter_chunks(chunk_size, page_size, lower, upper, inclusive))
+
+        with ThreadPoolExecutor(max_workers=max_workers or partitions) as executor:
+            partition_frames = list(executor.map(read_partition, self.partition_bounds(partitions)))
+
+        frames = [frame for chunk_frames in partition_frames for frame in chunk_frames]
+        return concat_frames(frames, self.columns, self.output)
@@ -0,0 +1,556 @@
+from __future__ import annotations
+
+from dataclasses import (
+    dataclass,
+    field,
+)
+from decimal import (
+    ROUND_HALF_EVEN,
+    Context,
+    Decimal,
+    InvalidOperation,
+)
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+)
+from sqlalchemy import types as sqltypes
+
+from keepitsql.gen_ddl import CopyDDl
+
+BOOLEAN = 'boolean'
+INTEGER = 'integer'
+FLOAT = 'float'
+DECIMAL = 'decimal'
+STRING = 'string'
+DATE = 'date'
+DATETIME = 'datetime'
+TIME = 'time'
+
+UNPARSEABLE = 'unparseable'
+OUT_OF_RANGE = 'out_of_range'
+ROUNDED = 'rounded'
+TRUNCATED = 'truncated'
+
+EXAMPLE_COUNT = 3
+
+_boolean_strings = {'true': True, 't': True, 'yes': True, 'y': True, '1': True}
+_boolean_strings.update({'false': False, 'f': False, 'no': False, 'n': False, '0': False})
+# Numbers written without an exponent, which parse to a Decimal exactly.
+_plain_number = r'^[+-]?(\d+\.?\d*|\.\d+)$'
+
+# Integer widths that differ from the generic SMALLINT / INTEGER / BIGINT classes, by type name.
+_integer_bits = {'TINYINT': 8, 'MEDIUMINT': 24}
+# Money types are fixed-point decimals with their own names.
+_money_types = {'MONEY': (19, 4), 'SMALLMONEY': (10, 4)}
+
+
+@dataclass(frozen=True)
+class TargetType:
+    """
+    What a reflected column type means for coercion.
+
+    Attributes:
+        kind (str): `BOOLEAN`, `INTEGER`, `FLOAT`, `DECIMAL`, `STRING`, `DATE`, `DATETIME` or `TIME`.
+        sql_type (str): The column type as reflected, for reporting.
+        min_value (int, optional): Smallest value of an integer column.
+        max_value (int, optional): Largest value of an integer column.
+        precision (int, optional): Total digits of a decimal column.
+        scale (int, optional): Fractional digits of a decimal column.
+        length (int, optional): Maximum characters of a string column.
+        timezone (bool): Whether a datetime column stores a UTC offset.
+        fixed_point (bool): Whether decimals are bound as fixed-point values. SQLite's driver only binds floats.
+    """
+
+    kind: str
+    sql_type: str
+    min_value: Optional[int] = None
+    max_value: Optional[int] = None
+    precision: Optional[int] = None
+    scale: Optional[int] = None
+    length: Optional[int] = None
+    timezone: bool = False
+    fixed_point: bool = True
+
+
+@dataclass
+class CastIssue:
+    """
+    Values of one column that could not be cast without loss.
+
+    Attributes:
+        column (str): The dataframe column.
+        target_type (str): The target column type.
+        issue (str): `UNPARSEABLE` or `OUT_OF_RANGE` (the value became NULL), `ROUNDED` (numeric precision was
+                     lost) or `TRUNCATED` (a string was shortened, or a time of day dropped).
+        rows (int): How many rows are affected.
+        examples (list): Some of the original values.
+    """
+
+    column: str
+    target_type: str
+    issue: str
+    rows: int
+    examples: list = field(default_factory=list)
+
+
+@dataclass
+class CoercionReport:
+    """The target type of every coerced column and the lossy casts found while coercing."""
+
+    target_types: Dict[str, str] = field(default_factory=dict)
+    issues: List[CastIssue] = field(default_factory=list)
+
+    @property
+    def lossy(self) -> bool:
+        return bool(self.issues)
+
+    def summary(self) -> str:
+        """One line per lossy cast, e.g. `amount -> NUMERIC(10, 2): 3 rounded (1.005, ...)`."""
+        lines = []
+        for issue in self.issues:
+            examples = ', '.join(map(repr, issue.examples))
+            lines.append(f'{issue.column} -> {issue.target_type}: {issue.rows} {issue.issue} ({examples})')
+        return '\n'.join(lines)
+
+
+def integer_bounds(bits: int, unsigned: bool = False) -> Tuple[int, int]:
+    return (0, 2**bits - 1) if unsigned else (-(2 ** (bits - 1)), 2 ** (bits - 1) - 1)
+
+
+def target_type(column_type, dialect: Optional[str] = None) -> Optional[TargetType]:
+    """
+    Classify a reflected SQLAlchemy column type.
+
+    Args:
+        column_type (TypeEngine): The type from `Inspector.get_columns`.
+        dialect (str, optional): The dialect the type was reflected from, for types whose range differs
+                                 between databases (e.g. TINYINT is unsigned on MSSQL).
+
+    Returns:
+        TargetType: The coercion target, or None for types that are bound as they are (binary, JSON, UUID, ...).
+    """
+    type_name = type(column_type).__name__.upper()
+    sql_type = str(column_type)
+
+    if isinstance(column_type, sqltypes.Boolean):
+        return TargetType(BOOLEAN, sql_type)
+    if isinstance(column_type, sqltypes.Float):
+        return TargetType(FLOAT, sql_type)
+    if type_name in _money_types:
+        precision, scale = _money_types[type_name]
+        return TargetType(DECIMAL, sql_type, precision=precision, scale=scale)
+    if isinstance(column_type, sqltypes.Numeric):
+        return TargetType(
+            DECIMAL,
+            sql_type,
+            precision=column_type.precision,
+            scale=column_type.scale or 0,
+            fixed_point=dialect != 'sqlite',
+        )
+    if isinstance(column_type, sqltypes.Integer):
+        if isinstance(column_type, sqltypes.BigInteger):
+            bits = 64
+        elif isinstance(column_type, sqltypes.SmallInteger):
+            bits = 16
+        else:
+            bits = _integer_bits.get(type_name, 32)
+        unsigned = getattr(column_type, 'unsigned', False) or (type_name == 'TINYINT' and dialect == 'mssql')
+        min_value, max_value = integer_bounds(bits, unsigned)
+        return TargetType(INTEGER, sql_type, min_value=min_value, max_value=max_value)
+    if isinstance(column_type, sqltypes.DateTime):
+        timezone = bool(column_type.timezone) or type_name == 'DATETIMEOFFSET'
+        return TargetType(DATETIME, sql_type, timezone=timezone)
+    if isinstance(column_type, sqltypes.Date):
+        return TargetType(DATE, sql_type)
+    if isinstance(column_type, sqltypes.Time):
+        return TargetType(TIME, sql_type)
+    if isinstance(column_type, sqltypes.String) and not isinstance(column_type, sqltypes.Enum):
+        return TargetType(STRING, sql_type, length=column_type.length)
+    return None
+
+
+def integer_width(target: TargetType) -> int:
+    """The narrowest of 8, 16, 32 and 64 bits that holds every value of an integer target."""
+    unsigned = target.min_value >= 0
+    return next(bits for bits in (8, 16, 32, 64) if integer_bounds(bits, unsigned)[1] >= target.max_value)
+
+
+def _coerce_polars_numeric_text(series, text, target: TargetType, time_zone: str) -> Tuple[object, dict]:
+    """
+    Coerce text to an integer or decimal target without going through floats.
+
+    Plain decimal literals are cast straight to a Decimal of the target scale, so digits a float cannot hold
+    (above 2**53) are kept. Only exponent notation and special values (`1e3`, `inf`) are parsed as floats.
+    """
+    import polars as pl
+
+    scale = target.scale or 0
+    plain = text.str.contains(_plain_number).fill_null(False)
+    exact = pl.select(pl.when(plain).then(text)).to_series().cast(pl.Decimal(38, scale), strict=False)
+    inexact = pl.select(pl.when(~plain).then(text)).to_series().cast(pl.Float64, strict=False)
+    exact_coerced, exact_issues = _coerce_polars_series(exact.alias(series.name), target, time_zone)
+    inexact_coerced, inexact_issues = _coerce_polars_series(inexact.alias(series.name), target, time_zone)
+
+    none = pl.repeat(False, len(series), eager=True)
+    issues = {
+        issue: ((plain & exact_issues.get(issue, none)) | (~plain & inexact_issues.get(issue, none))).fill_null(False)
+        for issue in (OUT_OF_RANGE, ROUNDED)
+    }
+    # Literals with more digits than a Decimal(38) holds are out of range of any target.
+    issues[OUT_OF_RANGE] = issues[OUT_OF_RANGE] | (plain & exact.is_null())
+    fraction_digits = text.str.extract(r'\.(\d*[1-9])0*$', 1).str.len_chars().fill_null(0)
+    issues[ROUNDED] = issues[ROUNDED] | (plain & ~issues[OUT_OF_RANGE] & (fraction_digits > scale))
+    issues[UNPARSEABLE] = series.is_not_null() & ~plain & inexact.is_null()
+
+    coerced = pl.select(pl.when(plain).then(exact_coerced).otherwise(inexact_coerced)).to_series()
+    return coerced.alias(series.name), issues
+
+
+def _coerce_polars_series(series, target: TargetType, time_zone: str) -> Tuple[object, dict]:
+    import polars as pl
+
+    dtype = series.dtype
+    present = series.is_not_null()
+    is_text = dtype in (pl.String, pl.Categorical, pl.Enum)
+    text = series.cast(pl.String).str.strip_chars() if is_text else None
+    issues = {}
+
+    if target.kind in (INTEGER, DECIMAL, FLOAT):
+        if is_text and target.kind != FLOAT:
+            return _coerce_polars_numeric_text(series, text, target, time_zone)
+        if is_text:
+            numeric = text.cast(pl.Float64, strict=False)
+            issues[UNPARSEABLE] = present & numeric.is_null()
+        elif dtype == pl.Boolean or dtype.is_numeric() or dtype.is_decimal():
+            numeric = series
+        else:
+            return series, issues
+
+        if target.kind == FLOAT:
+            return numeric.cast(pl.Float64), issues
+
+        scale = target.scale or 0
+        rounded = numeric.round(scale) if numeric.dtype.is_float() else numeric
+        if numeric.dtype.is_float():
+            issues[ROUNDED] = numeric.is_not_null() & numeric.is_finite() & (rounded != numeric)
+
+        if target.kind == INTEGER:
+            in_range = rounded.is_between(target.min_value, target.max_value)
+            issues[OUT_OF_RANGE] = rounded.is_not_null() & ~in_range
+            if ROUNDED in issues:
+                issues[ROUNDED] = issues[ROUNDED] & in_range
+            integer_dtype = getattr(pl, f"{'UInt' if target.min_value >= 0 else 'Int'}{integer_width(target)}")
+            coerced = pl.select(pl.when(in_range).then(rounded)).to_series().cast(integer_dtype)
+            return coerced.alias(series.name), issues
+
+        precision = target.precision or 38
+        limit = 10 ** (precision - scale)
+        magnitude = rounded.abs() if rounded.dtype.is_decimal() else rounded.cast(pl.Float64).abs()
+        in_range = rounded.is_not_null() & (magnitude < limit)
+        issues[OUT_OF_RANGE] = rounded.is_not_null() & ~in_range
+        if ROUNDED in issues:
+            issues[ROUNDED] = issues[ROUNDED] & in_range
+        valid = pl.select(pl.when(in_range).then(rounded)).to_series().alias(series.name)
+        if not target.fixed_point:
+            if valid.dtype.is_decimal():
+                # Digits the float the driver binds cannot hold are lost too.
+                as_float = valid.cast(pl.Float64)
+                issues[ROUNDED] = (as_float.cast(valid.dtype, strict=False) != valid).fill_null(False)
+                return as_float, issues
+            return (valid if valid.dtype.is_integer() else valid.cast(pl.Float64)), issues
+        if not valid.dtype.is_float() and not valid.dtype.is_decimal():
+            valid = valid.cast(pl.Float64)
+        return valid.cast(pl.Decimal(precision, scale), strict=False), issues
+
+    if target.kind == BOOLEAN:
+        if dtype == pl.Boolean:
+            return series, issues
+        if is_text:
+            coerced = text.str.to_lowercase().replace_strict(_boolean_strings, default=None, return_dtype=pl.Boolean)
+            issues[UNPARSEABLE] = present & coerced.is_null()
+            return coerced.alias(series.name), issues
+        if dtype.is_numeric():
+            issues[OUT_OF_RANGE] = present & ~series.is_in([0, 1])
+            return pl.select(pl.when(series.is_in([0, 1])).then(series != 0)).to_series().alias(series.name), issues
+        return series, issues
+
+    if target.kind == STRING:
+        coerced = series.cast(pl.String)
+        if target.length:
+            too_long = coerced.str.len_chars() > target.length
+            issues[TRUNCATED] = too_long.fill_null(False)
+            coerced = coerced.str.slice(0, target.length)
+        return coerced, issues
+
+    if target.kind in (DATETIME, DATE):
+        if is_text:
+            parsed = text.str.to_datetime(strict=False, time_unit='us')
+            issues[UNPARSEABLE] = present & parsed.is_null()
+        elif dtype == pl.Datetime:
+            parsed = series
+        elif dtype == pl.Date:
+            parsed = series.cast(pl.Datetime('us'))
+        else:
+            return series, issues
+
+        source_zone = parsed.dtype.time_zone
+        if target.kind == DATE:
+            if source_zone:
+                parsed = parsed.dt.convert_time_zone(time_zone).dt.replace_time_zone(None)
+            issues[TRUNCATED] = (parsed.dt.truncate('1d') != parsed).fill_null(False)
+            return parsed.dt.date(), issues
+        if target.timezone and not source_zone:
+            parsed = parsed.dt.replace_time_zone(time_zone)
+        elif not target.timezone and source_zone:
+            parsed = parsed.dt.convert_time_zone(time_zone).dt.replace_time_zone(None)
+        return parsed.dt.cast_time_unit('us'), issues
+
+    if target.kind == TIME and is_text:
+        coerced = text.str.to_time(strict=False)
+        issues[UNPARSEABLE] = present & coerced.is_null()
+        return coerced, issues
+    return series, issues
+
+
+def _parse_decimal(value) -> Optional[Decimal]:
+    """`value` as a Decimal, or None if it is not a number."""
+    if isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(str(value).strip())
+    except InvalidOperation:
+        return None
+
+
+def _coerce_pandas_decimals(series, target: TargetType) -> Tuple[object, dict]:
+    """
+    Coerce an object column (strings, Decimals, Python ints) to a decimal target without going through floats.
+
+    Values are quantized to the target scale and kept as Decimals. Where the driver only binds floats
+    (`TargetType.fixed_point` off) they are then converted, and digits a float cannot hold are reported as rounded.
+    """
+    import pandas as pd
+
+    precision, scale = target.precision or 38, target.scale or 0
+    quantum = Decimal(1).scaleb(-scale)
+    limit = Decimal(10) ** (precision - scale)
+    # Rounding a value under `limit` up to `scale` digits can carry into one more digit than the precision.
+    context = Context(prec=precision + 1, rounding=ROUND_HALF_EVEN)
+
+    values = []
+    unparseable, out_of_range, rounded = ([False] * len(series) for _ in range(3))
+    for row, value in enumerate(series.tolist()):
+        number = None if pd.isna(value) else _parse_decimal(value)
+        if number is None:
+            unparseable[row] = not pd.isna(value)
+        elif not number.is_finite() or abs(number) >= limit:
+            out_of_range[row], number = True, None
+        else:
+            quantized = number.quantize(quantum, context=context)
+            if abs(quantized) >= limit:
+                out_of_range[row], number = True, None
+            else:
+                rounded[row], number = quantized != number, quantized
+                if not target.fixed_point:
+                    rounded[row] = rounded[row] or Decimal(str(float(number))) != number
+        values.append(number)
+
+    issues = {
+        name: pd.Series(mask, index=series.index)
+        for name, mask in ((UNPARSEABLE, unparseable), (OUT_OF_RANGE, out_of_range), (ROUNDED, rounded))
+    }
+    if not target.fixed_point:
+        values = [None if number is None else float(number) for number in values]
+        return pd.Series(values, index=series.index, name=series.name, dtype='float64'), issues
+    return pd.Series(values, index=series.index, name=series.name, dtype=object), issues
+
+
+def _coerce_pandas_integers(series, target: TargetType) -> Tuple[object, dict]:
+    """
+    Coerce an object column to an integer target through Decimals, so values above 2**53 stay exact.
+
+    `pd.to_numeric` parses any column with a NULL as float64, which cannot hold every 64-bit integer.
+    """
+    import pandas as pd
+
+    digits = len(str(max(-target.min_value, target.max_value)))
+    numbers, issues = _coerce_pandas_decimals(series, TargetType(DECIMAL, target.sql_type, precision=digits, scale=0))
+    in_range = numbers.map(lambda number: number is not None and target.min_value <= number <= target.max_value)
+    issues[OUT_OF_RANGE] = issues[OUT_OF_RANGE] | (numbers.notna() & ~in_range)
+    issues[ROUNDED] = issues[ROUNDED] & in_range
+
+    integer_dtype = f"{'UInt' if target.min_value >= 0 else 'Int'}{integer_width(target)}"
+    values = [int(number) if valid else None for number, valid in zip(numbers.tolist(), in_range.tolist())]
+    return pd.Series(pd.array(values, dtype=integer_dtype), index=series.index, name=series.name), issues
+
+
+def _coerce_pandas_series(series, target: TargetType, time_zone: str) -> Tuple[object, dict]:
+    import pandas as pd
+
+    present = series.notna()
+    is_numeric = pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+    is_datetime = pd.api.types.is_datetime64_any_dtype(series)
+    issues = {}
+
+    if target.kind in (INTEGER, DECIMAL, FLOAT):
+        parseable = pd.api.types.infer_dtype(series, skipna=True) in ('string', 'mixed', 'empty', 'decimal', 'integer')
+        if is_numeric:
+            numeric = series.astype('float64') if pd.api.types.is_bool_dtype(series) else series
+        elif parseable and target.kind == DECIMAL:
+            return _coerce_pandas_decimals(series, target)
+        elif parseable and target.kind == INTEGER:
+            return _coerce_pandas_integers(series, target)
+        elif parseable:
+            numeric = pd.to_numeric(series, errors='coerce')
+            issues[UNPARSEABLE] = present & numeric.isna()
+        else:
+            return series, issues
+
+        if target.kind == FLOAT:
+            return numeric.astype('float64'), issues
+
+        scale = target.scale or 0
+        is_float = pd.api.types.is_float_dtype(numeric)
+        rounded = numeric.round(scale) if is_float else numeric
+        if is_float:
+            issues[ROUNDED] = numeric.notna() & (rounded != numeric) & ~numeric.isin([float('inf'), float('-inf')])
+
+        if target.kind == INTEGER:
+            in_range = rounded.between(target.min_value, target.max_value)
+            issues[OUT_OF_RANGE] = rounded.notna() & ~in_range
+            if ROUNDED in issues:
+                issues[ROUNDED] = issues[ROUNDED] & in_range
+            integer_dtype = f"{'UInt' if target.min_value >= 0 else 'Int'}{integer_width(target)}"
+            return rounded.where(in_range).astype(integer_dtype), issues
+
+        limit = 10 ** ((target.precision or 38) - scale)
+        in_range = rounded.abs() < limit
+        issues[OUT_OF_RANGE] = rounded.notna() & ~in_range
+        if ROUNDED in issues:
+            issues[ROUNDED] = issues[ROUNDED] & in_range
+        return rounded.where(in_range), issues
+
+    if target.kind == BOOLEAN:
+        if pd.api.types.is_bool_dtype(series):
+            return series, issues
+        if is_numeric:
+            valid = series.isin([0, 1])
+            issues[OUT_OF_RANGE] = present & ~valid
+            return (series != 0).astype('boolean').where(valid, pd.NA), issues
+        coerced = series.astype(str).str.strip().str.lower().map(_boolean_strings).astype('boolean')
+        coerced = coerced.where(present, pd.NA)
+        issues[UNPARSEABLE] = present & coerced.isna()
+        return coerced, issues
+
+    if target.kind == STRING:
+        coerced = series.astype(object).where(~present, series.astype(str))
+        if target.length:
+            too_long = coerced.str.len() > target.length
+            issues[TRUNCATED] = too_long.fillna(False).astype(bool)
+            coerced = coerced.where(~issues[TRUNCATED], coerced.str.slice(0, target.length))
+        return coerced, issues
+
+    if target.kind in (DATETIME, DATE):
+        if is_datetime:
+            parsed = series
+        else:
+            parsed = pd.to_datetime(series, errors='coerce')
+            issues[UNPARSEABLE] = present & parsed.isna()
+            if not pd.api.types.is_datetime64_any_dtype(parsed):
+                # Mixed UTC offsets parse to objects; normalize them to UTC instead.
+                parsed = pd.to_datetime(series, errors='coerce', utc=True)
+
+        source_zone = getattr(parsed.dt, 'tz', None)
+        if target.kind == DATE:
+            if source_zone is not None:
+                parsed = parsed.dt.tz_convert(time_zone).dt.tz_localize(None)
+            issues[TRUNCATED] = parsed.notna() & (parsed.dt.normalize() != parsed)
+            return parsed.dt.date.where(parsed.notna(), None), issues
+        if target.timezone and source_zone is None:
+            parsed = parsed.dt.tz_localize(time_zone)
+        elif not target.timezone and source_zone is not None:
+            parsed = parsed.dt.tz_convert(time_zone).dt.tz_localize(None)
+        return parsed, issues
+
+    return series, issues
+
+
+def coerce_frame(
+    dataframe, columns: List[dict], dialect: Optional[str] = None, time_zone: str = 'UTC'
+) -> Tuple[object, CoercionReport]:
+    """
+    Cast every dataframe column to the type of the matching reflected column, once and vectorized.
+
+    Binding values of the column's own type avoids per-row conversion in the driver and implicit casts on the
+    server (which can keep an index on the column from being used). Values that cannot be represented are
+    NULLed, rounded or truncated, and reported.
+
+    Args:
+        dataframe (DataFrame): A Pandas or Polars dataframe.
+        columns (List[dict]): Reflected columns, as returned by `CopyDDl.get_table_info`. Columns are matched
+                              by name, case-insensitively; dataframe columns without a match are left alone.
+        dialect (str, optional): The dialect the columns were reflected from.
+        time_zone (str): The zone naive datetimes are assumed to be in when the target stores an offset, and
+                         that zone-aware datetimes are converted to when it does not.
+
+    Returns:
+        Tuple[DataFrame, CoercionReport]: The coerced dataframe, of the same library, and the report.
+    """
+    reflected = {column['name'].lower(): column for column in columns}
+    is_pandas = 'pandas' in type(dataframe).__module__
+    coerce_series = _coerce_pandas_series if is_pandas else _coerce_polars_series
+
+    report = CoercionReport()
+    coerced_columns = {}
+    for name in dataframe.columns:
+        column = reflected.get(name.lower())
+        target = target_type(column['type'], dialect) if column else None
+        if target is None:
+            continue
+
+        series = dataframe[name]
+        coerced, issues = coerce_series(series, target, time_zone)
+        coerced_columns[name] = coerced
+        report.target_types[name] = target.sql_type
+        for issue, mask in issues.items():
+            rows = int(mask.sum())
+            if rows:
+                examples = (series[mask.to_numpy()] if is_pandas else series.filter(mask)).head(EXAMPLE_COUNT)
+                report.issues.append(CastIssue(name, target.sql_type, issue, rows, list(examples)))
+
+    if is_pandas:
+        return dataframe.assign(**coerced_columns), report
+    return dataframe.with_columns(list(coerced_columns.values())), report
+
+
+def coerce_to_table(
+    dataframe,
+    db_resource: Union[str, Engine, Connection],
+    table_name: str,
+    schema_name: Optional[str] = None,
+    time_zone: str = 'UTC',
+) -> Tuple[object, CoercionReport]:
+    """
+    Reflect `table_name` and cast the dataframe to its column types, see `coerce_frame`.
+
+    Args:
+        dataframe (DataFrame): A Pandas or Polars dataframe.
+        db_resource (str | Engine | Connection): The target database.
+        table_name (str): The target table.
+        schema_name (str, optional): The schema of the target table.
+        time_zone (str): The zone assumed for naive datetimes, see `coerce_frame`.
+
+    Returns:
+        Tuple[DataFrame, CoercionReport]: The coerced dataframe and the report of lossy casts.
+    """
+    table = CopyDDl(db_resource, table_name, schema_name)
+    return coerce_frame(dataframe, table.get_table_info(), table.db_engine.dialect.name, time_zone)
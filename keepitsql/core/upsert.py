@@ -1,17 +1,24 @@
 import re
 
-from data_engineer_utils import (
-    get_dbms_by_py_driver,
-    get_upsert_type_by_dbms,
-)
+from data_engineer_utils import get_dbms_by_py_driver
 from sqlalchemy.sql.elements import quoted_name
 
-from keepitsql.core.insert import GenerateInsert
+from keepitsql.core.column_plan import get_column_plan
+from keepitsql.core.dialect_capabilities import (
+    MERGE,
+    ON_DUPLICATE_KEY,
+    get_dialect_capabilities,
+)
+from keepitsql.core.insert import (
+    GenerateInsert,
+    parameter_value_rows,
+)
 from keepitsql.core.table_properties import (
     format_table_name,
     prepare_column_select_list,
     select_dataframe_column,
 )
+from keepitsql.sql_models.delete import delete_statement as dst
 from keepitsql.sql_models.upsert import insert_on_confict as ioc
 from keepitsql.sql_models.upsert import merge_statement as mst
 
@@ -51,6 +58,19 @@ def parse_table_name(qualified_name):
         raise ValueError("Invalid table name format.")
 
 
+def render_scope_conditions(delete_scope: dict, table_alias: str) -> str:
+    """Render `{column: value}` as `alias.column = :scope_column AND ...`; see `scope_params`."""
+    return ' AND '.join(
+        dst.scope_condition.format(table_alias=table_alias, column=column, parameter=f'scope_{column}')
+        for column in (delete_scope or {})
+    )
+
+
+def scope_params(delete_scope: dict) -> dict:
+    """The bind parameters for `render_scope_conditions`."""
+    return {f'scope_{column}': value for column, value in (delete_scope or {}).items()}
+
+
 class GenerateMergeStatement:
     def __init__(self, dataframe):
         self.dataframe = dataframe
@@ -62,6 +82,10 @@ class GenerateMergeStatement:
         match_condition: list,
         constraint_columns: list = None,
         source_table_name: str = None,
+        delete_not_matched: bool = False,
+        delete_scope: dict = None,
+        values_rows: int = None,
+        column_select: list = None,
         **kwargs,
     ) -> str:
         """
@@ -75,6 +99,17 @@ class GenerateMergeStatement:
                                                 such as primary keys or auto-update columns,
                                                 which should not be inserted. Defaults to None.
             temp_type (str, optional): The type of temporary table to be used. Defaults to None.
+            delete_not_matched (bool): Add `WHEN NOT MATCHED BY SOURCE THEN DELETE`, so target rows missing
+                                       from the source are removed. Only some databases support it (see
+                                       `DialectCapabilities.merge_delete_by_source`).
+            delete_scope (dict, optional): Only delete target rows whose columns equal these values, e.g.
+                                           `{'region': 'EU'}` when the source holds one partition. Bound
+                                           as `:scope_<column>` parameters.
+            values_rows (int, optional): Merge from an inline `VALUES` table constructor of this many rows instead
+                                         of a source table, binding `:column_<row>` parameters (see
+                                         `keepitsql.core.insert.values_params`).
+            column_select (list, optional): Only insert and update these columns; the match columns are always
+                                            included. Defaults to every dataframe column.
 
         Returns:
             str: The generated SQL merge statement.
@@ -82,59 +117,108 @@ class GenerateMergeStatement:
 
         target_table, targe_schema = parse_table_name(table_name)
 
-        all_columns = self.dataframe.columns
-
-        if constraint_columns is None:
-            constraint_columns = []
-
-        for item in match_condition:
-            if item not in all_columns:
-                raise ValueError(f"Value {item} from match condition is not in dataframe.")
-
-        for item in constraint_columns:
-            if item not in all_columns:
-                raise ValueError(f"Value {item} from match condition is not in dataframe.")
+        plan = get_column_plan(self.dataframe, match_condition, constraint_columns, column_select)
 
         join_conditions = ' AND\n'.join(
-            mst.merge_condition.format(source_column=quote_identifier(col), target_column=quote_identifier(col))
-            for col in match_condition
+            mst.merge_condition.format(source_column=col, target_column=col) for col in plan.quoted_match_columns
         )
         matched_condition = ' OR\n'.join(
-            mst.when_matched_condition.format(target_column=quote_identifier(col), source_column=quote_identifier(col))
-            for col in all_columns
-            if col not in match_condition
+            mst.when_matched_condition.format(target_column=col, source_column=col)
+            for col in plan.quoted_update_columns
         )
 
         merge_update_list = ',\n'.join(
-            mst.update_list.format(target_column=quote_identifier(col), source_column=quote_identifier(col))
-            for col in all_columns
-            if col not in match_condition
+            mst.update_list.format(target_column=col, source_column=col) for col in plan.quoted_update_columns
         )
 
         merge_insert_values = ',\n'.join(
-            mst.merge_insert.format(source_column=quote_identifier(col))
-            for col in all_columns
-            if col not in constraint_columns
+            mst.merge_insert.format(source_column=col) for col in plan.quoted_insert_columns
         )
         merge_insert_columns = ',\n'.join(
-            mst.merge_insert_columns.format(source_column=quote_identifier(col))
-            for col in all_columns
-            if col not in constraint_columns
+            mst.merge_insert_columns.format(source_column=col) for col in plan.quoted_insert_columns
         )
 
         source_table_name = table_name if source_table_name is None else source_table_name
+        source_columns = ''
+        if values_rows is not None:
+            source_table_name = mst.values_source.format(value_rows=parameter_value_rows(plan.columns, values_rows))
+            source_columns = mst.source_column_list.format(column_names=', '.join(plan.quoted_columns))
+
+        delete_clause = ''
+        if delete_not_matched:
+            scope_conditions = render_scope_conditions(delete_scope, 'TARGET')
+            delete_clause = mst.merge_delete_clause.format(
+                scope_conditions=f' AND {scope_conditions}' if scope_conditions else ''
+            )
 
         merge_statement = mst.merge_statement.format(
             target_table=table_name,
             source_table=source_table_name,
+            source_columns=source_columns,
             merge_join_conditions=join_conditions,
             matched_condition=matched_condition,
             update_list=merge_update_list,
             insert_columns=merge_insert_columns,
             merge_insert_value=merge_insert_values,
+            delete_clause=delete_clause,
         )
         return merge_statement
 
+    def generate_delete_not_in_source(
+        self,
+        table_name: str,
+        match_condition: list,
+        source_table_name: str,
+        delete_scope: dict = None,
+    ) -> str:
+        """
+        Creates an anti-join DELETE removing target rows that have no match in the source table.
+
+        This is the set-based counterpart of `WHEN NOT MATCHED BY SOURCE THEN DELETE` for databases whose
+        MERGE lacks it or that upsert with ON CONFLICT.
+
+        Args:
+            table_name (str): The target table.
+            match_condition (list): The columns used to match source and target rows.
+            source_table_name (str): The table holding the complete source rows, e.g. a staging table.
+            delete_scope (dict, optional): Only delete target rows whose columns equal these values. Bound
+                                           as `:scope_<column>` parameters.
+
+        Returns:
+            str: The generated SQL delete statement.
+        """
+        plan = get_column_plan(self.dataframe, match_condition)
+
+        match_conditions = ' AND\n      '.join(
+            dst.target_match_condition.format(source_column=col, target_table=table_name, target_column=col)
+            for col in plan.match_columns
+        )
+        scope_conditions = render_scope_conditions(delete_scope, table_name)
+
+        return dst.delete_not_in_source.format(
+            target_table=table_name,
+            scope_conditions=f'{scope_conditions} AND ' if scope_conditions else '',
+            source_table=source_table_name,
+            match_conditions=match_conditions,
+        )
+
+    def generate_delete(self, table_name: str, match_condition: list) -> str:
+        """
+        Creates a parameterized DELETE removing the target row matching each dataframe row on `match_condition`.
+
+        Args:
+            table_name (str): The target table.
+            match_condition (list): The key columns. They are bound as `:column` parameters.
+
+        Returns:
+            str: The generated SQL delete statement.
+        """
+        plan = get_column_plan(self.dataframe, match_condition)
+        key_conditions = ' AND '.join(
+            dst.scope_condition.format(table_alias=table_name, column=col, parameter=col) for col in plan.match_columns
+        )
+        return dst.delete_by_key.format(target_table=table_name, key_conditions=key_conditions)
+
     def generate_insert_on_conflict(
         # dataframe: any,
         self,
@@ -142,7 +226,10 @@ class GenerateMergeStatement:
         match_condition: list,
         constraint_columns: list = None,
         source_table_name: str = None,
-        is_sqlite: str = 'N',
+        dbms: str = None,
+        values_rows: int = None,
+        skip_unchanged: bool = False,
+        column_select: list = None,
         **kwargs
         # source_table: str,
         # match_condition: list,
@@ -159,33 +246,59 @@ class GenerateMergeStatement:
             source_schema (str, optional): The schema of the source table. Defaults to None.
             column_exclusion (list, optional): The list of columns to be excluded from the insert. Defaults to None.
             temp_type (str, optional): The type of temporary table to be used. Defaults to None.
+            dbms (str, optional): The target dialect. Picks the ON DUPLICATE KEY form on MySQL and the
+                                  `WHERE true` form needed by SQLite for INSERT ... SELECT. Defaults to
+                                  standard ON CONFLICT.
+            values_rows (int, optional): Insert from an inline multi-row `VALUES` list of this many rows, binding
+                                         `:column_<row>` parameters, instead of one row or a source table.
+            skip_unchanged (bool): Only update conflicting rows whose values differ, compared null-safely
+                                   (`IS DISTINCT FROM`, `IS NOT` on SQLite), so unchanged rows are not rewritten.
+                                   MySQL already skips writing unchanged rows, so ON DUPLICATE KEY is left as is.
+            column_select (list, optional): Only insert and update these columns; the match columns are always
+                                            included. Defaults to every dataframe column.
         """
+        if dbms is None and kwargs.get('is_sqlite') == 'Y':
+            dbms = 'sqlite'
+        capabilities = get_dialect_capabilities(dbms)
 
-        for item in match_condition:
-            if item not in self.dataframe.columns:
-                raise ValueError(f"Value {item} from list1 is not in list2.")
-
-        init_insert = GenerateInsert(self.dataframe)
-        insert_stmt = self.insert(table_name, source_table=source_table_name)
-
-        update_list = '\n,'.join
+        plan = get_column_plan(self.dataframe, match_condition, column_select=column_select)
 
-        update_list_col = select_dataframe_column(source_dataframe=self.dataframe, output_type='list')
-
-        match_conditions = ','.join(match_condition)
-
-        update_list = ',\n'.join(
-            ioc.update_list.format(column=col)
-            for col in update_list_col
-            if col.upper() not in list(map(lambda x: x.upper(), match_condition))
+        insert_stmt = self.insert(
+            table_name,
+            column_select=None if column_select is None else plan.columns,
+            source_table=source_table_name,
+            values_rows=values_rows,
         )
-        if is_sqlite == "Y" and source_table_name != None:
+
+        match_conditions = ','.join(plan.match_columns)
+
+        if capabilities.upsert_type == ON_DUPLICATE_KEY:
+            update_list = ',\n'.join(ioc.update_list_duplicate_key.format(column=col) for col in plan.update_columns)
+            return ioc.insert_on_duplicate_key.format(insert_statment=insert_stmt, update_list=update_list)
+
+        update_list = ',\n'.join(ioc.update_list.format(column=col) for col in plan.update_columns)
+        update_guard = ''
+        if skip_unchanged and plan.update_columns:
+            _, local_table_name = parse_table_name(table_name)
+            distinct_condition = ioc.distinct_conditions.get(capabilities.name, ioc.distinct_conditions['default'])
+            update_guard = ioc.update_guard.format(
+                conditions=' OR\n      '.join(
+                    distinct_condition.format(target_table=local_table_name, column=col) for col in plan.update_columns
+                )
+            )
+        if capabilities.on_conflict_select_needs_where and source_table_name is not None and values_rows is None:
             on_conflict_statement = ioc.insert_on_conflict_sqlite.format(
-                insert_statment=insert_stmt, match_condition=match_conditions, update_list=update_list
+                insert_statment=insert_stmt,
+                match_condition=match_conditions,
+                update_list=update_list,
+                update_guard=update_guard,
             )
         else:
             on_conflict_statement = ioc.insert_on_conflict.format(
-                insert_statment=insert_stmt, match_condition=match_conditions, update_list=update_list
+                insert_statment=insert_stmt,
+                match_condition=match_conditions,
+                update_list=update_list,
+                update_guard=update_guard,
             )
 
         return on_conflict_statement
@@ -197,24 +310,61 @@ class GenerateMergeStatement:
         dbms: str,
         constraint_columns: list = None,
         source_table_name: str = None,
+        values_rows: int = None,
+        skip_unchanged: bool = False,
+        column_select: list = None,
         **kwargs,
     ):
-        if get_upsert_type_by_dbms(dbms) == 'MERGE':
+        """
+        Creates the upsert statement native to `dbms`: a MERGE, or an INSERT with conflict resolution.
+
+        Args:
+            table_name (str): The target table.
+            match_condition (list): The columns used to match source and target rows.
+            dbms (str): The target dialect.
+            constraint_columns (list, optional): Columns that should not be inserted, such as identities.
+            source_table_name (str, optional): The table holding the source rows, e.g. a staging table.
+            values_rows (int, optional): Take the source rows from an inline parameterized `VALUES` list of this
+                                         many rows instead of a source table, so one execution upserts a whole
+                                         micro-batch without staging DDL. Bind the rows with
+                                         `keepitsql.core.insert.values_params`, and keep `values_rows` within
+                                         `DialectCapabilities.rows_per_statement`.
+            skip_unchanged (bool): Do not rewrite conflicting rows whose values are unchanged. MERGE statements
+                                   always carry this guard, compared null-safely, in their `WHEN MATCHED`
+                                   condition.
+            column_select (list, optional): Only insert and update these columns; the match columns are always
+                                            included. Defaults to every dataframe column.
+
+        Returns:
+            str: The generated SQL upsert statement.
+
+        Raises:
+            ValueError: If `values_rows` is given for a dialect without multi-row VALUES support.
+        """
+        capabilities = get_dialect_capabilities(dbms)
+        if values_rows is not None and not capabilities.multi_row_values:
+            raise ValueError(f"Dialect '{capabilities.name}' does not support inline VALUES sources.")
+
+        if capabilities.upsert_type == MERGE:
             return self.generate_merge_statement(
                 table_name=table_name,
                 match_condition=match_condition,
                 constraint_columns=constraint_columns,
                 source_table_name=source_table_name,
+                values_rows=values_rows,
+                column_select=column_select,
             )
 
         else:
-            sqllite_flag = 'Y' if dbms == 'sqlite' else 'N'
             return self.generate_insert_on_conflict(
                 table_name=table_name,
                 match_condition=match_condition,
                 constraint_columns=constraint_columns,
                 source_table_name=source_table_name,
-                is_sqlite=sqllite_flag,
+                dbms=dbms,
+                values_rows=values_rows,
+                skip_unchanged=skip_unchanged,
+                column_select=column_select,
             )
 
     # if get_upsert_type_by_dbms(dbms_output) == 'MERGE':
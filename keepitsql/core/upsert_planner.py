@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import math
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    List,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+    text,
+)
+
+from keepitsql.core.dialect_capabilities import (
+    MERGE,
+    get_dialect_capabilities,
+)
+from keepitsql.core.executor import (
+    LoadResult,
+    TransactionOptions,
+    connection_scope,
+    iter_param_chunks,
+)
+from keepitsql.core.insert import values_params
+from keepitsql.core.retry import RetryPolicy
+from keepitsql.core.upsert import parse_table_name
+from keepitsql.sql_models.select import table_stats as ts
+
+INSERT_ONLY = 'insert_only'
+INLINE_VALUES = 'inline_values'
+STAGED = 'staged'
+REFRESH = 'refresh'
+
+# Batches that fit in this many inline VALUES statements are cheaper than any staging round trips.
+INLINE_MAX_STATEMENTS = 4
+# Full snapshots of at least this many rows are rebuilt and swapped in rather than merged row by row.
+REFRESH_MIN_ROWS = 100_000
+KEY_SAMPLE_SIZE = 200
+
+
+@dataclass
+class UpsertPlan:
+    """
+    The load strategy picked by `FromDataframe.plan_upsert`, with the statistics it was based on.
+
+    Attributes:
+        strategy (str): `INSERT_ONLY`, `INLINE_VALUES`, `STAGED` or `REFRESH`.
+        reason (str): Why the strategy was picked.
+        table_name (str): The target table.
+        match_condition (List[str]): The columns used to match source and target rows.
+        constraint_columns (List[str], optional): Columns that should not be inserted.
+        dialect (str): The target dialect.
+        row_count (int): Rows in the dataframe.
+        column_count (int): Columns in the dataframe.
+        target_rows (int, optional): Rows in the target, from catalog statistics. None if unknown.
+        sampled_keys (int): Dataframe keys probed against the target.
+        existing_keys (int): How many of the sampled keys already exist in the target.
+        round_trips (dict): Estimated statements sent by each strategy that was considered.
+    """
+
+    strategy: str
+    reason: str
+    table_name: str
+    match_condition: List[str]
+    constraint_columns: Optional[List[str]]
+    dialect: str
+    row_count: int
+    column_count: int
+    target_rows: Optional[int] = None
+    sampled_keys: int = 0
+    existing_keys: int = 0
+    round_trips: dict = field(default_factory=dict)
+    loader: object = field(default=None, repr=False, compare=False)
+
+    @property
+    def new_key_ratio(self) -> Optional[float]:
+        """The share of sampled keys not yet in the target, or None if no keys were sampled."""
+        return 1 - self.existing_keys / self.sampled_keys if self.sampled_keys else None
+
+    def execute(
+        self,
+        db_resource: Union[Engine, Connection],
+        chunk_size: Optional[int] = None,
+        transaction: Optional[TransactionOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> LoadResult:
+        """
+        Load the dataframe with the planned strategy.
+
+        Args:
+            db_resource (Engine | Connection): Where to load.
+            chunk_size (int, optional): Rows per chunk. Defaults to the strategy's own default.
+            transaction (TransactionOptions, optional): Commit cadence and savepoint options.
+            retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks.
+
+        Returns:
+            LoadResult: Row, chunk, commit and retry counts.
+        """
+        # Constraint columns (identities, ...) are left to the database: neither inserted nor updated.
+        inserted_columns = [col for col in self.loader.dataframe.columns if col not in (self.constraint_columns or ())]
+        if self.strategy == INSERT_ONLY:
+            return self.loader.load_insert(
+                db_resource, self.table_name, chunk_size, transaction, retry, column_select=inserted_columns
+            )
+        if self.strategy == REFRESH:
+            return self.loader.load_refresh(db_resource, self.table_name, chunk_size, transaction, retry)
+        return self.loader.load_upsert(
+            db_resource,
+            self.table_name,
+            self.match_condition,
+            self.constraint_columns,
+            chunk_size=chunk_size,
+            transaction=transaction,
+            retry=retry,
+            inline_values=self.strategy == INLINE_VALUES,
+            column_select=inserted_columns if self.constraint_columns else None,
+        )
+
+
+def estimate_table_rows(connection: Connection, table_name: str) -> Optional[int]:
+    """
+    Estimate the rows of `table_name` from the catalog statistics of its dialect.
+
+    Dialects without a statistics query (such as SQLite) are counted exactly. An estimate of zero is confirmed
+    with an exact count, since stale statistics commonly report small tables as empty.
+
+    Returns:
+        int: The estimated row count, or None if the table has no statistics.
+    """
+    dialect = connection.dialect.name
+    schema_name, local_table_name = parse_table_name(table_name)
+    query = ts.row_estimates.get(dialect, ts.row_estimates['default'])
+    estimate = connection.execute(
+        text(query.format(table_name=table_name)),
+        {'table_name': table_name, 'schema_name': schema_name, 'local_table_name': local_table_name},
+    ).scalar()
+    if estimate == 0 and dialect in ts.row_estimates:
+        estimate = connection.execute(text(ts.exact_row_count.format(table_name=table_name))).scalar()
+    return None if estimate is None else int(estimate)
+
+
+def count_existing_keys(connection: Connection, table_name: str, key_frame) -> int:
+    """Count how many key rows of `key_frame` exist in `table_name`, with one statement."""
+    key_conditions = ' OR\n      '.join(
+        ts.key_match.format(
+            conditions=' AND '.join(
+                ts.key_column_match.format(column=column, parameter=f'{column}_{row}') for column in key_frame.columns
+            )
+        )
+        for row in range(len(key_frame))
+    )
+    params = values_params(next(iter_param_chunks(key_frame, len(key_frame))))
+    statement = ts.count_existing_keys.format(table_name=table_name, key_conditions=key_conditions)
+    return connection.execute(text(statement), params).scalar()
+
+
+def sample_keys(dataframe, match_condition: List[str], sample_size: int):
+    """Up to `sample_size` rows of the key columns, the whole frame when it is small enough."""
+    if 'pandas' in type(dataframe).__module__:
+        keys = dataframe[list(match_condition)]
+        return keys if len(keys) <= sample_size else keys.sample(n=sample_size, random_state=0)
+    keys = dataframe.select(match_condition)
+    return keys if keys.height <= sample_size else keys.sample(n=sample_size, seed=0)
+
+
+def plan_upsert(
+    loader,
+    db_resource: Union[Engine, Connection],
+    table_name: str,
+    match_condition: List[str],
+    constraint_columns: Optional[List[str]] = None,
+    full_snapshot: bool = False,
+    sample_size: int = KEY_SAMPLE_SIZE,
+) -> UpsertPlan:
+    """
+    Pick the cheapest way to upsert the loader's dataframe into `table_name`.
+
+    In order of preference:
+
+    - `INSERT_ONLY` when the target is empty, or when every key of a frame small enough to be probed in full
+      is new: plain inserts skip conflict handling altogether.
+    - `REFRESH` when `full_snapshot` is set and the frame has at least `REFRESH_MIN_ROWS` rows: rebuilding the
+      table and swapping it in writes every row once, without per-row index lookups. Not when `constraint_columns`
+      are set: a rebuilt table would re-key rows whose identities the database assigned.
+    - `INLINE_VALUES` when the frame fits in `INLINE_MAX_STATEMENTS` inline VALUES upserts, so no staging table
+      is created.
+    - `STAGED` otherwise: the chunked ON CONFLICT statement, or staging table plus MERGE.
+
+    Args:
+        loader (FromDataframe): The dataframe to load.
+        db_resource (Engine | Connection): The target database, used for catalog statistics and the key probe.
+        table_name (str): The target table.
+        match_condition (List[str]): The columns used to match source and target rows.
+        constraint_columns (List[str], optional): Columns that should not be inserted, such as identities.
+        full_snapshot (bool): Whether the dataframe holds every row the table should contain, so the target
+                              may be replaced rather than merged into.
+        sample_size (int): Keys probed against the target to estimate how many rows are new.
+
+    Returns:
+        UpsertPlan: The chosen strategy and its inputs. Call `execute` to run it.
+    """
+    dataframe = loader.dataframe
+    row_count, column_count = len(dataframe), len(dataframe.columns)
+
+    with connection_scope(db_resource) as connection:
+        capabilities = get_dialect_capabilities(connection)
+        target_rows = estimate_table_rows(connection, table_name)
+
+        sample_size = min(sample_size, capabilities.max_bind_params // max(len(match_condition), 1))
+        sampled_keys = existing_keys = 0
+        if target_rows != 0 and row_count and sample_size:
+            key_frame = sample_keys(dataframe, match_condition, sample_size)
+            sampled_keys = len(key_frame)
+            existing_keys = count_existing_keys(connection, table_name, key_frame)
+
+    chunk_size = capabilities.chunk_size(column_count)
+    chunks = math.ceil(row_count / chunk_size)
+    round_trips = {
+        INSERT_ONLY: chunks,
+        # MERGE stages every chunk: insert, merge and clear, plus creating and dropping the staging table.
+        STAGED: 3 * chunks + 2 if capabilities.upsert_type == MERGE else chunks,
+        REFRESH: chunks + 6,
+    }
+    if capabilities.multi_row_values:
+        round_trips[INLINE_VALUES] = math.ceil(row_count / capabilities.rows_per_statement(column_count))
+
+    plan = UpsertPlan(
+        strategy=STAGED,
+        reason='Default: chunked upsert through the dialect\'s native statement.',
+        table_name=table_name,
+        match_condition=list(match_condition),
+        constraint_columns=constraint_columns,
+        dialect=capabilities.name,
+        row_count=row_count,
+        column_count=column_count,
+        target_rows=target_rows,
+        sampled_keys=sampled_keys,
+        existing_keys=existing_keys,
+        round_trips=round_trips,
+        loader=loader,
+    )
+
+    if target_rows == 0:
+        plan.strategy, plan.reason = INSERT_ONLY, 'The target table is empty.'
+    elif sampled_keys == row_count and existing_keys == 0:
+        plan.strategy, plan.reason = INSERT_ONLY, 'None of the dataframe keys exist in the target.'
+    elif full_snapshot and row_count >= REFRESH_MIN_ROWS and not constraint_columns:
+        plan.strategy, plan.reason = REFRESH, f'Full snapshot of {row_count} rows: rebuild and swap the table.'
+    elif INLINE_VALUES in round_trips and round_trips[INLINE_VALUES] <= INLINE_MAX_STATEMENTS:
+        plan.strategy = INLINE_VALUES
+        plan.reason = f'Small batch: {round_trips[INLINE_VALUES]} inline VALUES statement(s), no staging table.'
+    return plan
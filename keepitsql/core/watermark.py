@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import json
+import os
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+    inspect,
+    text,
+)
+
+from keepitsql.core.engine_registry import resolve_engine
+from keepitsql.core.executor import (
+    LoadResult,
+    connection_scope,
+)
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.core.retry import RetryPolicy
+from keepitsql.core.to_dataframe import ToDataframe
+from keepitsql.sql_models.select import watermark as wm
+
+WATERMARK_TABLE_NAME = 'keepitsql_watermark'
+
+_decoders = {
+    'int': int,
+    'float': float,
+    'decimal': decimal.Decimal,
+    'datetime': datetime.datetime.fromisoformat,
+    'date': datetime.date.fromisoformat,
+    'str': str,
+}
+
+
+def encode_watermark(value) -> tuple:
+    """Serialize a watermark value as `(text, type_name)` so it can be persisted and read back with its type."""
+    if isinstance(value, bool):
+        raise TypeError("Boolean columns cannot be used as watermarks.")
+    for type_name, value_type in (
+        ('int', int),
+        ('float', float),
+        ('decimal', decimal.Decimal),
+        ('datetime', datetime.datetime),
+        ('date', datetime.date),
+        ('str', str),
+    ):
+        if isinstance(value, value_type):
+            return (value.isoformat() if type_name in ('datetime', 'date') else str(value)), type_name
+    raise TypeError(f"Unsupported watermark type: {type(value).__name__}")
+
+
+def decode_watermark(value: str, type_name: str):
+    return _decoders[type_name](value)
+
+
+@dataclass
+class WatermarkFile:
+    """
+    High-water marks persisted as JSON in a local file.
+
+    Attributes:
+        path (str): The state file.
+        watermarks (dict): `{target: {'column': ..., 'value': ..., 'type': ...}}`.
+    """
+
+    path: str
+    watermarks: Dict[str, dict] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.watermarks and os.path.exists(self.path):
+            with open(self.path) as f:
+                self.watermarks = json.load(f).get('watermarks', {})
+
+    def get(self, target: str):
+        """The watermark of `target`, or None if it has not been loaded yet."""
+        state = self.watermarks.get(target)
+        return decode_watermark(state['value'], state['type']) if state else None
+
+    def set(self, target: str, column: str, value) -> None:
+        """Persist the watermark of `target`. The file is replaced atomically."""
+        encoded, type_name = encode_watermark(value)
+        self.watermarks[target] = {'column': column, 'value': encoded, 'type': type_name}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'watermarks': self.watermarks}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+class WatermarkTable:
+    def __init__(self, engine: Engine, table_name: str = WATERMARK_TABLE_NAME) -> None:
+        """
+        High-water marks persisted in a state table, created on first use.
+
+        Keeping the state in the target database lets the watermark be committed in the same place as
+        the data, and shared between hosts running the same load.
+
+        Args:
+            engine (Engine): The database holding the state table.
+            table_name (str): The state table, optionally schema qualified.
+        """
+        self.engine = engine
+        self.table_name = table_name
+        schema_name, _, local_table_name = table_name.rpartition('.')
+        if not inspect(engine).has_table(local_table_name, schema=schema_name or None):
+            with engine.begin() as connection:
+                connection.execute(text(wm.create_watermark_table.format(table_name=table_name)))
+
+    def get(self, target: str):
+        """The watermark of `target`, or None if it has not been loaded yet."""
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                text(wm.select_watermark.format(table_name=self.table_name)), {'target_name': target}
+            ).first()
+        return decode_watermark(row.watermark_value, row.value_type) if row else None
+
+    def set(self, target: str, column: str, value) -> None:
+        """Persist the watermark of `target` in its own transaction."""
+        encoded, type_name = encode_watermark(value)
+        with self.engine.begin() as connection:
+            connection.execute(text(wm.delete_watermark.format(table_name=self.table_name)), {'target_name': target})
+            connection.execute(
+                text(wm.insert_watermark.format(table_name=self.table_name)),
+                {
+                    'target_name': target,
+                    'watermark_column': column,
+                    'watermark_value': encoded,
+                    'value_type': type_name,
+                },
+            )
+
+
+def load_incremental(
+    source: Union[str, Engine],
+    target: Union[Engine, Connection],
+    table_name: str,
+    watermark_column: str,
+    match_condition: List[str],
+    store: Union[WatermarkFile, WatermarkTable],
+    source_table_name: Optional[str] = None,
+    source_schema_name: Optional[str] = None,
+    key_columns: Optional[List[str]] = None,
+    constraint_columns: Optional[List[str]] = None,
+    chunk_size: int = 50_000,
+    retry: Optional[RetryPolicy] = None,
+) -> LoadResult:
+    """
+    Upsert the source rows at or past the stored high-water mark into `table_name`, and advance the mark.
+
+    Rows are read with `ToDataframe` in (watermark, key) order, so each chunk only holds newer rows than
+    the previous one, and the watermark is stored after every chunk that commits: an interrupted load
+    resumes where it stopped. Rows equal to the stored watermark are read again and re-merged, so rows
+    sharing the last timestamp that committed after the previous run are not missed.
+
+    Args:
+        source (str | Engine): The source database URL or Engine.
+        target (Engine | Connection): The target database.
+        table_name (str): The target table, also used as the watermark key.
+        watermark_column (str): A column that only increases, such as `updated_at` or an identity.
+        match_condition (List[str]): The columns used to match source and target rows.
+        store (WatermarkFile | WatermarkTable): Where the high-water marks are kept.
+        source_table_name (str, optional): The source table. Defaults to the target's table name.
+        source_schema_name (str, optional): The schema of the source table.
+        key_columns (List[str], optional): Columns that make the watermark order unique. Defaults to the
+                                           source table's primary key.
+        constraint_columns (List[str], optional): Columns that should not be inserted, such as identities.
+        chunk_size (int): Rows read and upserted per chunk.
+        retry (RetryPolicy, optional): Backoff policy for lock contention and deadlocks.
+
+    Returns:
+        LoadResult: Row, chunk, commit and retry counts over all chunks.
+    """
+    source_engine = resolve_engine(source)
+    source_table_name = source_table_name or table_name.rpartition('.')[2]
+    key_columns = (
+        key_columns
+        or inspect(source_engine).get_pk_constraint(source_table_name, schema=source_schema_name)['constrained_columns']
+    )
+    reader = ToDataframe(
+        source_engine,
+        source_table_name,
+        source_schema_name,
+        key_columns=[watermark_column] + [column for column in key_columns if column != watermark_column],
+    )
+
+    watermark = store.get(table_name)
+    result = LoadResult()
+    with connection_scope(target) as connection:
+        for chunk in reader.iter_chunks(chunk_size=chunk_size, page_size=chunk_size, lower_bound=watermark):
+            chunk_result = FromDataframe(chunk).load_upsert(
+                connection, table_name, match_condition, constraint_columns, chunk_size=chunk_size, retry=retry
+            )
+            result.rows_loaded += chunk_result.rows_loaded
+            result.chunks += chunk_result.chunks
+            result.commits += chunk_result.commits
+            result.transient_retries += chunk_result.transient_retries
+            store.set(table_name, watermark_column, chunk[watermark_column].max())
+    return result
@@ -1,15 +1,37 @@
 from __future__ import annotations
 
+import os
 import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import (
+    Callable,
+    Optional,
+    Union,
+)
 
 from data_engineer_utils import schema_formatter
 from sqlalchemy import (
-    create_engine,
+    CheckConstraint,
+    Engine,
+    ForeignKeyConstraint,
+    MetaData,
+    PrimaryKeyConstraint,
+    Table,
+    UniqueConstraint,
     inspect,
+    text,
+)
+from sqlalchemy import types as sqltypes
+from sqlalchemy.engine import Dialect
+from sqlalchemy.schema import CreateTable
+
+from keepitsql.core.dialect_capabilities import get_dialect_capabilities
+from keepitsql.core.engine_registry import resolve_engine
+from keepitsql.core.schema_manifest import (
+    MANIFEST_FILE_NAME,
+    SchemaManifest,
+    table_fingerprint,
 )
-
 from keepitsql.sql_models import alter_table as at
 from keepitsql.sql_models import create_table as ct
 
@@ -54,6 +76,15 @@ def generate_add_foreign_key_statement(
     return foreign_key_statements if foreign_key_statements else ''
 
 
+def toggle_name_suffix(name: str, suffix: str = '_refresh') -> str:
+    """Add `suffix` to a constraint or index name, or remove it if it is already there.
+
+    Objects rebuilt on a shadow table need names that do not clash with the live table's objects.
+    Toggling keeps names from growing across repeated refreshes.
+    """
+    return name[: -len(suffix)] if name.endswith(suffix) else f'{name}{suffix}'
+
+
 def convert_field_type_by_name(field_name: str, field_type_changes: dict):
     """Converts the field type based on the provided field name and a dictionary of field type changes.
 
@@ -77,15 +108,44 @@ database_url = 'sqlite:///test.db'
 database_url = 'sqlite:///test.db'
 
 
+def render_column_type(column_type, target_dialect: Optional[Dialect] = None) -> str:
+    """Renders a reflected column type as DDL.
+
+    Parameters
+    ----------
+    - column_type (TypeEngine): The type from `Inspector.get_columns`.
+    - target_dialect (Dialect, optional): Render for this dialect instead of the one the type was reflected
+      from. The type is first mapped to its generic SQLAlchemy type (SQLite `DATETIME` to `DateTime`, `BLOB`
+      to `LargeBinary`, ...), which the target dialect then spells in its own way.
+
+    Returns
+    -------
+    - str: The type as it appears in a column definition.
+
+    Raises
+    ------
+    - ValueError: If the column has no declared type (e.g. an untyped SQLite column) and a target dialect is given.
+    """
+    if target_dialect is None or isinstance(column_type, str):
+        return str(column_type)
+    if isinstance(column_type, sqltypes.NullType):
+        raise ValueError(f"A column without a declared type cannot be rendered for {target_dialect.name}.")
+    try:
+        column_type = column_type.as_generic()
+    except NotImplementedError:
+        pass
+    return column_type.compile(dialect=target_dialect)
+
+
 @dataclass
 class CopyDDl:
-    database_url: str
+    database_url: Union[str, Engine]
     local_table_name: str
     local_schema_name: Optional[str] = None
 
     def __post_init__(self):
-        # Establish a connection and create an inspector in the constructor
-        self.db_engine = create_engine(self.database_url)
+        # Reuse the shared engine for the URL and create an inspector in the constructor
+        self.db_engine = resolve_engine(self.database_url)
         self.inspector = inspect(self.db_engine)
 
     def get_table_info(self):
@@ -126,14 +186,20 @@ class CopyDDl:
 
         return primary_key_ddl
 
-    def create_column_ddl(self) -> list:
+    def create_column_ddl(
+        self, keep_not_null: str = 'N', column_select: Optional[list] = None, target_dialect: Optional[Dialect] = None
+    ) -> list:
         column_info = self.get_table_info()
+        if column_select is not None:
+            selected = {column.lower() for column in column_select}
+            column_info = [column for column in column_info if column.get('name').lower() in selected]
         column_ddl = ',\n'.join(
             [
                 ct.create_tbl_column.format(
                     column_name=column.get('name'),
-                    column_type=column.get('type', 'UNKNOWN_TYPE'),
+                    column_type=render_column_type(column.get('type', 'UNKNOWN_TYPE'), target_dialect),
                 )
+                + (ct.not_null if keep_not_null == 'Y' and column.get('nullable') is False else '')
                 for column in column_info
             ],
         )
@@ -166,30 +232,47 @@ class CopyDDl:
         # Construct and return the fully qualified table name
         return f'{sch_name}.{tbl_name}' if sch_name is not None else tbl_name
 
-    def create_foriegn_key_statements(self, new_schema_name: str = None) -> list:
+    def create_foriegn_key_statements(
+        self,
+        new_schema_name: str = None,
+        new_table_name: str = None,
+        toggle_names: bool = False,
+    ) -> list:
         foreign_key_info = self.inspector.get_foreign_keys(
             schema=self.local_schema_name,
             table_name=self.local_table_name,
         )
+        local_table_name = (
+            self.create_table_name_format(new_table_name, new_schema_name)
+            if new_table_name or new_schema_name
+            else self.local_table_name
+        )
+        constraint_name_format = toggle_name_suffix if toggle_names else str
 
         foreign_key_ddl = '\n'.join(
             [
                 at.foreign_key_contraints.format(
-                    local_table_name=self.local_table_name,
-                    constraint_name=self.create_constraint_name(
-                        fk.get(
-                            'name',
-                        ),  # Use the actual constraint name from the foreign key info
-                        self.local_table_name,
-                        fk.get('constrained_columns')[0],
-                        fk.get('referred_table'),
-                        fk.get('referred_columns')[0],
+                    local_table_name=local_table_name,
+                    constraint_name=constraint_name_format(
+                        self.create_constraint_name(
+                            fk.get(
+                                'name',
+                            ),  # Use the actual constraint name from the foreign key info
+                            self.local_table_name,
+                            fk.get('constrained_columns')[0],
+                            fk.get('referred_table'),
+                            fk.get('referred_columns')[0],
+                        )
                     )
                     # ,fk.get('name')  ## create function to replace none values
                     ,
-                    local_column=fk.get('constrained_columns')[0],  # This will fuck you in the end
-                    reffered_table=fk.get('referred_table'),
-                    reffered_column=fk.get('referred_columns')[0],
+                    local_column=', '.join(fk.get('constrained_columns')),
+                    reffered_table=(
+                        f"{fk['referred_schema']}.{fk['referred_table']}"
+                        if fk.get('referred_schema')
+                        else fk.get('referred_table')
+                    ),
+                    reffered_column=', '.join(fk.get('referred_columns')),
                 )
                 for fk in foreign_key_info
             ],
@@ -203,6 +286,9 @@ class CopyDDl:
         new_table_name: Optional[str] = None,
         temp_dll_output: Optional[str] = None,
         drop_primary_key: str = 'N',
+        keep_not_null: str = 'N',
+        temp_column_select: Optional[list] = None,
+        target_dialect: Optional[Dialect] = None,
     ) -> str:
         table_name = (
             self.create_table_name_format(new_table_name, new_schema_name)
@@ -217,29 +303,270 @@ class CopyDDl:
         # )
 
         table_header = ct.create_table_header.format(table_name=table_name)
-        temp_table_header = ct.create_temp_table_headers.get(temp_dll_output).format(table_name=table_name)
+        temp_table_header = get_dialect_capabilities(temp_dll_output).temp_table_header.format(table_name=table_name)
 
         gen_primary_key = self.get_primary_key_info() if drop_primary_key == 'N' else ' '
 
         table_ddl = remove_collate(
             ct.create_table.format(
                 table_header=table_header,
-                column_list=self.create_column_ddl(),
+                column_list=self.create_column_ddl(keep_not_null, target_dialect=target_dialect),
                 primary_key=self.get_primary_key_info(),
             )
         )
-        table_ddl += '\n' + self.create_foriegn_key_statements()
+        if include_fk == 'Y':
+            table_ddl += '\n' + self.create_foriegn_key_statements()
 
         temp_table_ddl = remove_collate(
             ct.create_table.format(
                 table_header=temp_table_header,
-                column_list=self.create_column_ddl(),
+                column_list=self.create_column_ddl(column_select=temp_column_select, target_dialect=target_dialect),
                 primary_key=gen_primary_key,
             )
         )
 
         return table_ddl, temp_table_ddl
 
+    def create_table_copy_ddl(
+        self,
+        new_schema_name: Optional[str] = None,
+        new_table_name: Optional[str] = None,
+        toggle_names: bool = False,
+    ) -> str:
+        """Generates the CREATE TABLE statement of a copy of the table from its full reflected definition.
+
+        Unlike `create_ddl`, column defaults, identity and autoincrement columns and CHECK constraints are kept.
+        Secondary indexes, unique constraints and foreign keys are left out, to be built on the copy afterwards
+        with `create_index_statements` and `create_foriegn_key_statements`.
+
+        Parameters
+        ----------
+        - new_schema_name (str, optional): Schema name of the copy.
+        - new_table_name (str, optional): Name of the copy.
+        - toggle_names (bool): Rename the primary key and CHECK constraints with `toggle_name_suffix`, for
+          creating the copy while the original still exists.
+
+        Returns
+        -------
+        - str: The CREATE TABLE statement, in the table's own dialect.
+        """
+        table = Table(
+            self.local_table_name,
+            MetaData(),
+            schema=self.local_schema_name,
+            autoload_with=self.db_engine,
+            resolve_fks=False,
+        )
+        table_copy = table.to_metadata(
+            MetaData(),
+            schema=new_schema_name or self.local_schema_name,
+            name=new_table_name or self.local_table_name,
+        )
+        for constraint in list(table_copy.constraints):
+            if isinstance(constraint, (ForeignKeyConstraint, UniqueConstraint)):
+                table_copy.constraints.remove(constraint)
+            elif toggle_names and constraint.name and isinstance(constraint, (PrimaryKeyConstraint, CheckConstraint)):
+                constraint.name = toggle_name_suffix(constraint.name)
+
+        if self.db_engine.dialect.name == 'sqlite':
+            # SQLite does not reflect AUTOINCREMENT, which keeps deleted keys from being reused.
+            with self.db_engine.connect() as connection:
+                table_sql = connection.execute(
+                    text(ct.sqlite_table_sql.format(schema_name=self.local_schema_name or 'main')),
+                    {'table_name': self.local_table_name},
+                ).scalar()
+            if re.search(r'\bAUTOINCREMENT\b', table_sql or '', flags=re.IGNORECASE):
+                table_copy.dialect_options['sqlite']['autoincrement'] = True
+
+        return str(CreateTable(table_copy).compile(dialect=self.db_engine.dialect)).strip()
+
+    def create_index_statements(
+        self,
+        new_schema_name: Optional[str] = None,
+        new_table_name: Optional[str] = None,
+        toggle_names: bool = False,
+        include_unique_constraints: bool = True,
+        dbms: Optional[str] = None,
+        include_unique_indexes: bool = True,
+        rename_index: Optional[Callable[[str], str]] = None,
+    ) -> list:
+        """Generates CREATE INDEX statements for the table's secondary indexes and unique constraints.
+
+        Parameters
+        ----------
+        - new_schema_name (str, optional): Schema name of the table the indexes are created on.
+        - new_table_name (str, optional): Name of the table the indexes are created on.
+        - toggle_names (bool): Rename each index with `toggle_name_suffix`, for building them on a copy of the
+          table while the original still exists.
+        - include_unique_constraints (bool): Also create unique constraints, as unique indexes.
+        - dbms (str, optional): The dialect the statements are rendered for. Defaults to the source table's.
+        - include_unique_indexes (bool): Also create the table's unique indexes.
+        - rename_index (callable, optional): Maps each index name to the name it is created under. Takes
+          precedence over `toggle_names`.
+
+        Returns
+        -------
+        - list: One CREATE INDEX statement per index. Indexes backing the primary key are not included.
+        """
+        dbms = dbms or self.db_engine.dialect.name
+        schema_name = new_schema_name or self.local_schema_name
+        if schema_name and dbms in at.create_index_in_schema:
+            create_index = at.create_index_in_schema[dbms]
+            table_name = new_table_name or self.local_table_name
+        else:
+            create_index = at.create_index
+            table_name = self.create_table_name_format(new_table_name, new_schema_name)
+        index_name_format = rename_index or (toggle_name_suffix if toggle_names else str)
+
+        return [
+            create_index.format(
+                unique='UNIQUE ' if unique else '',
+                schema_name=schema_name,
+                index_name=index_name_format(name),
+                table_name=table_name,
+                column_list=', '.join(columns),
+            )
+            for name, unique, columns in self.secondary_indexes(include_unique_constraints, include_unique_indexes)
+        ]
+
+    def secondary_indexes(self, include_unique_constraints: bool = True, include_unique_indexes: bool = True) -> list:
+        """The table's indexes other than the primary key's, and unique constraints, as `(name, unique, columns)`."""
+        indexes = [
+            (index['name'], index.get('unique', False), index.get('expressions') or index['column_names'])
+            for index in self.inspector.get_indexes(self.local_table_name, schema=self.local_schema_name)
+            if not index.get('duplicates_constraint') and (include_unique_indexes or not index.get('unique'))
+        ]
+        if include_unique_constraints:
+            indexes += [
+                (
+                    constraint['name'] or f"{self.local_table_name}_{'_'.join(constraint['column_names'])}_key",
+                    True,
+                    constraint['column_names'],
+                )
+                for constraint in self.inspector.get_unique_constraints(
+                    self.local_table_name, schema=self.local_schema_name
+                )
+            ]
+        return indexes
+
+    def referred_tables(self) -> list:
+        """The tables this table's foreign keys refer to, schema qualified when the reference names a schema."""
+        foreign_key_info = self.inspector.get_foreign_keys(self.local_table_name, schema=self.local_schema_name)
+        return [
+            f"{fk['referred_schema']}.{fk['referred_table']}" if fk.get('referred_schema') else fk['referred_table']
+            for fk in foreign_key_info
+        ]
+
+    def referencing_tables(self) -> list:
+        """The other tables, in any schema, whose foreign keys refer to this table, schema qualified."""
+        table_schema = self.local_schema_name or self.inspector.default_schema_name
+        referencing = set()
+        for schema in self.inspector.get_schema_names():
+            for (_, table_name), foreign_keys in self.inspector.get_multi_foreign_keys(schema=schema).items():
+                if schema == table_schema and table_name == self.local_table_name:
+                    continue
+                if any(
+                    fk['referred_table'] == self.local_table_name
+                    and (fk.get('referred_schema') or schema) == table_schema
+                    for fk in foreign_keys
+                ):
+                    referencing.add(f'{schema}.{table_name}')
+        return sorted(referencing)
+
+    def schema_fingerprint(self, **options) -> str:
+        """Hash the table's columns, types, primary key and foreign keys, and the DDL `options` it is rendered with."""
+        primary_key_info = self.inspector.get_pk_constraint(self.local_table_name, schema=self.local_schema_name)
+        foreign_key_info = self.inspector.get_foreign_keys(self.local_table_name, schema=self.local_schema_name)
+        return table_fingerprint(
+            self.get_table_info(),
+            primary_key_info.get('constrained_columns'),
+            foreign_key_info,
+            **options,
+        )
+
+    def export_ddl(
+        self,
+        output_path: str,
+        manifest: Optional[SchemaManifest] = None,
+        new_schema_name: Optional[str] = None,
+        new_table_name: Optional[str] = None,
+    ) -> Optional[str]:
+        """Writes the table DDL to `<output_path>/<schema>.<table>.sql` unless its schema fingerprint is unchanged.
+
+        Parameters
+        ----------
+        - output_path (str): The directory the DDL script is written to.
+        - manifest (SchemaManifest, optional): The manifest to check and update. When exporting many tables,
+          load it once with `SchemaManifest.load` and call `save()` after the loop. If omitted, the manifest in
+          `output_path` is loaded and saved by this call.
+        - new_schema_name (str, optional): Schema name to use in the generated DDL.
+        - new_table_name (str, optional): Table name to use in the generated DDL.
+
+        The script and its manifest entry are named after the table the DDL creates, so exporting under a
+        new name or schema writes a new script.
+
+        Returns
+        -------
+        - str or None: The path of the written script, or None if the table has not changed since the last export.
+        """
+        owns_manifest = manifest is None
+        if owns_manifest:
+            manifest = SchemaManifest.load(os.path.join(output_path, MANIFEST_FILE_NAME))
+
+        manifest_key = self.create_table_name_format(new_table_name, new_schema_name)
+        file_path = os.path.join(output_path, f'{manifest_key}.sql')
+        fingerprint = self.schema_fingerprint(new_schema_name=new_schema_name, new_table_name=new_table_name)
+
+        if not manifest.is_changed(manifest_key, fingerprint) and os.path.exists(file_path):
+            return None
+
+        table_ddl = self.create_ddl(new_schema_name=new_schema_name, new_table_name=new_table_name)[0]
+        os.makedirs(output_path, exist_ok=True)
+        with open(file_path, 'w') as f:
+            f.write(table_ddl)
+
+        manifest.update(manifest_key, fingerprint)
+        if owns_manifest:
+            manifest.save()
+        return file_path
+
+
+def export_schema_ddl(
+    database_url: Union[str, Engine],
+    output_path: str,
+    schema_name: Optional[str] = None,
+) -> list:
+    """Writes the DDL of every table in a schema to `output_path`, skipping the tables that have not changed.
+
+    Each table is exported with `CopyDDl.export_ddl` against one manifest. Tables exported before that no
+    longer exist are removed from the manifest, and their scripts deleted.
+
+    Parameters
+    ----------
+    - database_url (str or Engine): The database.
+    - output_path (str): The directory the DDL scripts are written to.
+    - schema_name (str, optional): The schema to export. Defaults to the default schema.
+
+    Returns
+    -------
+    - list: The paths of the scripts written by this call.
+    """
+    manifest = SchemaManifest.load(os.path.join(output_path, MANIFEST_FILE_NAME))
+    exported, written = [], []
+    for table_name in inspect(resolve_engine(database_url)).get_table_names(schema=schema_name):
+        copy_ddl = CopyDDl(database_url, table_name, schema_name)
+        exported.append(copy_ddl.create_table_name_format(None, None))
+        file_path = copy_ddl.export_ddl(output_path, manifest)
+        if file_path is not None:
+            written.append(file_path)
+
+    for table_name in manifest.prune(exported):
+        stale_path = os.path.join(output_path, f'{table_name}.sql')
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+    manifest.save()
+    return written
+
 
 # def replace_table_name():
 
@@ -1,5 +1,6 @@
 import re
 from typing import (
+    Dict,
     List,
     Optional,
     Tuple,
@@ -7,14 +8,18 @@ from typing import (
 )
 
 from sqlalchemy import (
-    create_engine,
+    Connection,
+    Engine,
     inspect,
     text,
 )
-from sqlalchemy.orm import (
-    Session,
-    sessionmaker,
+from sqlalchemy.orm import Session
+
+from keepitsql.core.engine_registry import (
+    get_engine,
+    resolve_engine,
 )
+from keepitsql.core.executor import connection_scope
 
 from keepitsql.sql_models.information_schema import (
     bigquery_query,
@@ -25,6 +30,7 @@ from keepitsql.sql_models.information_schema import (
     oracle_query,
     postgresql_query,
     redshift_query,
+    schema_column_queries,
     snowflake_query,
     sqlite_query,
     teradata_query,
@@ -131,9 +137,7 @@ def get_table_column_info(
 
     # Check if db_resource is a connection string or an existing session
     if isinstance(db_resource, str):
-        engine = create_engine(db_resource)
-        SessionLocal = sessionmaker(bind=engine)
-        session = SessionLocal()
+        session = Session(bind=get_engine(db_resource))
         session_provided = False
     else:
         session = db_resource
@@ -182,6 +186,81 @@ def get_table_column_info(
     return auto_increment_columns, primary_key_columns
 
 
+def reflect_schema_column_info(connection: Connection, schema_name: Optional[str] = None) -> Dict[str, tuple]:
+    """
+    `get_schema_column_info` through SQLAlchemy's multi-table reflection, for dialects without a catalog query.
+
+    Dialects that implement batch reflection answer each of the two lookups with one query as well.
+    """
+    inspector = inspect(connection)
+    columns = inspector.get_multi_columns(schema=schema_name)
+    primary_keys = inspector.get_multi_pk_constraint(schema=schema_name)
+
+    return {
+        table_name: (
+            [
+                column['name']
+                for column in table_columns
+                if column.get('identity') or column.get('autoincrement') is True
+            ],
+            list(primary_keys.get((schema, table_name), {}).get('constrained_columns') or []),
+        )
+        for (schema, table_name), table_columns in columns.items()
+    }
+
+
+def get_schema_column_info(
+    db_resource: Union[str, Engine, Connection, Session], schema_name: Optional[str] = None
+) -> Dict[str, Tuple[List[str], List[str]]]:
+    """
+    Find the auto-increment and primary key columns of every table in a schema with a single catalog query.
+
+    This is the schema-wide counterpart of `get_table_column_info`, for looking up many tables at once. On
+    SQLite the columns come from `pragma_table_xinfo`, and a column is auto-increment when it is declared
+    `INTEGER PRIMARY KEY AUTOINCREMENT`. Dialects without a catalog query in
+    `keepitsql.sql_models.information_schema.schema_column_queries` use `reflect_schema_column_info`.
+
+    Args:
+        db_resource (str | Engine | Connection | Session): A database URL, or something connected to the database.
+        schema_name (str, optional): The schema (on SQLite, the attached database). Defaults to the current one.
+
+    Returns:
+        Dict[str, Tuple[List[str], List[str]]]: `{table_name: (auto_increment_columns, primary_key_columns)}`.
+                                                Primary key columns are in key order.
+
+    Raises:
+        ValueError: On SQLite, if `schema_name` is not a plain identifier.
+    """
+    if isinstance(db_resource, Session):
+        db_resource = db_resource.connection()
+
+    with connection_scope(resolve_engine(db_resource)) as connection:
+        dialect = connection.dialect.name
+        if dialect not in schema_column_queries:
+            return reflect_schema_column_info(connection, schema_name)
+
+        query = schema_column_queries[dialect]
+        if dialect == 'sqlite':
+            schema_name = schema_name or 'main'
+            if not schema_name.isidentifier():
+                raise ValueError(f"Invalid SQLite schema name: {schema_name}")
+            query = query.format(schema_name=schema_name)
+        rows = connection.execute(text(query), {'schema_name': schema_name}).mappings().all()
+
+    tables: Dict[str, Tuple[List[str], List[str]]] = {}
+    key_positions: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        auto_increment_columns, _ = tables.setdefault(row['table_name'], ([], []))
+        if row['is_identity']:
+            auto_increment_columns.append(row['column_name'])
+        if row['is_primary_key']:
+            key_positions.setdefault(row['table_name'], {})[row['column_name']] = row['key_position'] or 0
+
+    for table_name, positions in key_positions.items():
+        tables[table_name][1].extend(sorted(positions, key=positions.get))
+    return tables
+
+
 # Example usage:
 # connection_string = "sqlite:////Users/themobilescientist/Documents/projects/archive/keepitsql/test.db"
 # table_name = 'human'
@@ -1,3 +1,38 @@
 from __future__ import annotations
 
 foreign_key_contraints = '''ALTER TABLE {local_table_name} ADD CONSTRAINT {constraint_name} \nFOREIGN KEY ({local_column}) REFERENCES {reffered_table} ({reffered_column}); '''
+
+create_index = 'CREATE {unique}INDEX {index_name} ON {table_name} ({column_list})'
+
+# SQLite names the schema (attached database) on the index, and the table it indexes unqualified.
+create_index_in_schema = {
+    'sqlite': 'CREATE {unique}INDEX {schema_name}.{index_name} ON {table_name} ({column_list})',
+}
+
+# Where index names are unique per schema the name is schema qualified instead of naming the table.
+drop_index = {
+    'default': 'DROP INDEX {index_name}',
+    'mssql': 'DROP INDEX {index_name} ON {table_name}',
+    'mysql': 'DROP INDEX {index_name} ON {table_name}',
+    'mariadb': 'DROP INDEX {index_name} ON {table_name}',
+}
+
+drop_foreign_key = {
+    'default': 'ALTER TABLE {table_name} DROP CONSTRAINT {constraint_name}',
+    'mysql': 'ALTER TABLE {table_name} DROP FOREIGN KEY {constraint_name}',
+    'mariadb': 'ALTER TABLE {table_name} DROP FOREIGN KEY {constraint_name}',
+}
+
+drop_table = 'DROP TABLE {table_name}'
+
+# The new name is given without a schema; the table stays in its schema.
+rename_table = {
+    'default': 'ALTER TABLE {table_name} RENAME TO {new_table_name}',
+    'mssql': "EXEC sp_rename '{table_name}', '{new_table_name}'",
+}
+
+# Dialects that can exchange two tables in a single atomic statement.
+swap_tables = {
+    'mysql': 'RENAME TABLE {table_name} TO {old_table_name}, {shadow_table_name} TO {table_name}',
+    'mariadb': 'RENAME TABLE {table_name} TO {old_table_name}, {shadow_table_name} TO {table_name}',
+}
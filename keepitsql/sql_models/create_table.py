@@ -21,4 +21,8 @@ create_table_header = 'CREATE TABLE {table_name}'
 
 create_column_constraint = '{referred_table_name}_{referred_column_name}_{local_table_name}_{local_column_name}_fk'
 create_tbl_column = '{column_name} {column_type}'
+not_null = ' NOT NULL'
 create_table = '''{table_header} (\n{column_list} \n{primary_key});'''
+
+# The CREATE TABLE statement SQLite keeps for a table, e.g. to see whether its key is AUTOINCREMENT.
+sqlite_table_sql = "SELECT sql FROM {schema_name}.sqlite_master WHERE type = 'table' AND name = :table_name"
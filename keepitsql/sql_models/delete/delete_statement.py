@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+target_match_condition = 'SOURCE.{source_column} = {target_table}.{target_column}'
+scope_condition = '{table_alias}.{column} = :{parameter}'
+
+delete_not_in_source = '''
+DELETE FROM {target_table}
+WHERE {scope_conditions}NOT EXISTS (
+    SELECT 1
+    FROM {source_table} SOURCE
+    WHERE {match_conditions}
+)
+'''
+
+delete_by_key = '''
+DELETE FROM {target_table}
+WHERE {key_conditions}
+'''
@@ -84,3 +84,126 @@ bigquery_query = """
     FROM INFORMATION_SCHEMA.COLUMNS 
     WHERE table_name = :table_name AND table_schema = COALESCE(:schema_name, 'default')
 """
+
+# Identity and primary key columns of every table in a schema, one row per column:
+# table_name, column_name, is_identity (1/0), is_primary_key (1/0), key_position.
+postgresql_schema_query = """
+    SELECT
+        c.table_name AS table_name,
+        c.column_name AS column_name,
+        CASE WHEN c.is_identity = 'YES' OR c.column_default LIKE 'nextval(%' THEN 1 ELSE 0 END AS is_identity,
+        CASE WHEN k.column_name IS NULL THEN 0 ELSE 1 END AS is_primary_key,
+        k.ordinal_position AS key_position
+    FROM information_schema.columns c
+    LEFT JOIN information_schema.table_constraints p
+        ON p.table_schema = c.table_schema AND p.table_name = c.table_name AND p.constraint_type = 'PRIMARY KEY'
+    LEFT JOIN information_schema.key_column_usage k
+        ON k.constraint_schema = p.constraint_schema AND k.constraint_name = p.constraint_name
+        AND k.table_name = c.table_name AND k.column_name = c.column_name
+    WHERE c.table_schema = COALESCE(:schema_name, 'public')
+    ORDER BY c.table_name, c.ordinal_position
+"""
+
+redshift_schema_query = """
+    SELECT
+        c.table_name AS table_name,
+        c.column_name AS column_name,
+        CASE WHEN c.column_default LIKE '%nextval%' OR c.column_default LIKE '%identity%'
+            THEN 1 ELSE 0 END AS is_identity,
+        CASE WHEN k.column_name IS NULL THEN 0 ELSE 1 END AS is_primary_key,
+        k.ordinal_position AS key_position
+    FROM information_schema.columns c
+    LEFT JOIN information_schema.table_constraints p
+        ON p.table_schema = c.table_schema AND p.table_name = c.table_name AND p.constraint_type = 'PRIMARY KEY'
+    LEFT JOIN information_schema.key_column_usage k
+        ON k.constraint_schema = p.constraint_schema AND k.constraint_name = p.constraint_name
+        AND k.table_name = c.table_name AND k.column_name = c.column_name
+    WHERE c.table_schema = COALESCE(:schema_name, 'public')
+    ORDER BY c.table_name, c.ordinal_position
+"""
+
+mysql_schema_query = """
+    SELECT
+        c.table_name AS table_name,
+        c.column_name AS column_name,
+        CASE WHEN c.extra LIKE '%auto_increment%' THEN 1 ELSE 0 END AS is_identity,
+        CASE WHEN k.column_name IS NULL THEN 0 ELSE 1 END AS is_primary_key,
+        k.ordinal_position AS key_position
+    FROM information_schema.columns c
+    LEFT JOIN information_schema.key_column_usage k
+        ON k.table_schema = c.table_schema AND k.table_name = c.table_name
+        AND k.column_name = c.column_name AND k.constraint_name = 'PRIMARY'
+    WHERE c.table_schema = COALESCE(:schema_name, database())
+    ORDER BY c.table_name, c.ordinal_position
+"""
+
+mssql_schema_query = """
+    SELECT
+        t.name AS table_name,
+        c.name AS column_name,
+        CAST(c.is_identity AS INT) AS is_identity,
+        CASE WHEN ic.column_id IS NULL THEN 0 ELSE 1 END AS is_primary_key,
+        ic.key_ordinal AS key_position
+    FROM sys.columns c
+    INNER JOIN sys.tables t ON t.object_id = c.object_id
+    LEFT JOIN sys.indexes i ON i.object_id = t.object_id AND i.is_primary_key = 1
+    LEFT JOIN sys.index_columns ic
+        ON ic.object_id = i.object_id AND ic.index_id = i.index_id AND ic.column_id = c.column_id
+    WHERE SCHEMA_NAME(t.schema_id) = COALESCE(:schema_name, SCHEMA_NAME())
+    ORDER BY t.name, c.column_id
+"""
+
+oracle_schema_query = """
+    SELECT
+        c.table_name AS table_name,
+        c.column_name AS column_name,
+        CASE WHEN c.identity_column = 'YES' THEN 1 ELSE 0 END AS is_identity,
+        CASE WHEN k.column_name IS NULL THEN 0 ELSE 1 END AS is_primary_key,
+        k.position AS key_position
+    FROM all_tab_columns c
+    LEFT JOIN all_constraints p
+        ON p.owner = c.owner AND p.table_name = c.table_name AND p.constraint_type = 'P'
+    LEFT JOIN all_cons_columns k
+        ON k.owner = p.owner AND k.constraint_name = p.constraint_name AND k.column_name = c.column_name
+    WHERE c.owner = COALESCE(:schema_name, USER)
+    ORDER BY c.table_name, c.column_id
+"""
+
+db2_schema_query = """
+    SELECT
+        c.tabname AS table_name,
+        c.colname AS column_name,
+        CASE WHEN c.identity = 'Y' THEN 1 ELSE 0 END AS is_identity,
+        CASE WHEN c.keyseq IS NULL THEN 0 ELSE 1 END AS is_primary_key,
+        c.keyseq AS key_position
+    FROM syscat.columns c
+    WHERE c.tabschema = COALESCE(:schema_name, CURRENT SCHEMA)
+    ORDER BY c.tabname, c.colno
+"""
+
+# `pk` is the column's 1-based position in the primary key, 0 if it is not part of it. SQLite only allows
+# AUTOINCREMENT on an INTEGER PRIMARY KEY, so a table using it has exactly one such column.
+sqlite_schema_query = """
+    SELECT
+        m.name AS table_name,
+        c.name AS column_name,
+        CASE WHEN c.pk = 1 AND upper(c.type) = 'INTEGER' AND upper(m.sql) LIKE '%AUTOINCREMENT%'
+            THEN 1 ELSE 0 END AS is_identity,
+        CASE WHEN c.pk > 0 THEN 1 ELSE 0 END AS is_primary_key,
+        NULLIF(c.pk, 0) AS key_position
+    FROM {schema_name}.sqlite_master m
+    INNER JOIN pragma_table_xinfo(m.name, :schema_name) c
+    WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+    ORDER BY m.name, c.cid
+"""
+
+schema_column_queries = {
+    'postgresql': postgresql_schema_query,
+    'redshift': redshift_schema_query,
+    'mysql': mysql_schema_query,
+    'mariadb': mysql_schema_query,
+    'mssql': mssql_schema_query,
+    'oracle': oracle_schema_query,
+    'db2': db2_schema_query,
+    'sqlite': sqlite_schema_query,
+}
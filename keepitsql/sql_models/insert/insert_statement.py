@@ -21,6 +21,27 @@ SELECT
 FROM {source_table}
 '''
 
+
+multi_row_insert = '''
+INSERT INTO {table_name} (
+    {column_names}
+)
+VALUES
+{value_rows};
+'''
+
+value_row = '    ({row_values})'
+values_bind = ':{column}_{row}'
+
+multi_row_parameter_insert = '''
+INSERT INTO {table_name} (
+    {column_names}
+)
+VALUES
+{value_rows}
+'''
+
+
 # standard_insert = '''
 # INSERT INTO {table_name} (
 #  {column_names}
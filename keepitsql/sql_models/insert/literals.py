@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+null_literal = 'NULL'
+
+string_literal = "'{value}'"
+
+# Replacements applied, in order, to text inside a string literal. MySQL and MariaDB also read backslashes
+# as escape characters.
+string_escapes = {
+    'default': (("'", "''"),),
+    'mysql': (('\\', '\\\\'), ("'", "''")),
+    'mariadb': (('\\', '\\\\'), ("'", "''")),
+}
+
+boolean_literals = {
+    'default': ('TRUE', 'FALSE'),
+    'mssql': ('1', '0'),
+    'oracle': ('1', '0'),
+    'db2': ('1', '0'),
+    'sqlite': ('1', '0'),
+}
+
+date_literals = {
+    'default': "'{value}'",
+    'oracle': "DATE '{value}'",
+}
+
+timestamp_literals = {
+    'default': "'{value}'",
+    'oracle': "TIMESTAMP '{value}'",
+}
+
+binary_literals = {
+    'default': "X'{value}'",
+    'postgresql': "'\\x{value}'::bytea",
+    'mssql': '0x{value}',
+    'oracle': "HEXTORAW('{value}')",
+    'db2': "BX'{value}'",
+}
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+keyset_page = '''{select_statement}
+WHERE {where_clause}
+ORDER BY {order_by}
+{limit_clause}'''
+
+keyset_page_unfiltered = '''{select_statement}
+ORDER BY {order_by}
+{limit_clause}'''
+
+limit_clauses = {
+    "default": "LIMIT {page_size}",
+    "mssql": "OFFSET 0 ROWS FETCH NEXT {page_size} ROWS ONLY",
+    "oracle": "FETCH FIRST {page_size} ROWS ONLY",
+    "db2": "FETCH FIRST {page_size} ROWS ONLY",
+}
+
+keyset_column_after = '{column} > :{parameter}'
+keyset_column_equal = '{column} = :{parameter}'
+range_lower_bound = '{column} >= :{parameter}'
+range_upper_bound = '{column} < :{parameter}'
+range_upper_bound_inclusive = '{column} <= :{parameter}'
+
+key_range = '''SELECT MIN({column}) AS lower_bound, MAX({column}) AS upper_bound FROM {table_name}'''
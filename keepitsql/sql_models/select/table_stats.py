@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+# Row count estimates from catalog statistics. They return NULL (or no row) when the table was never analyzed.
+row_estimates = {
+    'default': 'SELECT COUNT(*) FROM {table_name}',
+    'postgresql': '''SELECT CASE WHEN reltuples < 0 THEN NULL ELSE CAST(reltuples AS BIGINT) END
+FROM pg_class
+WHERE oid = to_regclass(:table_name)''',
+    'mssql': '''SELECT SUM(row_count)
+FROM sys.dm_db_partition_stats
+WHERE object_id = OBJECT_ID(:table_name) AND index_id IN (0, 1)''',
+    'mysql': '''SELECT table_rows
+FROM information_schema.tables
+WHERE table_schema = COALESCE(:schema_name, DATABASE()) AND table_name = :local_table_name''',
+    'mariadb': '''SELECT table_rows
+FROM information_schema.tables
+WHERE table_schema = COALESCE(:schema_name, DATABASE()) AND table_name = :local_table_name''',
+    'oracle': '''SELECT num_rows
+FROM all_tables
+WHERE owner = COALESCE(:schema_name, USER) AND table_name = :local_table_name''',
+    'db2': '''SELECT NULLIF(card, -1)
+FROM syscat.tables
+WHERE tabschema = COALESCE(:schema_name, CURRENT SCHEMA) AND tabname = :local_table_name''',
+    'snowflake': '''SELECT row_count
+FROM information_schema.tables
+WHERE table_schema = COALESCE(:schema_name, CURRENT_SCHEMA()) AND table_name = :local_table_name''',
+}
+
+exact_row_count = 'SELECT COUNT(*) FROM {table_name}'
+
+count_existing_keys = '''SELECT COUNT(*)
+FROM {table_name}
+WHERE {key_conditions}'''
+
+key_match = '({conditions})'
+key_column_match = '{column} = :{parameter}'
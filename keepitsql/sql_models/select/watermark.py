@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+watermark_extract = '''{select_statement}
+WHERE {column} >= :watermark
+ORDER BY {column};'''
+
+create_watermark_table = '''CREATE TABLE {table_name} (
+    target_name VARCHAR(255) NOT NULL,
+    watermark_column VARCHAR(255) NOT NULL,
+    watermark_value VARCHAR(64) NOT NULL,
+    value_type VARCHAR(16) NOT NULL,
+    PRIMARY KEY (target_name)
+)'''
+
+select_watermark = (
+    '''SELECT watermark_column, watermark_value, value_type FROM {table_name} WHERE target_name = :target_name'''
+)
+
+delete_watermark = '''DELETE FROM {table_name} WHERE target_name = :target_name'''
+
+insert_watermark = '''INSERT INTO {table_name} (target_name, watermark_column, watermark_value, value_type)
+VALUES (:target_name, :watermark_column, :watermark_value, :value_type)'''
@@ -7,7 +7,7 @@ insert_on_conflict = '''
 {insert_statment}
 ON CONFLICT ({match_condition})
 DO UPDATE SET
-{update_list}
+{update_list}{update_guard}
 '''
 
 insert_on_conflict_sqlite = '''
@@ -15,5 +15,21 @@ insert_on_conflict_sqlite = '''
 WHERE true
 ON CONFLICT ({match_condition})
 DO UPDATE SET
+{update_list}{update_guard}
+'''
+
+# Null-safe "value changed" comparisons between the existing row and the proposed one.
+distinct_conditions = {
+    'default': '{target_table}.{column} IS DISTINCT FROM EXCLUDED.{column}',
+    'sqlite': '{target_table}.{column} IS NOT EXCLUDED.{column}',
+}
+update_guard = '''
+WHERE {conditions}'''
+
+update_list_duplicate_key = '{column} = VALUES({column})'
+
+insert_on_duplicate_key = '''
+{insert_statment}
+ON DUPLICATE KEY UPDATE
 {update_list}
 '''
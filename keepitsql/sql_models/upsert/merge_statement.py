@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 merge_condition = 'SOURCE.{source_column} = TARGET.{target_column}'
-when_matched_condition = 'TARGET.{target_column} <> SOURCE.{source_column}'
+# Null-safe: a plain `<>` is unknown when either side is NULL, so NULLs set or cleared would not be written.
+when_matched_condition = (
+    '(TARGET.{target_column} <> SOURCE.{source_column}'
+    ' OR (TARGET.{target_column} IS NULL AND SOURCE.{source_column} IS NOT NULL)'
+    ' OR (TARGET.{target_column} IS NOT NULL AND SOURCE.{source_column} IS NULL))'
+)
 update_list = ' {target_column} = SOURCE.{source_column}'
 merge_insert = 'SOURCE.{source_column}'
 merge_insert_columns = '{source_column}'
 
 merge_statement = '''
 MERGE INTO {target_table} AS TARGET
-USING {source_table} AS SOURCE
+USING {source_table} AS SOURCE{source_columns}
 
 ON {merge_join_conditions}
 
@@ -24,5 +29,16 @@ INSERT(
 )
 VALUES(
 {merge_insert_value}
-);
+){delete_clause};
 '''
+
+values_source = '''(
+VALUES
+{value_rows}
+)'''
+source_column_list = ' ({column_names})'
+
+merge_delete_clause = '''
+
+WHEN NOT MATCHED BY SOURCE{scope_conditions} THEN
+DELETE'''
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import (
+    create_engine,
+    inspect,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from keepitsql.core.clone_table import clone_table
+from keepitsql.gen_ddl import CopyDDl
+
+ROWS = 2_500
+
+
+class TestCloneTable(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'source.db')}")
+        self.target = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'target.db')}")
+        with self.source.begin() as connection:
+            connection.execute(text('CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT NOT NULL, amount REAL)'))
+            connection.execute(text('CREATE INDEX events_kind ON events (kind)'))
+            connection.execute(text('CREATE TABLE log (message TEXT)'))
+            connection.execute(
+                text('INSERT INTO events VALUES (:id, :kind, :amount)'),
+                [{'id': i, 'kind': f'kind_{i % 7}', 'amount': i / 4 if i % 5 else None} for i in range(ROWS)],
+            )
+            connection.execute(text("INSERT INTO log VALUES ('started'), ('done')"))
+
+    def tearDown(self):
+        self.source.dispose()
+        self.target.dispose()
+        self.directory.cleanup()
+
+    def rows(self, engine, table_name):
+        with engine.connect() as connection:
+            return connection.execute(text(f'SELECT * FROM {table_name} ORDER BY 1')).all()
+
+    def test_clone_streams_every_chunk(self):
+        result = clone_table(self.source, self.target, 'events', chunk_size=100, prefetch_chunks=1)
+
+        self.assertEqual(result.rows_loaded, ROWS)
+        self.assertEqual(result.commits, ROWS // 100)
+        self.assertEqual(self.rows(self.target, 'events'), self.rows(self.source, 'events'))
+        self.assertEqual([index['name'] for index in inspect(self.target).get_indexes('events')], ['events_kind'])
+        self.assertEqual(inspect(self.target).get_pk_constraint('events')['constrained_columns'], ['id'])
+
+    def test_table_without_primary_key(self):
+        clone_table(self.source, self.target, 'log', target_table_name='log_copy')
+        self.assertEqual(self.rows(self.target, 'log_copy'), self.rows(self.source, 'log'))
+
+    def test_clone_next_to_its_source(self):
+        result = clone_table(self.source, self.source, 'events', target_table_name='events_copy')
+
+        self.assertEqual(result.rows_loaded, ROWS)
+        self.assertEqual(
+            [index['name'] for index in inspect(self.source).get_indexes('events_copy')], ['events_copy_kind']
+        )
+        self.assertEqual([index['name'] for index in inspect(self.source).get_indexes('events')], ['events_kind'])
+
+    def test_if_exists(self):
+        clone_table(self.source, self.target, 'log')
+        with self.assertRaises(ValueError):
+            clone_table(self.source, self.target, 'log')
+        clone_table(self.source, self.target, 'log', if_exists='append')
+        self.assertEqual(len(self.rows(self.target, 'log')), 4)
+        clone_table(self.source, self.target, 'log', if_exists='replace')
+        self.assertEqual(len(self.rows(self.target, 'log')), 2)
+
+    def test_write_failure_stops_the_reader(self):
+        clone_table(self.source, self.target, 'events')
+        with self.assertRaises(IntegrityError):
+            clone_table(self.source, self.target, 'events', if_exists='append', chunk_size=100, prefetch_chunks=1)
+
+    def test_ddl_for_another_dialect(self):
+        with self.source.begin() as connection:
+            connection.execute(text('CREATE TABLE files (id INTEGER PRIMARY KEY, saved DATETIME NOT NULL, body BLOB)'))
+
+        table_ddl, _ = CopyDDl(self.source, 'files').create_ddl(
+            include_fk='N', keep_not_null='Y', target_dialect=postgresql.dialect()
+        )
+        self.assertIn('saved TIMESTAMP WITHOUT TIME ZONE NOT NULL', table_ddl)
+        self.assertIn('body BYTEA', table_ddl)
+        self.assertIn(
+            'saved DATETIME NOT NULL', CopyDDl(self.source, 'files').create_ddl(include_fk='N', keep_not_null='Y')[0]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
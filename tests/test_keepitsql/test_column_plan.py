@@ -0,0 +1,50 @@
+import unittest
+
+import polars as pl
+
+from keepitsql.core.column_plan import (
+    build_column_plan,
+    get_column_plan,
+    project_columns,
+)
+
+
+class TestColumnPlan(unittest.TestCase):
+    def setUp(self):
+        self.test_df = pl.DataFrame({'Id': [1, 2], 'Name': ['Alice', 'Bob'], 'City': ['Austin', 'Boston']})
+
+    def test_key_and_insert_splits(self):
+        plan = get_column_plan(self.test_df, ['Id'], ['Id'])
+        self.assertEqual(plan.columns, ('Id', 'Name', 'City'))
+        self.assertEqual(plan.match_columns, ('Id',))
+        self.assertEqual(plan.update_columns, ('Name', 'City'))
+        self.assertEqual(plan.insert_columns, ('Name', 'City'))
+
+    def test_update_split_is_case_insensitive(self):
+        plan = build_column_plan(('Id', 'NAME', 'City'), ('NAME',))
+        self.assertEqual(plan.update_columns, ('Id', 'City'))
+
+    def test_plan_is_cached_per_schema(self):
+        self.assertIs(get_column_plan(self.test_df, ['Id']), get_column_plan(self.test_df.clone(), ['Id']))
+
+    def test_unknown_match_column(self):
+        with self.assertRaises(ValueError):
+            get_column_plan(self.test_df, ['Missing'])
+
+    def test_unknown_constraint_column(self):
+        with self.assertRaises(ValueError):
+            get_column_plan(self.test_df, ['Id'], ['Missing'])
+
+    def test_column_select_keeps_match_columns_in_dataframe_order(self):
+        plan = get_column_plan(self.test_df, ['Id'], ['Id', 'Name'], column_select=['City'])
+        self.assertEqual(plan.columns, ('Id', 'City'))
+        self.assertEqual(plan.update_columns, ('City',))
+        self.assertEqual(plan.insert_columns, ('City',))
+
+    def test_unknown_column_select(self):
+        with self.assertRaises(ValueError):
+            project_columns(self.test_df.columns, ['Missing'])
+
+
+if __name__ == '__main__':
+    unittest.main()
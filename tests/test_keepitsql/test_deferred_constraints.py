@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import polars as pl
+from sqlalchemy import (
+    create_engine,
+    event,
+    inspect,
+    text,
+)
+from sqlalchemy.exc import IntegrityError
+
+from keepitsql.core.deferred_constraints import (
+    DeferredConstraints,
+    deferred_constraints,
+    drop_statements,
+    plan_deferred_constraints,
+    restore_constraints,
+)
+from keepitsql.core.dialect_capabilities import get_dialect_capabilities
+from keepitsql.core.from_dataframe import FromDataframe
+
+
+class TestDeferredConstraints(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'facts.db')}")
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE facts (id INTEGER PRIMARY KEY, code TEXT, amount REAL)'))
+            connection.execute(text('CREATE INDEX facts_amount ON facts (amount)'))
+            connection.execute(text('CREATE UNIQUE INDEX facts_code ON facts (code)'))
+        self.frame = pl.DataFrame({'id': [1, 2, 3], 'code': ['a', 'b', 'c'], 'amount': [1.0, 2.0, 3.0]})
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def index_names(self):
+        return sorted(index['name'] for index in inspect(self.engine).get_indexes('facts'))
+
+    def test_indexes_are_dropped_for_the_load_and_rebuilt(self):
+        with deferred_constraints(self.engine, 'facts') as deferred:
+            self.assertEqual(self.index_names(), ['facts_code'])
+            FromDataframe(self.frame).load_insert(self.engine, 'facts')
+
+        self.assertEqual(deferred.index_statements, ('CREATE INDEX facts_amount ON facts (amount)',))
+        self.assertEqual(deferred.foreign_key_statements, ())
+        self.assertEqual(self.index_names(), ['facts_amount', 'facts_code'])
+
+    def test_indexes_are_rebuilt_when_the_load_fails(self):
+        with self.assertRaises(RuntimeError):
+            with deferred_constraints(self.engine, 'facts'):
+                raise RuntimeError('load failed')
+        self.assertEqual(self.index_names(), ['facts_amount', 'facts_code'])
+
+    def test_unique_indexes_still_reject_duplicates(self):
+        duplicates = self.frame.with_columns(pl.lit('same').alias('code'))
+        with self.assertRaises(IntegrityError):
+            with deferred_constraints(self.engine, 'facts'):
+                FromDataframe(duplicates).load_insert(self.engine, 'facts')
+        self.assertEqual(self.index_names(), ['facts_amount', 'facts_code'])
+
+    def test_failed_rebuild_still_builds_other_indexes(self):
+        duplicates = self.frame.with_columns(pl.lit('same').alias('code'))
+        with self.assertRaises(IntegrityError):
+            with deferred_constraints(self.engine, 'facts', unique_indexes=True) as deferred:
+                self.assertEqual(self.index_names(), [])
+                FromDataframe(duplicates).load_insert(self.engine, 'facts')
+        self.assertEqual(len(deferred.index_statements), 2)
+        self.assertEqual(self.index_names(), ['facts_amount'])
+
+    def test_failed_foreign_key_does_not_mask_other_errors(self):
+        deferred = DeferredConstraints(
+            table_name='facts',
+            index_statements=('CREATE INDEX facts_bad ON missing (amount)', 'CREATE INDEX facts_id ON facts (id)'),
+            foreign_key_statements=('ALTER TABLE nowhere ADD CONSTRAINT fk FOREIGN KEY (id) REFERENCES x (id)',),
+        )
+        with self.assertRaisesRegex(Exception, 'missing'):
+            restore_constraints(self.engine, deferred)
+        self.assertIn('facts_id', self.index_names())
+
+    def test_drop_statements(self):
+        self.assertEqual(
+            drop_statements('postgresql', 'sales', 'facts', ['facts_amount'], ['facts_customer_fk']),
+            ['ALTER TABLE sales.facts DROP CONSTRAINT facts_customer_fk', 'DROP INDEX sales.facts_amount'],
+        )
+        self.assertEqual(
+            drop_statements('mysql', None, 'facts', ['facts_amount'], ['facts_customer_fk']),
+            ['ALTER TABLE facts DROP FOREIGN KEY facts_customer_fk', 'DROP INDEX facts_amount ON facts'],
+        )
+
+
+class TestDeferredConstraintsInSchema(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        sales_path = os.path.join(self.directory.name, 'sales.db')
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'main.db')}")
+
+        @event.listens_for(self.engine, 'connect')
+        def attach_sales(dbapi_connection, _):
+            dbapi_connection.execute(f"ATTACH DATABASE '{sales_path}' AS sales")
+
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE sales.customers (id INTEGER PRIMARY KEY)'))
+            connection.execute(
+                text(
+                    'CREATE TABLE sales.orders (id INTEGER PRIMARY KEY, amount REAL, customer_id INTEGER,'
+                    ' CONSTRAINT orders_customer_fk FOREIGN KEY (customer_id) REFERENCES customers (id))'
+                )
+            )
+            connection.execute(text('CREATE INDEX sales.orders_amount ON orders (amount)'))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_indexes_are_rebuilt_in_the_schema(self):
+        with deferred_constraints(self.engine, 'sales.orders') as deferred:
+            self.assertEqual(inspect(self.engine).get_indexes('orders', schema='sales'), [])
+            FromDataframe(pl.DataFrame({'id': [1, 2], 'amount': [1.0, 2.0]})).load_insert(self.engine, 'sales.orders')
+
+        self.assertEqual(deferred.index_statements, ('CREATE INDEX sales.orders_amount ON orders (amount)',))
+        self.assertEqual(
+            [index['name'] for index in inspect(self.engine).get_indexes('orders', schema='sales')], ['orders_amount']
+        )
+
+    def test_foreign_keys_are_restored_on_the_schema_qualified_table(self):
+        capabilities = get_dialect_capabilities('postgresql')
+        with mock.patch('keepitsql.core.deferred_constraints.get_dialect_capabilities', return_value=capabilities):
+            deferred = plan_deferred_constraints(self.engine, 'sales.orders')
+
+        self.assertIn('ALTER TABLE sales.orders DROP CONSTRAINT orders_customer_fk', deferred.drop_statements)
+        self.assertEqual(len(deferred.foreign_key_statements), 1)
+        self.assertTrue(deferred.foreign_key_statements[0].startswith('ALTER TABLE sales.orders ADD CONSTRAINT'))
+
+
+if __name__ == '__main__':
+    unittest.main()
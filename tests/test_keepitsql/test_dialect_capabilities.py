@@ -0,0 +1,54 @@
+import unittest
+
+import polars as pl
+
+from keepitsql.core.dialect_capabilities import (
+    MERGE,
+    ON_CONFLICT,
+    DialectCapabilities,
+    get_dialect_capabilities,
+    register_dialect_capabilities,
+    sqlite_max_bind_params,
+)
+from keepitsql.core.from_dataframe import FromDataframe
+
+
+class TestDialectCapabilities(unittest.TestCase):
+    def test_known_dialects(self):
+        self.assertEqual(get_dialect_capabilities('postgresql').upsert_type, ON_CONFLICT)
+        self.assertEqual(get_dialect_capabilities('mssql').upsert_type, MERGE)
+        self.assertEqual(get_dialect_capabilities('mssql').temp_table_name('users_stage'), '##users_stage')
+
+    def test_unknown_dialect_is_conservative(self):
+        capabilities = get_dialect_capabilities('somedb')
+        self.assertEqual(capabilities.name, 'somedb')
+        self.assertEqual(capabilities.max_bind_params, 999)
+        self.assertEqual(capabilities.rows_per_statement(10), 1)
+
+    def test_sqlite_bind_limit_follows_library_version(self):
+        self.assertEqual(sqlite_max_bind_params((3, 31, 1)), 999)
+        self.assertEqual(sqlite_max_bind_params((3, 32, 0)), 32766)
+        self.assertEqual(get_dialect_capabilities('sqlite').max_bind_params, sqlite_max_bind_params())
+
+    def test_batch_sizes_follow_limits(self):
+        mssql = get_dialect_capabilities('mssql')
+        self.assertEqual(mssql.rows_per_statement(3), 699)
+        self.assertEqual(mssql.rows_per_statement(1), 1000)
+        self.assertEqual(get_dialect_capabilities('sqlite').chunk_size(4), 50_000)
+        self.assertEqual(get_dialect_capabilities('sqlite').chunk_size(500_000), 1)
+
+    def test_register_custom_dialect(self):
+        register_dialect_capabilities(DialectCapabilities(name='customdb', upsert_type=ON_CONFLICT))
+        self.assertEqual(get_dialect_capabilities('customdb').upsert_type, ON_CONFLICT)
+
+    def test_upsert_statement_follows_dialect(self):
+        generator = FromDataframe(pl.DataFrame({'id': [1], 'name': ['a']}))
+        mysql = generator.dbms_merge_generator('users', ['id'], dbms='mysql')
+        self.assertIn('ON DUPLICATE KEY UPDATE', mysql)
+        self.assertIn('name = VALUES(name)', mysql)
+        sqlite = generator.dbms_merge_generator('users', ['id'], dbms='sqlite', source_table_name='stage')
+        self.assertIn('WHERE true', sqlite)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from keepitsql.core.engine_registry import (
+    PoolOptions,
+    dispose_all,
+    get_engine,
+)
+from keepitsql.gen_ddl import CopyDDl
+from keepitsql.read_information_schema import get_table_column_info
+
+
+class TestEngineRegistry(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, 'test.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT)')
+        self.url = f'sqlite:///{path}'
+
+    def tearDown(self):
+        dispose_all()
+        self.directory.cleanup()
+
+    def test_engines_are_shared_per_url_and_options(self):
+        engine = get_engine(self.url)
+        self.assertIs(get_engine(self.url), engine)
+        self.assertIsNot(get_engine(self.url, PoolOptions(pool_size=2, pool_recycle=300)), engine)
+        self.assertTrue(engine.pool._pre_ping)
+
+    def test_entry_points_reuse_the_registered_engine(self):
+        engine = get_engine(self.url)
+        self.assertIs(CopyDDl(self.url, 'users').db_engine, engine)
+        self.assertEqual(get_table_column_info(self.url, 'users'), (['id'], ['id']))
+        self.assertEqual(engine.pool.checkedout(), 0)
+
+    def test_dispose_all_forgets_engines(self):
+        engine = get_engine(self.url)
+        dispose_all()
+        self.assertIsNot(get_engine(self.url), engine)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,6 +39,34 @@ class TestFromDataframe(unittest.TestCase):
         sn = self.intep.dbms_merge_generator("SPO.Users", ['Name'], source_table_name='HIP.users', dbms='mssql')
         self.assertIsNotNone(sn)
 
+    def test_dbms_merge_generator_inline_values(self):
+        merge = self.intep.dbms_merge_generator("SPO.Users", ['Name'], dbms='mssql', values_rows=2)
+        self.assertIn('USING (\nVALUES\n    (:Name_0, :Age_0, :City_0, :Salary_0),', merge)
+        self.assertIn('AS SOURCE (Name, Age, City, Salary)', merge)
+
+        upsert = self.intep.dbms_merge_generator("Users", ['Name'], dbms='sqlite', values_rows=2)
+        self.assertIn('(:Name_1, :Age_1, :City_1, :Salary_1)\n\nON CONFLICT (Name)', upsert)
+
+        with self.assertRaises(ValueError):
+            self.intep.dbms_merge_generator("SPO.Users", ['Name'], dbms='oracle', values_rows=2)
+
+    def test_insert_on_conflict_skip_unchanged(self):
+        upsert = self.intep.generate_insert_on_conflict("SPO.Users", ['Name'], dbms='postgresql', skip_unchanged=True)
+        self.assertIn('WHERE Users.Age IS DISTINCT FROM EXCLUDED.Age OR\n      Users.City IS DISTINCT FROM', upsert)
+
+        upsert = self.intep.generate_insert_on_conflict("Users", ['Name'], dbms='sqlite', skip_unchanged=True)
+        self.assertIn('Users.Salary IS NOT EXCLUDED.Salary', upsert)
+        self.assertNotIn('WHERE', self.intep.generate_insert_on_conflict("Users", ['Name'], dbms='sqlite'))
+
+    def test_column_select(self):
+        merge = self.intep.dbms_merge_generator("SPO.Users", ['Name'], dbms='mssql', column_select=['City'])
+        self.assertIn('SET  City = SOURCE.City\n', merge)
+        self.assertNotIn('Salary', merge)
+
+        upsert = self.intep.dbms_merge_generator("Users", ['Name'], dbms='sqlite', column_select=['Age'])
+        self.assertIn('DO UPDATE SET\nAge = EXCLUDED.Age\n', upsert)
+        self.assertNotIn('City', upsert)
+
     def test_insert(self):
         # Assuming the GenerateInsert class has a method called insert
         mpop = self.intep.insert("SPO.Users")
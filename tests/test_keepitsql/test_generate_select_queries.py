@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+import zipfile
+
+from sqlalchemy import (
+    create_engine,
+    event,
+    text,
+)
+
+from keepitsql.core.generate_select_queries import export_select_statements
+
+
+class TestExportSelectStatements(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.directory.name, 'out')
+        sales_path = os.path.join(self.directory.name, 'sales.db')
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'main.db')}")
+
+        @event.listens_for(self.engine, 'connect')
+        def attach_sales(dbapi_connection, _):
+            dbapi_connection.execute(f"ATTACH DATABASE '{sales_path}' AS sales")
+
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)'))
+            connection.execute(text('CREATE TABLE sales.users (id INTEGER PRIMARY KEY, region TEXT)'))
+            connection.execute(text('CREATE TABLE sales.orders (id INTEGER PRIMARY KEY, amount REAL)'))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_only_names_used_in_several_schemas_are_qualified(self):
+        export_select_statements(self.engine, self.output_path, overwrite=True, max_workers=2)
+
+        self.assertEqual(sorted(os.listdir(self.output_path)), ['main.users.sql', 'orders.sql', 'sales.users.sql'])
+        with open(os.path.join(self.output_path, 'sales.users.sql')) as f:
+            self.assertIn('region', f.read())
+
+    def test_bundle(self):
+        export_select_statements(self.engine, self.output_path, overwrite=True, output_format='bundle')
+
+        with open(os.path.join(self.output_path, 'select_statements.sql')) as f:
+            bundle = f.read()
+        for section in ('-- main.users\n', '-- sales.users\n', '-- orders\n'):
+            self.assertIn(section, bundle)
+
+    def test_zip(self):
+        export_select_statements(
+            self.engine, self.output_path, overwrite=True, output_format='zip', file_prefix='x_', max_workers=1
+        )
+
+        with zipfile.ZipFile(os.path.join(self.output_path, 'x_select_statements.zip')) as archive:
+            self.assertEqual(sorted(archive.namelist()), ['x_main.users.sql', 'x_orders.sql', 'x_sales.users.sql'])
+            self.assertIn('region', archive.read('x_sales.users.sql').decode())
+
+    def test_incremental_export_renames_scripts_when_a_collision_goes_away(self):
+        export_select_statements(self.engine, self.output_path, incremental=True)
+        with self.engine.begin() as connection:
+            connection.execute(text('DROP TABLE sales.users'))
+        export_select_statements(self.engine, self.output_path, incremental=True)
+
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.output_path) if name.endswith('.sql')), ['orders.sql', 'users.sql']
+        )
+
+    def test_rejects_unknown_output_format(self):
+        with self.assertRaises(ValueError):
+            export_select_statements(self.engine, self.output_path, output_format='tar')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,289 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest import mock
+
+import polars as pl
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+from sqlalchemy.exc import (
+    IntegrityError,
+    OperationalError,
+)
+
+from keepitsql.core.dialect_capabilities import (
+    MERGE,
+    get_dialect_capabilities,
+)
+from keepitsql.core.executor import TransactionOptions
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.core.sqlite_bulk import sqlite_bulk_profile
+
+
+class TestLoadDataframe(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, 'target.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT NOT NULL)')
+        self.engine = create_engine(f'sqlite:///{path}')
+        self.test_df = pl.DataFrame({'id': list(range(1, 101)), 'name': [f'user_{i}' for i in range(1, 101)]})
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def count_rows(self):
+        with self.engine.connect() as connection:
+            return connection.execute(text('SELECT COUNT(*) FROM users')).scalar()
+
+    def test_load_insert_commit_cadence(self):
+        transaction = TransactionOptions(commit_every_rows=25)
+        result = FromDataframe(self.test_df).load_insert(self.engine, 'users', chunk_size=10, transaction=transaction)
+        self.assertEqual(result.rows_loaded, 100)
+        self.assertEqual(result.chunks, 10)
+        self.assertEqual(result.commits, 4)
+        self.assertEqual(self.count_rows(), 100)
+
+    def test_load_upsert_updates_and_inserts(self):
+        FromDataframe(self.test_df).load_insert(self.engine, 'users')
+        changes = pl.DataFrame({'id': [1, 500], 'name': ['renamed', 'new']})
+        FromDataframe(changes).load_upsert(self.engine, 'users', ['id'])
+
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text('SELECT name FROM users WHERE id = 1')).scalar(), 'renamed')
+        self.assertEqual(self.count_rows(), 101)
+
+    def test_load_upsert_inline_values(self):
+        FromDataframe(self.test_df).load_insert(self.engine, 'users')
+        changes = pl.DataFrame({'id': [1, 2, 500, 501, 502], 'name': ['renamed', 'renamed', 'a', 'b', 'c']})
+        result = FromDataframe(changes).load_upsert(self.engine, 'users', ['id'], chunk_size=2, inline_values=True)
+
+        self.assertEqual(result.chunks, 3)
+        with self.engine.connect() as connection:
+            renamed = connection.execute(text("SELECT COUNT(*) FROM users WHERE name = 'renamed'")).scalar()
+        self.assertEqual(renamed, 2)
+        self.assertEqual(self.count_rows(), 103)
+
+    def test_load_upsert_skip_unchanged(self):
+        FromDataframe(self.test_df).load_insert(self.engine, 'users')
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE updated (id INTEGER)'))
+            connection.execute(
+                text('CREATE TRIGGER log_update AFTER UPDATE ON users BEGIN INSERT INTO updated VALUES (NEW.id); END')
+            )
+        changes = pl.DataFrame({'id': [1, 2, 500], 'name': ['renamed', 'user_2', 'new']})
+        for inline_values in (False, True):
+            FromDataframe(changes).load_upsert(
+                self.engine, 'users', ['id'], inline_values=inline_values, skip_unchanged=True
+            )
+
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text('SELECT id FROM updated')).scalars().all(), [1])
+        self.assertEqual(self.count_rows(), 101)
+
+    def test_load_column_select(self):
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE accounts (id INTEGER PRIMARY KEY, name TEXT, balance REAL)'))
+        accounts = pl.DataFrame({'id': [1, 2], 'name': ['a', 'b'], 'balance': [1.0, 2.0]})
+        FromDataframe(accounts).load_insert(self.engine, 'accounts', column_select=['id', 'balance'])
+        changes = pl.DataFrame({'id': [1, 3], 'name': ['renamed', 'c'], 'balance': [10.0, 3.0]})
+        for inline_values in (False, True):
+            FromDataframe(changes).load_upsert(
+                self.engine, 'accounts', ['id'], column_select=['balance'], inline_values=inline_values
+            )
+
+        with self.engine.connect() as connection:
+            rows = connection.execute(text('SELECT * FROM accounts ORDER BY id')).all()
+        self.assertEqual([tuple(row) for row in rows], [(1, None, 10.0), (2, None, 2.0), (3, None, 3.0)])
+
+    def test_failed_merge_chunk_raises_its_own_error_and_drops_the_stage(self):
+        capabilities = replace(get_dialect_capabilities('sqlite'), upsert_type=MERGE)
+        with mock.patch('keepitsql.core.load.get_dialect_capabilities', return_value=capabilities):
+            with self.assertRaisesRegex(OperationalError, 'MERGE'):
+                FromDataframe(self.test_df).load_upsert(self.engine, 'users', ['id'], chunk_size=10)
+
+        with self.engine.connect() as connection:
+            tables = connection.execute(text("SELECT name FROM sqlite_temp_master WHERE type = 'table'")).all()
+        self.assertEqual(tables, [])
+
+    def test_failed_stage_drop_does_not_mask_the_load_error(self):
+        capabilities = replace(get_dialect_capabilities('sqlite'), upsert_type=MERGE)
+        with mock.patch('keepitsql.core.load.get_dialect_capabilities', return_value=capabilities):
+            with mock.patch('keepitsql.sql_models.alter_table.drop_table', 'DROP TABLE missing_{table_name}'):
+                with self.assertRaisesRegex(OperationalError, 'MERGE'):
+                    FromDataframe(self.test_df).load_upsert(self.engine, 'users', ['id'], chunk_size=10)
+
+    def test_staging_table_holds_only_dataframe_columns(self):
+        loader = FromDataframe(self.test_df.select('id'))
+        with self.engine.connect() as connection:
+            staging_table_name = loader.create_staging_table(connection, 'users')
+            columns = connection.execute(text(f'SELECT * FROM {staging_table_name}')).keys()
+        self.assertEqual(list(columns), ['id'])
+
+    def test_staging_tables_are_unique_per_load(self):
+        loader = FromDataframe(self.test_df)
+        with self.engine.connect() as connection:
+            names = {loader.create_staging_table(connection, 'users') for _ in range(2)}
+        self.assertEqual(len(names), 2)
+        self.assertTrue(all(name.startswith('users_stage_') for name in names))
+
+    def test_failed_chunk_rolls_back_uncommitted_chunks(self):
+        bad_df = pl.DataFrame({'id': [1, 2, 3], 'name': ['a', None, 'c']})
+        transaction = TransactionOptions(savepoint_per_chunk=True, chunk_retries=1)
+        with self.assertRaises(IntegrityError):
+            FromDataframe(bad_df).load_insert(self.engine, 'users', chunk_size=1, transaction=transaction)
+        self.assertEqual(self.count_rows(), 0)
+
+    def test_bisect_isolates_bad_rows(self):
+        names = [None if i in (17, 58) else f'user_{i}' for i in range(1, 101)]
+        bad_df = pl.DataFrame({'id': list(range(1, 101)), 'name': names})
+        transaction = TransactionOptions(on_error='bisect')
+
+        result = FromDataframe(bad_df).load_insert(self.engine, 'users', chunk_size=50, transaction=transaction)
+
+        self.assertEqual(result.rows_loaded, 98)
+        self.assertEqual(self.count_rows(), 98)
+        rejects = result.reject_frame()
+        self.assertEqual(rejects['id'].to_list(), [17, 58])
+        self.assertTrue(all('NOT NULL' in error for error in rejects['error']))
+
+    def test_bisect_raises_transient_errors(self):
+        engine = create_engine(self.engine.url, connect_args={'timeout': 0.05})
+        transaction = TransactionOptions(on_error='bisect')
+        locker = sqlite3.connect(self.engine.url.database)
+        try:
+            locker.execute('BEGIN EXCLUSIVE')
+            with self.assertRaisesRegex(OperationalError, 'database is locked'):
+                FromDataframe(self.test_df).load_insert(engine, 'users', chunk_size=50, transaction=transaction)
+        finally:
+            locker.rollback()
+            locker.close()
+            engine.dispose()
+
+    def test_sqlite_bulk_insert_and_upsert(self):
+        result = FromDataframe(self.test_df).load_insert(self.engine, 'users', chunk_size=30, sqlite_bulk=True)
+        self.assertEqual((result.rows_loaded, result.chunks, result.commits), (100, 4, 1))
+
+        changes = pl.DataFrame({'id': [1, 500], 'name': ['renamed', 'new']})
+        FromDataframe(changes).load_upsert(self.engine, 'users', ['id'], sqlite_bulk=True)
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text('SELECT name FROM users WHERE id = 1')).scalar(), 'renamed')
+        self.assertEqual(self.count_rows(), 101)
+
+    def test_sqlite_bulk_profile_restores_pragmas(self):
+        with self.engine.connect() as connection:
+            dbapi_connection = connection.connection.dbapi_connection
+            with sqlite_bulk_profile(connection):
+                self.assertEqual(dbapi_connection.execute('PRAGMA temp_store').fetchone()[0], 2)
+            self.assertEqual(dbapi_connection.execute('PRAGMA temp_store').fetchone()[0], 0)
+            self.assertEqual(dbapi_connection.execute('PRAGMA journal_mode').fetchone()[0], 'delete')
+
+    def test_sqlite_bulk_failure_rolls_back_everything(self):
+        bad_df = pl.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', None]})
+        with self.assertRaises(IntegrityError):
+            FromDataframe(bad_df).load_insert(self.engine, 'users', chunk_size=1, sqlite_bulk=True)
+        self.assertEqual(self.count_rows(), 0)
+
+    def test_sync_deletes_rows_missing_from_source_within_scope(self):
+        with self.engine.begin() as connection:
+            connection.execute(text('ALTER TABLE users ADD COLUMN region TEXT'))
+        regions = pl.DataFrame({'region': ['EU' if i <= 50 else 'US' for i in range(1, 101)]})
+        FromDataframe(self.test_df.hstack(regions)).load_insert(self.engine, 'users')
+
+        source = pl.DataFrame({'id': [1, 2, 500], 'name': ['renamed', 'user_2', 'new'], 'region': ['EU'] * 3})
+        FromDataframe(source).load_sync(self.engine, 'users', ['id'], delete_scope={'region': 'EU'})
+
+        with self.engine.connect() as connection:
+            eu_ids = connection.execute(text("SELECT id FROM users WHERE region = 'EU' ORDER BY id")).scalars().all()
+            self.assertEqual(eu_ids, [1, 2, 500])
+            self.assertEqual(connection.execute(text('SELECT name FROM users WHERE id = 1')).scalar(), 'renamed')
+        self.assertEqual(self.count_rows(), 53)
+
+    def test_sync_statements(self):
+        generator = FromDataframe(self.test_df)
+        merge = generator.generate_merge_statement(
+            'users', ['id'], source_table_name='##stage', delete_not_matched=True, delete_scope={'region': 'EU'}
+        )
+        self.assertIn('WHEN NOT MATCHED BY SOURCE AND TARGET.region = :scope_region THEN\nDELETE;', merge)
+
+        matched_condition = merge.split('WHEN MATCHED AND (')[1].split(')\nTHEN UPDATE')[0]
+        pairs = [('a', 'a'), ('a', 'b'), (None, 'b'), ('a', None), (None, None)]
+        with self.engine.connect() as connection:
+            changed = [
+                bool(
+                    connection.execute(
+                        text(
+                            f'SELECT {matched_condition} FROM (SELECT :target AS name) AS TARGET, '
+                            '(SELECT :source AS name) AS SOURCE'
+                        ),
+                        {'target': target, 'source': source},
+                    ).scalar()
+                )
+                for target, source in pairs
+            ]
+        self.assertEqual(changed, [False, True, True, True, False])
+
+        delete = generator.generate_delete_not_in_source('users', ['id'], 'stage')
+        self.assertIn('WHERE NOT EXISTS', delete)
+        self.assertIn('SOURCE.id = users.id', delete)
+
+    def test_refresh_swaps_in_rebuilt_table(self):
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE INDEX ix_users_name ON users (name)'))
+        FromDataframe(self.test_df).load_insert(self.engine, 'users')
+
+        replacement = pl.DataFrame({'id': [7, 8], 'name': ['seven', 'eight']})
+        result = FromDataframe(replacement).load_refresh(self.engine, 'users')
+
+        self.assertEqual(result.rows_loaded, 2)
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text('SELECT id FROM users ORDER BY id')).scalars().all(), [7, 8])
+            objects = connection.execute(text("SELECT name FROM sqlite_master ORDER BY name")).scalars().all()
+        self.assertEqual(objects, ['ix_users_name_refresh', 'users'])
+
+        with self.assertRaises(IntegrityError):
+            FromDataframe(pl.DataFrame({'id': [1], 'name': [None]})).load_refresh(self.engine, 'users')
+        self.assertEqual(self.count_rows(), 2)
+
+    def test_refresh_keeps_defaults_checks_and_autoincrement(self):
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, code TEXT NOT NULL DEFAULT 'new',"
+                    ' qty INTEGER CONSTRAINT ck_items_qty CHECK (qty > 0))'
+                )
+            )
+        FromDataframe(pl.DataFrame({'id': [10, 20], 'code': ['a', 'b'], 'qty': [1, 2]})).load_refresh(
+            self.engine, 'items'
+        )
+
+        with self.engine.begin() as connection:
+            table_sql = connection.execute(text("SELECT sql FROM sqlite_master WHERE name = 'items'")).scalar()
+            connection.execute(text('INSERT INTO items (qty) VALUES (3)'))
+            self.assertEqual(connection.execute(text('SELECT id, code FROM items WHERE qty = 3')).one(), (21, 'new'))
+            with self.assertRaises(IntegrityError):
+                connection.execute(text('INSERT INTO items (qty) VALUES (0)'))
+        self.assertIn('AUTOINCREMENT', table_sql)
+        self.assertIn('ck_items_qty_refresh', table_sql)
+
+    def test_refresh_refuses_referenced_tables(self):
+        with self.engine.begin() as connection:
+            connection.execute(
+                text('CREATE TABLE posts (id INTEGER PRIMARY KEY, user_id INTEGER REFERENCES users (id))')
+            )
+        with self.assertRaisesRegex(ValueError, 'main.posts'):
+            FromDataframe(self.test_df).load_refresh(self.engine, 'users')
+        with self.engine.connect() as connection:
+            self.assertIn(
+                'REFERENCES users',
+                connection.execute(text("SELECT sql FROM sqlite_master WHERE name = 'posts'")).scalar(),
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import polars as pl
+from sqlalchemy import (
+    create_engine,
+    event,
+    text,
+)
+
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.core.multi_table_load import (
+    load_tables,
+    table_dependencies,
+)
+
+TABLES = (
+    'CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT)',
+    'CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT)',
+    'CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES customers (id))',
+    'CREATE TABLE order_items (order_id INTEGER REFERENCES orders (id), product_id INTEGER REFERENCES products (id))',
+    'CREATE TABLE employees (id INTEGER PRIMARY KEY, manager_id INTEGER REFERENCES employees (id))',
+)
+
+
+class TestMultiTableLoad(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'model.db')}")
+        event.listen(
+            self.engine, 'connect', lambda dbapi_connection, _: dbapi_connection.execute('PRAGMA foreign_keys=ON')
+        )
+        with self.engine.begin() as connection:
+            for statement in TABLES:
+                connection.execute(text(statement))
+        self.frames = {
+            'order_items': pl.DataFrame({'order_id': [1, 1], 'product_id': [1, 2]}),
+            'orders': pl.DataFrame({'id': [1], 'customer_id': [1]}),
+            'employees': pl.DataFrame({'id': [1, 2], 'manager_id': [None, 1]}),
+            'products': pl.DataFrame({'id': [1, 2], 'name': ['pen', 'ink']}),
+            'customers': pl.DataFrame({'id': [1], 'name': ['Alice']}),
+        }
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_dependencies_within_the_given_tables(self):
+        dependencies = table_dependencies(self.engine, ['order_items', 'orders', 'customers', 'employees'])
+        self.assertEqual(
+            dependencies,
+            {'order_items': {'orders'}, 'orders': {'customers'}, 'customers': set(), 'employees': set()},
+        )
+
+    def test_loads_parents_first(self):
+        results = load_tables(self.engine, self.frames, match_conditions={'customers': ['id']})
+
+        order = list(results)
+        self.assertLess(order.index('customers'), order.index('orders'))
+        self.assertLess(order.index('orders'), order.index('order_items'))
+        self.assertLess(order.index('products'), order.index('order_items'))
+        self.assertEqual(results['order_items'].rows_loaded, 2)
+
+    def test_independent_branches_load_in_parallel(self):
+        running, overlapped = set(), []
+        lock = threading.Lock()
+
+        def load_insert(loader, db_resource, table_name, **kwargs):
+            with lock:
+                if running:
+                    overlapped.append(table_name)
+                running.add(table_name)
+            time.sleep(0.05)
+            with lock:
+                running.discard(table_name)
+
+        with mock.patch.object(FromDataframe, 'load_insert', autospec=True, side_effect=load_insert):
+            results = load_tables(self.engine, self.frames, max_workers=3)
+
+        self.assertEqual(set(results), set(self.frames))
+        self.assertTrue(overlapped)
+        self.assertNotIn('order_items', overlapped)
+
+    def test_cycle(self):
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE a (id INTEGER PRIMARY KEY, b_id INTEGER REFERENCES b (id))'))
+            connection.execute(text('CREATE TABLE b (id INTEGER PRIMARY KEY, a_id INTEGER REFERENCES a (id))'))
+        frames = {'a': pl.DataFrame({'id': [1], 'b_id': [1]}), 'b': pl.DataFrame({'id': [1], 'a_id': [1]})}
+        with self.assertRaises(ValueError):
+            load_tables(self.engine, frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
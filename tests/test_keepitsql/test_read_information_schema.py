@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from keepitsql.read_information_schema import (
+    get_schema_column_info,
+    get_table_column_info,
+    reflect_schema_column_info,
+)
+
+
+class TestSchemaColumnInfo(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.directory.name, 'catalog.db')}"
+        self.engine = create_engine(self.url)
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT)'))
+            connection.execute(text('CREATE TABLE pairs (a INTEGER, b TEXT, c REAL, PRIMARY KEY (b, a))'))
+            connection.execute(text('CREATE TABLE notes (body TEXT)'))
+            connection.execute(text('CREATE VIEW pair_view AS SELECT * FROM pairs'))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_every_table_in_one_lookup(self):
+        self.assertEqual(
+            get_schema_column_info(self.engine),
+            {'events': (['id'], ['id']), 'notes': ([], []), 'pairs': ([], ['b', 'a'])},
+        )
+
+    def test_matches_single_table_lookup(self):
+        with Session(bind=self.engine) as session:
+            self.assertEqual(get_schema_column_info(session)['events'], get_table_column_info(self.url, 'events'))
+
+    def test_reflection_fallback_finds_primary_keys(self):
+        with self.engine.connect() as connection:
+            info = reflect_schema_column_info(connection)
+        self.assertEqual(info['pairs'][1], ['b', 'a'])
+        self.assertEqual(info['notes'], ([], []))
+
+    def test_rejects_invalid_sqlite_schema(self):
+        with self.assertRaises(ValueError):
+            get_schema_column_info(self.engine, 'main; DROP TABLE events')
+
+
+if __name__ == '__main__':
+    unittest.main()
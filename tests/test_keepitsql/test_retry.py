@@ -0,0 +1,68 @@
+import sqlite3
+import unittest
+
+from sqlalchemy.exc import (
+    IntegrityError,
+    OperationalError,
+)
+
+from keepitsql.core.retry import (
+    FATAL,
+    TRANSIENT,
+    RetryPolicy,
+    aborts_transaction,
+    classify_error,
+)
+
+
+class FakeDriverError(Exception):
+    pass
+
+
+class TestRetry(unittest.TestCase):
+    def test_classify_sqlite_lock(self):
+        error = OperationalError('INSERT', {}, sqlite3.OperationalError('database is locked'))
+        self.assertEqual(classify_error('sqlite', error), TRANSIENT)
+
+    def test_classify_constraint_violation(self):
+        error = IntegrityError('INSERT', {}, sqlite3.IntegrityError('NOT NULL constraint failed: users.name'))
+        self.assertEqual(classify_error('sqlite', error), FATAL)
+
+    def test_mssql_deadlock_victim_aborts_transaction(self):
+        message = 'Transaction (Process ID 52) was deadlocked on lock resources. Rerun the transaction. (1205)'
+        error = OperationalError('MERGE', {}, FakeDriverError('40001', message))
+        self.assertEqual(classify_error('mssql', error), TRANSIENT)
+        self.assertTrue(aborts_transaction('mssql', error))
+
+    def test_codes_in_messages_are_not_error_codes(self):
+        duplicate = FakeDriverError('duplicate key value violates unique constraint "orders_pkey": (id)=(40001)')
+        duplicate.pgcode = '23505'
+        self.assertEqual(classify_error('postgresql', IntegrityError('INSERT', {}, duplicate)), FATAL)
+
+        duplicate = FakeDriverError(1062, "Duplicate entry '1213' for key 'PRIMARY'")
+        self.assertEqual(classify_error('mysql', IntegrityError('INSERT', {}, duplicate)), FATAL)
+        deadlock = FakeDriverError(1213, 'Deadlock found when trying to get lock; try restarting transaction')
+        self.assertEqual(classify_error('mysql', OperationalError('INSERT', {}, deadlock)), TRANSIENT)
+
+        message = '[SQL Server]Violation of PRIMARY KEY constraint. The duplicate key value is (1205). (2627) '
+        message += '(SQLExecDirectW)'
+        duplicate = FakeDriverError('23000', message)
+        self.assertEqual(classify_error('mssql', IntegrityError('INSERT', {}, duplicate)), FATAL)
+        timeout = FakeDriverError('HY000', '[SQL Server]Lock request time out period exceeded. (1222) (SQLExecDirectW)')
+        self.assertEqual(classify_error('mssql', OperationalError('INSERT', {}, timeout)), TRANSIENT)
+
+    def test_retry_budget_is_shared(self):
+        error = OperationalError('INSERT', {}, sqlite3.OperationalError('database is locked'))
+        policy = RetryPolicy(max_attempts=10, retry_budget=2)
+        self.assertTrue(policy.should_retry('sqlite', error, 0))
+        self.assertTrue(policy.should_retry('sqlite', error, 0))
+        self.assertFalse(policy.should_retry('sqlite', error, 0))
+        self.assertEqual(policy.metrics.budget_exhausted, 1)
+
+    def test_max_attempts(self):
+        error = OperationalError('INSERT', {}, sqlite3.OperationalError('database is locked'))
+        self.assertFalse(RetryPolicy(max_attempts=3).should_retry('sqlite', error, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
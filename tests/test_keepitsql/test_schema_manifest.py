@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+
+from keepitsql.core.generate_select_queries import export_select_statements
+from keepitsql.core.schema_manifest import (
+    MANIFEST_FILE_NAME,
+    SchemaManifest,
+    table_fingerprint,
+)
+from keepitsql.gen_ddl import (
+    CopyDDl,
+    export_schema_ddl,
+)
+
+
+class TestSchemaManifest(unittest.TestCase):
+    def setUp(self):
+        self.columns = [{'name': 'id', 'type': 'INTEGER', 'nullable': False}, {'name': 'name', 'type': 'TEXT'}]
+
+    def test_fingerprint_tracks_types_and_keys(self):
+        fingerprint = table_fingerprint(self.columns, ['id'])
+        self.assertEqual(fingerprint, table_fingerprint(list(self.columns), ['id']))
+        self.assertNotEqual(fingerprint, table_fingerprint(self.columns, []))
+
+        retyped = [self.columns[0], {'name': 'name', 'type': 'VARCHAR(50)'}]
+        self.assertNotEqual(fingerprint, table_fingerprint(retyped, ['id']))
+
+    def test_manifest_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'manifest.json')
+            manifest = SchemaManifest.load(path)
+            self.assertTrue(manifest.is_changed('main.users', 'abc'))
+
+            manifest.update('main.users', 'abc')
+            manifest.save()
+
+            reloaded = SchemaManifest.load(path)
+            self.assertFalse(reloaded.is_changed('main.users', 'abc'))
+            self.assertTrue(reloaded.is_changed('main.users', 'def'))
+
+
+class TestIncrementalExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.directory.name, 'out')
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'catalog.db')}")
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)'))
+            connection.execute(text('CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER)'))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def output_files(self):
+        return sorted(name for name in os.listdir(self.output_path) if name != MANIFEST_FILE_NAME)
+
+    def test_export_ddl_uses_new_names(self):
+        copy_ddl = CopyDDl(self.engine, 'users')
+        file_path = copy_ddl.export_ddl(self.output_path, new_schema_name='stage', new_table_name='users2')
+
+        self.assertEqual(os.path.basename(file_path), 'stage.users2.sql')
+        with open(file_path) as f:
+            self.assertIn('CREATE TABLE stage.users2', f.read())
+        self.assertIsNone(copy_ddl.export_ddl(self.output_path, new_schema_name='stage', new_table_name='users2'))
+        self.assertIsNotNone(copy_ddl.export_ddl(self.output_path, new_schema_name='stage', new_table_name='users3'))
+
+    def test_export_schema_ddl_rewrites_changed_and_prunes_dropped_tables(self):
+        self.assertEqual(len(export_schema_ddl(self.engine, self.output_path)), 2)
+        self.assertEqual(export_schema_ddl(self.engine, self.output_path), [])
+
+        with self.engine.begin() as connection:
+            connection.execute(text('ALTER TABLE users ADD COLUMN email TEXT'))
+            connection.execute(text('DROP TABLE orders'))
+        written = export_schema_ddl(self.engine, self.output_path)
+
+        self.assertEqual([os.path.basename(path) for path in written], ['users.sql'])
+        self.assertEqual(self.output_files(), ['users.sql'])
+        self.assertEqual(
+            list(SchemaManifest.load(os.path.join(self.output_path, MANIFEST_FILE_NAME)).fingerprints), ['users']
+        )
+
+    def test_incremental_select_export_prunes_dropped_tables(self):
+        export_select_statements(self.engine, self.output_path, incremental=True)
+        self.assertEqual(self.output_files(), ['orders.sql', 'users.sql'])
+
+        with self.engine.begin() as connection:
+            connection.execute(text('DROP TABLE orders'))
+        export_select_statements(self.engine, self.output_path, incremental=True)
+
+        self.assertEqual(self.output_files(), ['users.sql'])
+        self.assertEqual(
+            list(SchemaManifest.load(os.path.join(self.output_path, MANIFEST_FILE_NAME)).fingerprints), ['main.users']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
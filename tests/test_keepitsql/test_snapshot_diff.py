@@ -0,0 +1,87 @@
+import unittest
+
+import pandas as pd
+import polars as pl
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.core.snapshot_diff import diff
+
+PREVIOUS = {
+    'id': [1, 2, 3, 4],
+    'region': ['EU', 'EU', 'US', 'US'],
+    'amount': [10.0, None, 30.0, 40.0],
+    'status': ['open', 'open', None, 'open'],
+}
+CURRENT = {
+    'id': [1, 2, 3, 5],
+    'region': ['EU', 'EU', 'US', 'US'],
+    'amount': [10.0, 20.0, 30.0, 50.0],
+    'status': ['open', 'open', None, 'new'],
+}
+
+
+class TestSnapshotDiff(unittest.TestCase):
+    def assert_diff(self, changes, rows):
+        self.assertEqual(rows(changes.inserts), [(5, 'US', 50.0, 'new')])
+        self.assertEqual(rows(changes.updates), [(2, 'EU', 20.0, 'open')])
+        self.assertEqual(rows(changes.deletes), [(4, 'US')])
+        self.assertEqual(len(changes.upserts), 2)
+
+    def test_polars(self):
+        changes = diff(pl.DataFrame(PREVIOUS), pl.DataFrame(CURRENT), ['id', 'region'])
+        self.assertIsInstance(changes.inserts, pl.DataFrame)
+        self.assert_diff(changes, lambda frame: frame.rows())
+
+    def test_pandas(self):
+        changes = diff(pd.DataFrame(PREVIOUS), pd.DataFrame(CURRENT), ['id', 'region'])
+        self.assertIsInstance(changes.inserts, pd.DataFrame)
+        self.assert_diff(changes, lambda frame: [tuple(row) for row in frame.itertuples(index=False)])
+
+    def test_pandas_nullable_dtypes(self):
+        previous = pd.DataFrame({'id': [1, 2, 3, 4], 'qty': pd.array([1, None, 3, None], dtype='Int64')})
+        current = pd.DataFrame({'id': [1, 2, 3, 4], 'qty': pd.array([1, 2, None, None], dtype='Int64')})
+        current['flag'] = previous['flag'] = pd.array([True, None, False, None], dtype='boolean')
+
+        changes = diff(previous, current, ['id'])
+        self.assertEqual(changes.updates['id'].tolist(), [2, 3])
+        self.assertTrue(changes.inserts.empty and changes.deletes.empty)
+
+    def test_null_key_parts_match(self):
+        previous = {'id': [1, 2], 'region': ['EU', None], 'amount': [10.0, 20.0]}
+        current = {'id': [1, 2], 'region': ['EU', None], 'amount': [10.0, 25.0]}
+        for frame in (pl.DataFrame, pd.DataFrame):
+            changes = diff(frame(previous), frame(current), ['id', 'region'])
+            self.assertEqual(len(changes.updates), 1)
+            self.assertEqual(len(changes.inserts) + len(changes.deletes), 0)
+
+    def test_unchanged_snapshot(self):
+        self.assertTrue(diff(pl.DataFrame(PREVIOUS), pl.DataFrame(PREVIOUS), ['id']).is_empty)
+
+    def test_rejects_duplicate_keys(self):
+        for frame in (pl.DataFrame, pd.DataFrame):
+            with self.assertRaises(ValueError):
+                diff(frame(PREVIOUS), frame(CURRENT), ['region'])
+
+    def test_changes_apply_to_table(self):
+        engine = create_engine('sqlite://')
+        with engine.begin() as connection:
+            connection.execute(
+                text('CREATE TABLE sales (id INTEGER, region TEXT, amount REAL, status TEXT, PRIMARY KEY (id, region))')
+            )
+        FromDataframe(pl.DataFrame(PREVIOUS)).load_insert(engine, 'sales')
+
+        changes = diff(pl.DataFrame(PREVIOUS), pl.DataFrame(CURRENT), ['id', 'region'])
+        FromDataframe(changes.upserts).load_upsert(engine, 'sales', ['id', 'region'])
+        FromDataframe(changes.deletes).load_delete(engine, 'sales', ['id', 'region'])
+
+        with engine.connect() as connection:
+            rows = connection.execute(text('SELECT * FROM sales ORDER BY id')).all()
+        self.assertEqual([tuple(row) for row in rows], pl.DataFrame(CURRENT).rows())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import datetime
+import decimal
+import unittest
+
+import pandas as pd
+import polars as pl
+
+from keepitsql.core.sql_literals import (
+    render_literal,
+    render_literal_columns,
+)
+
+
+class TestSqlLiterals(unittest.TestCase):
+    def setUp(self):
+        self.rows = {
+            'name': ["o'brien", None, 'x'],
+            'id': [1, None, 3],
+            'amount': [1.5, float('nan'), float('inf')],
+            'active': [True, False, None],
+            'day': [datetime.date(2024, 1, 2), None, datetime.date(2024, 1, 3)],
+            'created': [datetime.datetime(2024, 1, 2, 3, 4, 5, 6), None, datetime.datetime(2024, 1, 2)],
+            'payload': [b'\x01\xab', None, b'\xff'],
+        }
+
+    def test_polars_matches_cell_by_cell_rendering(self):
+        dataframe = pl.DataFrame(self.rows)
+        for dialect in (None, 'postgresql', 'mssql', 'oracle', 'sqlite'):
+            expected = [', '.join(render_literal(value, dialect) for value in row) for row in dataframe.iter_rows()]
+            self.assertEqual(render_literal_columns(dataframe, dialect), expected, dialect)
+
+    def test_dialect_spelling(self):
+        dataframe = pl.DataFrame({key: values[:1] for key, values in self.rows.items()})
+        self.assertEqual(
+            render_literal_columns(dataframe, 'oracle'),
+            ["'o''brien', 1, 1.5, 1, DATE '2024-01-02', TIMESTAMP '2024-01-02 03:04:05.000006', HEXTORAW('01AB')"],
+        )
+        self.assertEqual(
+            render_literal_columns(dataframe, 'postgresql'),
+            ["'o''brien', 1, 1.5, TRUE, '2024-01-02', '2024-01-02 03:04:05.000006', '\\x01AB'::bytea"],
+        )
+
+    def test_pandas_missing_values_are_null(self):
+        dataframe = pd.DataFrame(
+            {
+                'name': ["it's", None],
+                'amount': [decimal.Decimal('1.50'), None],
+                'ratio': [0.5, float('nan')],
+                'created': pd.to_datetime(['2024-01-02 03:04:05', None]),
+            }
+        )
+        self.assertEqual(
+            render_literal_columns(dataframe, 'postgresql'),
+            ["'it''s', 1.50, 0.5, '2024-01-02 03:04:05'", 'NULL, NULL, NULL, NULL'],
+        )
+
+    def test_mysql_escapes_backslashes(self):
+        values = ['a\\', "b\\'c"]
+        expected = ["'a\\\\'", "'b\\\\''c'"]
+        self.assertEqual([render_literal(value, 'mysql') for value in values], expected)
+        self.assertEqual(render_literal_columns(pl.DataFrame({'text': values}), 'mariadb'), expected)
+        self.assertEqual(render_literal_columns(pd.DataFrame({'text': values}), 'mysql'), expected)
+        self.assertEqual(render_literal('a\\', 'postgresql'), "'a\\'")
+
+    def test_timestamps_match_across_paths(self):
+        created = [
+            datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2024, 1, 2, 3, 4, 5, 250000, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc),
+        ]
+        expected = [
+            "'2024-01-02 03:04:05+00:00'",
+            "'2024-01-02 03:04:05.250+00:00'",
+            "'2024-01-02 03:04:05.000006+00:00'",
+        ]
+        self.assertEqual([render_literal(value, 'mssql') for value in created], expected)
+        self.assertEqual(render_literal_columns(pl.DataFrame({'created': created}), 'mssql'), expected)
+        self.assertEqual(render_literal_columns(pd.DataFrame({'created': created}), 'mssql'), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
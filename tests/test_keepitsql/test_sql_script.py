@@ -0,0 +1,66 @@
+import gzip
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import polars as pl
+
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.core.sql_script import SqlScriptWriter
+
+
+class TestSqlScript(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.test_df = pl.DataFrame(
+            {
+                'id': list(range(1, 2501)),
+                'name': [None if i % 10 == 0 else f"o'brien_{i}" for i in range(1, 2501)],
+            }
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_rotated_gzip_script_loads_every_row(self):
+        paths = FromDataframe(self.test_df).write_insert_script(
+            self.path('dump.sql'),
+            'users',
+            dialect='sqlite',
+            rows_per_statement=500,
+            max_file_bytes=20_000,
+            compress=True,
+        )
+        self.assertGreater(len(paths), 1)
+        self.assertTrue(all(path.endswith('.sql.gz') for path in paths))
+
+        connection = sqlite3.connect(':memory:')
+        connection.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+        for path in paths:
+            with gzip.open(path, 'rt') as f:
+                connection.executescript(f.read())
+        self.assertEqual(connection.execute('SELECT COUNT(*), COUNT(name) FROM users').fetchone(), (2500, 2250))
+        self.assertEqual(connection.execute('SELECT name FROM users WHERE id = 1').fetchone()[0], "o'brien_1")
+
+    def test_rows_per_statement_follows_dialect(self):
+        oracle = FromDataframe(self.test_df.head(3)).write_insert_script(self.path('oracle.sql'), 'users', 'oracle')
+        with open(oracle[0]) as f:
+            self.assertEqual(f.read().count('INSERT INTO'), 3)
+
+        mssql = FromDataframe(self.test_df).write_insert_script(self.path('mssql.sql'), 'users', 'mssql', 5000)
+        with open(mssql[0]) as f:
+            self.assertEqual(f.read().count('INSERT INTO'), 3)
+
+    def test_writer_never_splits_a_statement(self):
+        with SqlScriptWriter(self.path('out.sql'), max_file_bytes=10) as writer:
+            writer.write('SELECT 1;\n' * 3)
+            writer.write('SELECT 2;\n')
+        self.assertEqual([os.path.basename(path) for path in writer.paths], ['out_0001.sql', 'out_0002.sql'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from keepitsql.core.to_dataframe import ToDataframe
+
+
+class TestToDataframe(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, 'source.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            connection.executemany('INSERT INTO users VALUES (?, ?)', [(i, f'user_{i}') for i in range(1, 101)])
+            connection.execute('CREATE TABLE pairs (a INTEGER, b INTEGER, v TEXT, PRIMARY KEY (a, b))')
+            connection.executemany('INSERT INTO pairs VALUES (?, ?, ?)', [(i // 10, i % 10, 'x') for i in range(50)])
+        self.url = f'sqlite:///{path}'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_keyset_pages_cover_table_once(self):
+        chunks = list(ToDataframe(self.url, 'users').iter_chunks(chunk_size=7, page_size=20))
+        self.assertTrue(all(chunk.height <= 7 for chunk in chunks))
+        self.assertEqual(sum(chunk.height for chunk in chunks), 100)
+
+    def test_composite_key(self):
+        frame = ToDataframe(self.url, 'pairs', output='pandas').read(chunk_size=3, page_size=8)
+        self.assertEqual(len(frame), 50)
+        self.assertFalse(frame.duplicated(['a', 'b']).any())
+
+    def test_parallel_partitions_match_serial_read(self):
+        reader = ToDataframe(self.url, 'users', column_select=['name'])
+        self.assertEqual(reader.columns, ['id', 'name'])
+        self.assertTrue(reader.read(chunk_size=10, partitions=4).equals(reader.read(chunk_size=10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import datetime
+import unittest
+from decimal import Decimal
+
+import pandas as pd
+import polars as pl
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+from sqlalchemy import types as sqltypes
+from sqlalchemy.dialects import mssql
+
+from keepitsql.core.from_dataframe import FromDataframe
+from keepitsql.core.type_coercion import (
+    OUT_OF_RANGE,
+    ROUNDED,
+    TRUNCATED,
+    UNPARSEABLE,
+    coerce_frame,
+)
+
+COLUMNS = [
+    {'name': 'small', 'type': sqltypes.SmallInteger()},
+    {'name': 'tiny', 'type': mssql.TINYINT()},
+    {'name': 'amount', 'type': sqltypes.Numeric(6, 2)},
+    {'name': 'code', 'type': sqltypes.String(3)},
+    {'name': 'flag', 'type': sqltypes.Boolean()},
+    {'name': 'created', 'type': mssql.DATETIMEOFFSET()},
+    {'name': 'quantity', 'type': sqltypes.Integer()},
+]
+DATA = {
+    'small': [1, 40000, 3],
+    'tiny': [1, -1, 255],
+    'amount': [1.005, 12345.678, 3.5],
+    'code': ['ab', 'abcd', None],
+    'flag': ['yes', 'no', 'maybe'],
+    'created': [datetime.datetime(2024, 1, 1, 12), datetime.datetime(2024, 6, 1), None],
+    'quantity': ['12', ' 7 ', 'x'],
+}
+EXPECTED_ISSUES = {
+    ('small', OUT_OF_RANGE, 1),
+    ('tiny', OUT_OF_RANGE, 1),
+    ('amount', ROUNDED, 1),
+    ('amount', OUT_OF_RANGE, 1),
+    ('code', TRUNCATED, 1),
+    ('flag', UNPARSEABLE, 1),
+    ('quantity', UNPARSEABLE, 1),
+}
+
+
+class TestTypeCoercion(unittest.TestCase):
+    def test_polars(self):
+        coerced, report = coerce_frame(pl.DataFrame(DATA), COLUMNS, 'mssql')
+        self.assertEqual({(issue.column, issue.issue, issue.rows) for issue in report.issues}, EXPECTED_ISSUES)
+        self.assertEqual(coerced.schema['small'], pl.Int16)
+        self.assertEqual(coerced.schema['tiny'], pl.UInt8)
+        self.assertEqual(coerced.schema['created'], pl.Datetime('us', 'UTC'))
+        self.assertEqual(coerced['quantity'].to_list(), [12, 7, None])
+        self.assertEqual(coerced['code'].to_list(), ['ab', 'abc', None])
+
+    def test_pandas(self):
+        coerced, report = coerce_frame(pd.DataFrame(DATA), COLUMNS, 'mssql')
+        self.assertEqual({(issue.column, issue.issue, issue.rows) for issue in report.issues}, EXPECTED_ISSUES)
+        self.assertEqual(str(coerced['small'].dtype), 'Int16')
+        self.assertEqual(str(coerced['created'].dt.tz), 'UTC')
+        self.assertEqual(coerced['quantity'].tolist(), [12, 7, pd.NA])
+        self.assertEqual(coerced['amount'].tolist()[0], 1.0)
+
+    def test_pandas_decimals_keep_their_digits(self):
+        columns = [{'name': 'amount', 'type': sqltypes.Numeric(38, 10)}]
+        frame = pd.DataFrame(
+            {'amount': [Decimal('12345678901234567890.1234567891'), Decimal('1.00000000005'), ' 2.5 ', 'x', None]}
+        )
+
+        coerced, report = coerce_frame(frame, columns, 'mssql')
+        self.assertEqual(
+            coerced['amount'].tolist(),
+            [Decimal('12345678901234567890.1234567891'), Decimal('1.0000000000'), Decimal('2.5000000000'), None, None],
+        )
+        self.assertEqual(
+            {(issue.column, issue.issue, issue.rows) for issue in report.issues},
+            {('amount', ROUNDED, 1), ('amount', UNPARSEABLE, 1)},
+        )
+
+        coerced, report = coerce_frame(frame, columns, 'sqlite')
+        self.assertEqual(coerced['amount'].dtype, 'float64')
+        self.assertIn(('amount', ROUNDED, 2), {(issue.column, issue.issue, issue.rows) for issue in report.issues})
+
+    def test_numeric_text_above_float_precision(self):
+        columns = [{'name': 'amount', 'type': sqltypes.Numeric(20, 2)}, {'name': 'big', 'type': sqltypes.BigInteger()}]
+        data = {
+            'amount': ['12345678901234567.89', '1.005', '1e2', None],
+            'big': ['9007199254740993', '-9223372036854775808', '9223372036854775808', None],
+        }
+        for frame in (pl.DataFrame(data), pd.DataFrame(data)):
+            coerced, report = coerce_frame(frame, columns, 'mssql')
+            self.assertEqual(
+                coerced['amount'].to_list()[:3],
+                [Decimal('12345678901234567.89'), Decimal('1.00'), Decimal('100.00')],
+            )
+            self.assertEqual(coerced['big'].to_list()[:2], [9007199254740993, -9223372036854775808])
+            self.assertEqual(
+                {(issue.column, issue.issue, issue.rows) for issue in report.issues},
+                {('amount', ROUNDED, 1), ('big', OUT_OF_RANGE, 1)},
+            )
+
+            coerced, report = coerce_frame(frame, columns, 'sqlite')
+            self.assertIn(('amount', ROUNDED, 2), {(issue.column, issue.issue, issue.rows) for issue in report.issues})
+
+    def test_coerce_to_reflected_table(self):
+        engine = create_engine('sqlite://')
+        with engine.begin() as connection:
+            connection.execute(
+                text('CREATE TABLE items (id INTEGER PRIMARY KEY, code VARCHAR(3), price NUMERIC(6, 2))')
+            )
+        loader, report = FromDataframe(
+            pl.DataFrame({'id': ['1', '2'], 'code': ['abc', 'abcd'], 'price': [1, 2]})
+        ).coerce_to_table(engine, 'items')
+        self.assertEqual(loader.dataframe.schema['id'], pl.Int32)
+        self.assertEqual([(issue.column, issue.issue) for issue in report.issues], [('code', TRUNCATED)])
+
+        loader.load_insert(engine, 'items')
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text('SELECT code FROM items WHERE id = 2')).scalar(), 'abc')
+
+
+if __name__ == '__main__':
+    unittest.main()
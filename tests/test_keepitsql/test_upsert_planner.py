@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import polars as pl
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+
+from keepitsql.core import upsert_planner
+from keepitsql.core.from_dataframe import FromDataframe
+
+
+class TestUpsertPlanner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, 'target.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT NOT NULL)')
+        self.engine = create_engine(f'sqlite:///{path}')
+        self.test_df = pl.DataFrame({'id': list(range(1, 101)), 'name': [f'user_{i}' for i in range(1, 101)]})
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def rows(self):
+        with self.engine.connect() as connection:
+            return connection.execute(text('SELECT id, name FROM users ORDER BY id')).all()
+
+    def test_empty_target_is_insert_only(self):
+        plan = FromDataframe(self.test_df).plan_upsert(self.engine, 'users', ['id'])
+        self.assertEqual(plan.strategy, upsert_planner.INSERT_ONLY)
+        self.assertEqual(plan.target_rows, 0)
+
+        plan.execute(self.engine)
+        self.assertEqual(len(self.rows()), 100)
+
+    def test_new_keys_are_insert_only(self):
+        FromDataframe(self.test_df).load_insert(self.engine, 'users')
+        new_rows = pl.DataFrame({'id': [500, 501], 'name': ['a', 'b']})
+        plan = FromDataframe(new_rows).plan_upsert(self.engine, 'users', ['id'])
+        self.assertEqual(plan.strategy, upsert_planner.INSERT_ONLY)
+        self.assertEqual(plan.new_key_ratio, 1.0)
+
+    def test_small_batch_uses_inline_values(self):
+        FromDataframe(self.test_df).load_insert(self.engine, 'users')
+        changes = pl.DataFrame({'id': [1, 500], 'name': ['renamed', 'new']})
+        plan = FromDataframe(changes).plan_upsert(self.engine, 'users', ['id'])
+        self.assertEqual(plan.strategy, upsert_planner.INLINE_VALUES)
+        self.assertEqual((plan.target_rows, plan.sampled_keys, plan.existing_keys), (100, 2, 1))
+
+        plan.execute(self.engine)
+        rows = self.rows()
+        self.assertEqual(rows[0].name, 'renamed')
+        self.assertEqual(len(rows), 101)
+
+    def test_large_batches_and_snapshots(self):
+        FromDataframe(self.test_df).load_insert(self.engine, 'users')
+        snapshot = self.test_df.with_columns(pl.col('name').str.to_uppercase())
+
+        with mock.patch.object(upsert_planner, 'INLINE_MAX_STATEMENTS', 0):
+            plan = FromDataframe(snapshot).plan_upsert(self.engine, 'users', ['id'])
+        self.assertEqual(plan.strategy, upsert_planner.STAGED)
+
+        with mock.patch.object(upsert_planner, 'REFRESH_MIN_ROWS', 50):
+            plan = FromDataframe(snapshot.head(60)).plan_upsert(self.engine, 'users', ['id'], full_snapshot=True)
+        self.assertEqual(plan.strategy, upsert_planner.REFRESH)
+        plan.execute(self.engine)
+        self.assertEqual(self.rows()[-1].id, 60)
+
+    def test_constraint_columns_are_left_to_the_database(self):
+        with self.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE events (row_id INTEGER PRIMARY KEY, code TEXT UNIQUE, name TEXT)'))
+        frame = pl.DataFrame({'row_id': [900, 901], 'code': ['a', 'b'], 'name': ['x', 'y']})
+
+        def row_ids():
+            with self.engine.connect() as connection:
+                return connection.execute(text('SELECT row_id FROM events ORDER BY row_id')).scalars().all()
+
+        plan = FromDataframe(frame).plan_upsert(self.engine, 'events', ['code'], constraint_columns=['row_id'])
+        self.assertEqual(plan.strategy, upsert_planner.INSERT_ONLY)
+        plan.execute(self.engine)
+        self.assertEqual(row_ids(), [1, 2])
+
+        with mock.patch.object(upsert_planner, 'REFRESH_MIN_ROWS', 1):
+            plan = FromDataframe(frame.with_columns(pl.col('name') + '!')).plan_upsert(
+                self.engine, 'events', ['code'], constraint_columns=['row_id'], full_snapshot=True
+            )
+        self.assertNotEqual(plan.strategy, upsert_planner.REFRESH)
+        plan.execute(self.engine)
+        self.assertEqual(row_ids(), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
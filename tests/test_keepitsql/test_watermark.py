@@ -0,0 +1,79 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+
+from keepitsql.core.generate_select_queries import export_select_statements
+from keepitsql.core.watermark import (
+    WatermarkFile,
+    WatermarkTable,
+    load_incremental,
+)
+
+
+class TestWatermark(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.directory.name, 'source.db')
+        target_path = os.path.join(self.directory.name, 'target.db')
+        for path in (self.source_path, target_path):
+            with sqlite3.connect(path) as connection:
+                connection.execute('CREATE TABLE events (id INTEGER PRIMARY KEY, version INTEGER, payload TEXT)')
+        self.add_source_rows([(i, i // 10, f'event_{i}') for i in range(1, 51)])
+        self.source = create_engine(f'sqlite:///{self.source_path}')
+        self.target = create_engine(f'sqlite:///{target_path}')
+
+    def tearDown(self):
+        self.source.dispose()
+        self.target.dispose()
+        self.directory.cleanup()
+
+    def add_source_rows(self, rows):
+        with sqlite3.connect(self.source_path) as connection:
+            connection.executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?)', rows)
+
+    def target_rows(self):
+        with self.target.connect() as connection:
+            return connection.execute(text('SELECT id, version, payload FROM events ORDER BY id')).all()
+
+    def test_second_run_only_loads_rows_past_the_watermark(self):
+        store = WatermarkFile(os.path.join(self.directory.name, 'state', 'watermarks.json'))
+        first = load_incremental(self.source, self.target, 'events', 'version', ['id'], store, chunk_size=8)
+        self.assertEqual(first.rows_loaded, 50)
+        self.assertEqual(store.get('events'), 5)
+
+        self.add_source_rows([(3, 6, 'changed'), (51, 6, 'new')])
+        second = load_incremental(self.source, self.target, 'events', 'version', ['id'], store, chunk_size=8)
+
+        # Rows at the stored watermark (version 5, id 50) are re-read and re-merged.
+        self.assertEqual(second.rows_loaded, 3)
+        self.assertEqual(WatermarkFile(store.path).get('events'), 6)
+        rows = self.target_rows()
+        self.assertEqual(len(rows), 51)
+        self.assertEqual(rows[2], (3, 6, 'changed'))
+
+    def test_state_table_round_trips_types(self):
+        store = WatermarkTable(self.target)
+        self.assertIsNone(store.get('events'))
+        moment = datetime.datetime(2024, 5, 1, 12, 30, 15, 250)
+        store.set('events', 'updated_at', moment)
+        store.set('events', 'updated_at', moment + datetime.timedelta(hours=1))
+        self.assertEqual(WatermarkTable(self.target).get('events'), moment + datetime.timedelta(hours=1))
+
+    def test_export_writes_watermark_extracts(self):
+        output_path = os.path.join(self.directory.name, 'selects')
+        export_select_statements(self.source, output_path, overwrite=True, watermark_columns={'events': 'version'})
+        with open(os.path.join(output_path, 'events_incremental.sql')) as f:
+            statement = f.read()
+        self.assertIn('WHERE version >= :watermark', statement)
+        self.assertTrue(statement.endswith('ORDER BY version;'))
+
+
+if __name__ == '__main__':
+    unittest.main()